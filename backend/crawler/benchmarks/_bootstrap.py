@@ -0,0 +1,29 @@
+"""
+벤치마크 실행용 import 설정
+Lambda Layer(/opt/python/common)와 같은 `common` 패키지를 저장소의 common/python에서 불러옵니다.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+CRAWLER_ROOT = Path(__file__).resolve().parent.parent
+COMMON_DIR = CRAWLER_ROOT / 'common' / 'python'
+
+
+def load_common():
+    """저장소의 common/python을 `common` 패키지로 등록"""
+    if 'common' in sys.modules:
+        return sys.modules['common']
+    spec = importlib.util.spec_from_file_location(
+        'common',
+        COMMON_DIR / '__init__.py',
+        submodule_search_locations=[str(COMMON_DIR)],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['common'] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+load_common()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+date_utils 벤치마크
+공지사항 코퍼스 + 합성 문단으로 날짜 파싱 처리량(문단/초), p50/p99 지연,
+호출당 할당량을 측정하고 JSON 기준값(baselines/date_utils.json)과 비교합니다.
+기준값보다 threshold 이상 느려지면 종료 코드 1을 반환합니다.
+
+사용법:
+    python benchmarks/bench_date_utils.py                    # 측정 + 기준값 비교
+    python benchmarks/bench_date_utils.py --update-baseline  # 기준값 갱신
+    python benchmarks/bench_date_utils.py --compare-legacy   # 기존 구현과 비교
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import _bootstrap  # noqa: F401
+from common.date_utils import ParseContext, find_datetimes, get_datetime_from_text, parse_date_string
+from date_corpus import generate_variants, load_corpus
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'baselines' / 'date_utils.json'
+
+# 결과가 실행 날짜에 따라 달라지지 않도록 기준 시각을 고정
+REFERENCE = datetime(2026, 11, 1, 9, 0)
+PAGE_SIZE = 10
+
+
+def _percentile(sorted_values: List[float], ratio: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(ratio * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(func: Callable, inputs: List, repeat: int) -> Dict[str, float]:
+    """
+    입력마다 func를 호출해 지연 분포와 호출당 할당량을 측정
+
+    Returns:
+        paragraphs_per_sec, p50_us, p99_us, alloc_bytes_per_call 딕셔너리
+    """
+    for item in inputs:
+        func(item)  # warm-up
+
+    latencies = []
+    clock = time.perf_counter_ns
+    for _ in range(repeat):
+        for item in inputs:
+            start = clock()
+            func(item)
+            latencies.append(clock() - start)
+    latencies.sort()
+    total_seconds = sum(latencies) / 1e9
+
+    # 할당량은 tracemalloc 오버헤드 때문에 별도 패스로 측정
+    tracemalloc.start()
+    peak_total = 0
+    for item in inputs:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        func(item)
+        _, peak = tracemalloc.get_traced_memory()
+        peak_total += peak - base
+    tracemalloc.stop()
+
+    return {
+        'paragraphs_per_sec': round(len(latencies) / total_seconds, 1),
+        'p50_us': round(_percentile(latencies, 0.50) / 1e3, 2),
+        'p99_us': round(_percentile(latencies, 0.99) / 1e3, 2),
+        'alloc_bytes_per_call': round(peak_total / len(inputs)),
+    }
+
+
+def build_workloads(texts: List[str], context: ParseContext) -> Dict[str, tuple]:
+    """워크로드 이름 -> (호출 함수, 입력 리스트, 입력 1개당 문단 수)"""
+    ranges = [text for text in texts if '~' in text]
+    pages = [texts[i:i + PAGE_SIZE] for i in range(0, len(texts), PAGE_SIZE)]
+    date_strings = [
+        f"{2026 + (i % 2)}.{1 + i % 12:02d}.{1 + i % 28:02d}" for i in range(len(texts))
+    ]
+    return {
+        'get_datetime_from_text': (lambda text: get_datetime_from_text(text, context), texts, 1),
+        'range_paragraphs': (lambda text: get_datetime_from_text(text, context), ranges, 1),
+        'find_datetimes_page': (lambda page: find_datetimes(page, context=context), pages, PAGE_SIZE),
+        'parse_date_string': (lambda value: parse_date_string(value), date_strings, 1),
+    }
+
+
+def compare_legacy(texts: List[str], context: ParseContext, repeat: int) -> None:
+    """기존 구현과 결과/속도 비교 (연도 추론 개선으로 인한 차이는 정보로만 출력)"""
+    import legacy_date_utils
+
+    def legacy_parse(text):
+        try:
+            return legacy_date_utils.get_datetime_from_text(text, REFERENCE)
+        except ValueError as e:
+            return e
+
+    differences = [text for text in texts if legacy_parse(text) != get_datetime_from_text(text, context)]
+    legacy = measure(legacy_parse, texts, repeat)
+    current = measure(lambda text: get_datetime_from_text(text, context), texts, repeat)
+    print(f"\n기존 구현 비교 ({len(texts)}개 문단)")
+    print(f"  legacy : p50 {legacy['p50_us']:8.1f} µs, {legacy['paragraphs_per_sec']:10.1f} 문단/초")
+    print(f"  current: p50 {current['p50_us']:8.1f} µs, {current['paragraphs_per_sec']:10.1f} 문단/초")
+    print(f"  speedup: {current['paragraphs_per_sec'] / legacy['paragraphs_per_sec']:.2f}x")
+    print(f"  결과가 다른 문단: {len(differences)}개")
+    for text in differences[:10]:
+        print(f"    {text!r}: {legacy_parse(text)!r} -> {get_datetime_from_text(text, context)!r}")
+
+
+def check_regressions(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """기준값 대비 p50 지연 또는 처리량이 threshold 이상 나빠진 워크로드 목록"""
+    failures = []
+    for name, base in baseline.items():
+        current = results.get(name)
+        if current is None:
+            continue
+        if current['p50_us'] > base['p50_us'] * (1 + threshold):
+            failures.append(f"{name}: p50 {base['p50_us']}µs -> {current['p50_us']}µs")
+        if current['paragraphs_per_sec'] < base['paragraphs_per_sec'] / (1 + threshold):
+            failures.append(
+                f"{name}: {base['paragraphs_per_sec']} -> {current['paragraphs_per_sec']} 문단/초"
+            )
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20, help='워크로드 반복 횟수')
+    parser.add_argument('--synthetic', type=int, default=500, help='합성 문단 수')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--threshold', type=float, default=0.3, help='허용 성능 저하 비율 (0.3 = 30%%)')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--compare-legacy', action='store_true')
+    parser.add_argument('--json-out', type=Path, help='측정 결과를 JSON으로 저장할 경로')
+    args = parser.parse_args()
+
+    context = ParseContext(reference=REFERENCE)
+    rows = load_corpus() + generate_variants(args.synthetic, seed=args.seed, year=REFERENCE.year)
+    texts = [row['text'] for row in rows]
+
+    results = {}
+    print(f"문단 수: {len(texts)} (코퍼스 {len(texts) - args.synthetic}, 합성 {args.synthetic}), 반복: {args.repeat}")
+    print(f"{'workload':26s} {'문단/초':>12s} {'p50 µs':>9s} {'p99 µs':>9s} {'alloc B/call':>13s}")
+    for name, (func, inputs, per_call) in build_workloads(texts, context).items():
+        result = measure(func, inputs, args.repeat)
+        result['paragraphs_per_sec'] = round(result['paragraphs_per_sec'] * per_call, 1)
+        results[name] = result
+        print(
+            f"{name:26s} {result['paragraphs_per_sec']:12.1f} {result['p50_us']:9.2f} "
+            f"{result['p99_us']:9.2f} {result['alloc_bytes_per_call']:13d}"
+        )
+
+    if args.compare_legacy:
+        compare_legacy(texts, context, max(1, args.repeat // 4))
+
+    report = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'reference': REFERENCE.isoformat(),
+        'synthetic': args.synthetic,
+        'seed': args.seed,
+        'workloads': results,
+    }
+    if args.json_out:
+        args.json_out.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+        print(f"\n기준값 갱신: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"\n기준값 없음: {args.baseline} (--update-baseline 으로 생성)")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    failures = check_regressions(results, baseline.get('workloads', {}), args.threshold)
+    if failures:
+        print(f"\n성능 저하 감지 (threshold {args.threshold:.0%}):")
+        for failure in failures:
+            print(f"  ✗ {failure}")
+        return 1
+    print(f"\n기준값 대비 정상 (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
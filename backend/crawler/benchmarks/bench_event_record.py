@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+EventRecord 벤치마크
+크롤러와 같은 입력으로 EventRecord(create_event)와 기존 ics.Event 생성 방식을 비교하여
+이벤트당 생성 시간과 유지 메모리(tracemalloc)를 측정합니다.
+
+사용법:
+    python benchmarks/bench_event_record.py [--events 10000] [--repeat 3]
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, time as dtime, timedelta
+from typing import Callable, List
+from zoneinfo import ZoneInfo
+
+import _bootstrap  # noqa: F401
+from ics import Event
+
+from common.ics_builder import create_event
+
+SEOUL_TZ = ZoneInfo("Asia/Seoul")
+CATEGORY_SETS = [['STANDARD'], ['SCHOLARSHIP'], ['EVENT'], ['SCHOLARSHIP', 'STANDARD']]
+TITLES = ["장학금", "근로장학생 모집", "총학생회 간식 배부 행사", "수강신청 정정기간", "국가장학금 2차 신청"]
+
+
+def legacy_create_event(title, start_date, end_date=None, categories="EVENT", url=None, description=None) -> Event:
+    """EventRecord 도입 전 create_event (ics.Event 직접 생성)"""
+    event = Event()
+    event.name = title
+    event.created = datetime.now()
+
+    all_day = start_date.time() == dtime(0, 0)
+    if end_date == None:
+        end_date = start_date
+
+    if all_day:
+        event.begin = start_date.date() if isinstance(start_date, datetime) else start_date
+        if end_date:
+            event.end = end_date.date() if isinstance(end_date, datetime) else end_date
+        event.make_all_day()
+    else:
+        event.begin = start_date
+        if end_date:
+            event.end = end_date
+
+    event.categories = categories
+    if url:
+        event.url = url
+    if description:
+        event.description = description
+
+    event.uid = f"{uuid.uuid5(uuid.NAMESPACE_OID, title)}@yourssu.com"
+    return event
+
+
+def make_inputs(count: int, seed: int = 0) -> List[tuple]:
+    """create_event 인자 튜플 생성 (하루종일 / 시간 지정 / 기간 이벤트 혼합)"""
+    rng = random.Random(seed)
+    base = datetime(2026, 11, 1)
+    inputs = []
+    for n in range(count):
+        title = f"{rng.choice(TITLES)} {n}"
+        start = base + timedelta(days=rng.randint(0, 120))
+        categories = rng.choice(CATEGORY_SETS)
+        url = f"https://scatch.ssu.ac.kr/notice/{n}"
+        kind = rng.random()
+        if kind < 0.4:
+            inputs.append((title, start, None, categories, url))
+        elif kind < 0.7:
+            timed = start.replace(hour=rng.randint(9, 17), tzinfo=SEOUL_TZ)
+            inputs.append((title, timed, timed + timedelta(hours=2), categories, url))
+        else:
+            inputs.append((title, start, start + timedelta(days=rng.randint(1, 6)), categories, url))
+    return inputs
+
+
+def _best_of(func: Callable, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _retained_bytes(func: Callable) -> int:
+    """func 결과를 유지한 상태에서 증가한 메모리"""
+    gc.collect()
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    result = func()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current - base
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    inputs = make_inputs(args.events)
+    builders = {
+        'ics.Event (legacy)': lambda: [legacy_create_event(*item) for item in inputs],
+        'EventRecord': lambda: [create_event(*item) for item in inputs],
+        'EventRecord -> ics.Event': lambda: [create_event(*item).to_ics_event() for item in inputs],
+    }
+
+    print(f"이벤트 수: {args.events}, 반복: {args.repeat}")
+    print(f"{'builder':26s} {'µs/event':>10s} {'bytes/event':>12s} {'speedup':>8s} {'memory':>8s}")
+    baseline = None
+    for name, build in builders.items():
+        seconds = _best_of(build, args.repeat) / args.events
+        memory = _retained_bytes(build) / args.events
+        if baseline is None:
+            baseline = (seconds, memory)
+        print(
+            f"{name:26s} {seconds * 1e6:10.2f} {memory:12.0f}"
+            f" {baseline[0] / seconds:7.2f}x {memory / baseline[1]:7.0%}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+이벤트 저장소 벤치마크
+병합 상태를 merged_all.ics 파싱(read_raw_events)으로 복구하는 경우와
+SQLite 이벤트 저장소(EventStore.load_events)에서 읽는 경우를 비교하고,
+일부 이벤트만 바뀐 병합의 저장소 갱신 시간과 파일/업로드(gzip) 크기를 측정합니다.
+
+사용법:
+    python benchmarks/bench_event_store.py [--events 10000] [--changed 0.01] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import _bootstrap  # noqa: F401
+
+from bench_ics_builder import make_events
+from common.event_store import EventStore
+from common.ics_builder import write_calendar
+from common.ics_reader import read_raw_events
+from common.s3_utils import iter_compressed
+
+
+def _best_of(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=10000)
+    parser.add_argument('--changed', type=float, default=0.01, help='갱신할 이벤트 비율')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    content = write_calendar(make_events(args.events))
+    events = read_raw_events(content)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'events.sqlite3')
+        with EventStore(path) as store:
+            build = _best_of(lambda: store.replace_all(events), 1)
+
+            if {e.uid: e for e in store.load_events()} != {e.uid: e for e in events}:
+                print("✗ 저장소에서 읽은 이벤트가 원본과 다릅니다")
+                return 1
+
+            parse = _best_of(lambda: read_raw_events(content), args.repeat)
+            load = _best_of(store.load_events, args.repeat)
+
+            changed = events[:max(1, int(len(events) * args.changed))]
+            update = _best_of(lambda: store.upsert(changed), args.repeat)
+            size = store.size_bytes()
+
+        with open(path, 'rb') as f:
+            start = time.perf_counter()
+            transfer = sum(len(chunk) for chunk in iter_compressed(iter(lambda: f.read(256 * 1024), b''), 'gzip'))
+            gzip_time = time.perf_counter() - start
+
+    ics_size = len(content.encode('utf-8'))
+    print(f"이벤트 수: {len(events)}, ICS {ics_size:,} bytes, SQLite {size:,} bytes ({size / ics_size:.2f}x)")
+    print(f"  업로드 크기 (gzip)     {transfer:,} bytes ({transfer / ics_size:.2f}x), 압축 {gzip_time * 1e3:.1f} ms")
+    print(f"  read_raw_events(ICS)   {parse * 1e3:9.1f} ms")
+    print(f"  EventStore.load_events {load * 1e3:9.1f} ms  {parse / load:6.1f}x")
+    print(f"  replace_all (최초 생성) {build * 1e3:9.1f} ms")
+    print(f"  upsert {len(changed)}개 ({args.changed:.0%})  {update * 1e3:9.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+ICS 직렬화 벤치마크
+10k+ 이벤트에서 ics 라이브러리의 str(Calendar)와 ics_builder.write_calendar 직렬화 처리량을 비교합니다.
+출력이 str(Calendar)와 바이트 단위로 같은지는 tests/test_ics_builder.py에서 검사합니다.
+
+사용법:
+    python benchmarks/bench_ics_builder.py [--events 10000] [--repeat 3]
+"""
+
+import argparse
+import io
+import random
+import sys
+import time
+import warnings
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import _bootstrap  # noqa: F401
+
+from common.ics_builder import (
+    create_calendar_from_events,
+    create_event,
+    split_long_duration_event,
+    write_calendar,
+)
+
+# str(Calendar)가 매번 내는 FutureWarning은 측정과 무관
+warnings.simplefilter('ignore', FutureWarning)
+
+SEOUL_TZ = ZoneInfo("Asia/Seoul")
+CATEGORY_SETS = [['STANDARD'], ['SCHOLARSHIP'], ['EVENT'], ['SCHOLARSHIP', 'STANDARD']]
+TITLES = ["장학금", "근로장학생 모집", "총학생회 간식 배부 행사", "수강신청 정정기간", "국가장학금 2차 신청"]
+
+
+def make_events(count: int, seed: int = 0) -> list:
+    """크롤러와 같은 방식(create_event / split_long_duration_event)으로 EventRecord 생성"""
+    rng = random.Random(seed)
+    base = datetime(2026, 11, 1)
+    events = []
+    while len(events) < count:
+        n = len(events)
+        title = f"{rng.choice(TITLES)} {n}"
+        start = base + timedelta(days=rng.randint(0, 120))
+        categories = rng.choice(CATEGORY_SETS)
+        url = f"https://scatch.ssu.ac.kr/notice/{n}"
+        kind = rng.random()
+        if kind < 0.4:
+            events.append(create_event(title, start, categories=categories, url=url))
+        elif kind < 0.7:
+            timed = start.replace(hour=rng.randint(9, 17), tzinfo=SEOUL_TZ)
+            events.append(create_event(title, timed, timed + timedelta(hours=2), categories, url))
+        else:
+            end = start + timedelta(days=rng.randint(1, 20))
+            events.extend(split_long_duration_event(
+                title, start, end, categories, url, description="2026학년도 2학기",
+            ))
+    return events[:count]
+
+
+def _best_of(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    records = make_events(args.events)
+    calendar = create_calendar_from_events(records)
+
+    size = len(write_calendar(calendar.events).encode('utf-8'))
+    timings = {
+        'str(Calendar)': _best_of(lambda: str(calendar), args.repeat),
+        'write_calendar(fold=False)': _best_of(lambda: write_calendar(calendar, fold=False), args.repeat),
+        'write_calendar()': _best_of(lambda: write_calendar(calendar), args.repeat),
+        'write_calendar(BytesIO)': _best_of(lambda: write_calendar(calendar, io.BytesIO()), args.repeat),
+        'write_calendar(records)': _best_of(lambda: write_calendar(records), args.repeat),
+    }
+
+    print(f"이벤트 수: {len(calendar.events)}, 출력 크기: {size:,} bytes")
+    baseline = timings['str(Calendar)']
+    for name, seconds in timings.items():
+        print(
+            f"  {name:28s} {seconds * 1e3:9.1f} ms  {len(calendar.events) / seconds:10.0f} events/s"
+            f"  {baseline / seconds:6.2f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+ICS 읽기 벤치마크
+ics_reader.iter_raw_events가 ics 라이브러리 파싱(Calendar(content))과 같은
+UID / CATEGORIES / DTSTART / DTEND를 추출하는지 검증하고 파싱 처리량을 비교합니다.
+접힌 출력(write_calendar)과 접히지 않은 출력(str(Calendar))을 모두 검사하며,
+--files로 S3에서 받은 실제 ICS 파일도 검증할 수 있습니다.
+
+사용법:
+    python benchmarks/bench_ics_reader.py [--events 2000] [--repeat 3]
+    python benchmarks/bench_ics_reader.py --files raw/*.ics merged/*.ics
+"""
+
+import argparse
+import sys
+import time
+import warnings
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+import _bootstrap  # noqa: F401
+from ics import Calendar
+
+from bench_ics_builder import make_events
+from common.event_record import to_utc
+from common.ics_builder import assemble_calendar, create_calendar_from_events, write_calendar
+from common.ics_reader import read_raw_events
+
+warnings.simplefilter('ignore', FutureWarning)
+
+
+def _normalize(value):
+    if isinstance(value, datetime):
+        return to_utc(value)
+    return value
+
+
+def _library_view(content: str) -> dict:
+    """ics 라이브러리로 파싱한 UID -> (categories, start, end)"""
+    view = {}
+    for event in Calendar(content).events:
+        if event.all_day:
+            start = event.begin.date()
+            end = event._end_time.date() if event._end_time else None
+        else:
+            start = event.begin.datetime
+            end = event._end_time.datetime if event._end_time else None
+        view[event.uid] = (tuple(sorted(event.categories)), _normalize(start), _normalize(end))
+    return view
+
+
+def _reader_view(content: str) -> dict:
+    return {
+        event.uid: (event.categories, _normalize(event.start), _normalize(event.end))
+        for event in read_raw_events(content)
+    }
+
+
+def validate(name: str, content: str) -> List[str]:
+    """ics 라이브러리와 추출 결과 비교, 원본 블록을 다시 합친 문서도 같은 결과인지 확인"""
+    problems = []
+    expected = _library_view(content)
+    actual = _reader_view(content)
+    if expected != actual:
+        missing = expected.keys() - actual.keys()
+        different = [uid for uid in expected.keys() & actual.keys() if expected[uid] != actual[uid]]
+        problems.append(f"{name}: 누락 {len(missing)}개, 값 불일치 {len(different)}개 (예: {different[:3]})")
+
+    rebuilt = assemble_calendar([event.to_bytes() for event in read_raw_events(content)])
+    if _library_view(rebuilt.decode('utf-8')) != expected:
+        problems.append(f"{name}: 원본 블록으로 다시 만든 문서의 파싱 결과가 다름")
+    return problems
+
+
+def _best_of(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--files', type=Path, nargs='*', default=[], help='검증할 실제 ICS 파일')
+    args = parser.parse_args()
+
+    records = make_events(args.events)
+    documents = {
+        'write_calendar (folded)': write_calendar(records),
+        'str(Calendar) (unfolded)': str(create_calendar_from_events(records)),
+    }
+    for path in args.files:
+        documents[str(path)] = path.read_text(encoding='utf-8')
+
+    problems = []
+    for name, content in documents.items():
+        problems.extend(validate(name, content))
+    for problem in problems:
+        print(f"✗ {problem}")
+    print(f"검증 문서 {len(documents)}개, 불일치 {len(problems)}건")
+
+    content = documents['write_calendar (folded)']
+    library = _best_of(lambda: Calendar(content), args.repeat)
+    reader = _best_of(lambda: read_raw_events(content), args.repeat)
+    print(f"이벤트 수: {args.events}, 문서 크기: {len(content.encode('utf-8')):,} bytes")
+    print(f"  Calendar(content)     {library * 1e3:9.1f} ms  {args.events / library:10.0f} events/s")
+    print(f"  read_raw_events       {reader * 1e3:9.1f} ms  {args.events / reader:10.0f} events/s  {library / reader:6.1f}x")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+병합 파이프라인 부하 벤치마크
+합성 raw ICS 파일(이벤트 수, 카테고리 구성, 장기 일정 분리 비율, 이전 병합과의 UID 겹침)을
+메모리 또는 로컬 디렉터리 저장소에 만들고, merge 핸들러(lambda_handler)를 그대로 실행하여
+핸들러 StageTimer의 단계별(list, load_state, download, parse, dedupe, store, filter, upload, save_state)
+시간과 최대 메모리를 측정합니다.
+
+실행 순서는 운영과 같습니다.
+    1. 준비: 소스마다 앞쪽 overlap 비율의 이벤트만 올리고 병합 (이벤트 저장소, identity index, manifest 생성)
+    2. 측정: 전체 이벤트를 올리고 병합 (ETag가 바뀐 소스만 다시 읽고, 이전 결과는 이벤트 저장소에서 로드)
+    3. 재실행: 바뀐 소스 없이 한 번 더 실행 (manifest 비교 후 건너뛰는 경로)
+시간은 tracemalloc 없이 한 번, 메모리는 tracemalloc을 켜고 한 번 더 실행해 측정합니다.
+download 단계는 스레드별 시간의 합이고, 메모리는 동시에 실행되는 parse와 겹쳐 측정됩니다.
+Lambda 메모리/타임아웃 설정 근거로 쓰도록 결과를 JSON으로 저장할 수 있습니다.
+
+사용법:
+    python benchmarks/bench_merge.py [--events 10000,30000,100000] [--sources 3] [--overlap 0.8]
+                                     [--mix STANDARD:0.3,SCHOLARSHIP:0.4,EVENT:0.3] [--multi-category 0.1]
+                                     [--long-ratio 0.3] [--storage local|memory] [--json-out merge.json]
+"""
+
+import argparse
+import functools
+import importlib.util
+import io
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+from zoneinfo import ZoneInfo
+
+import _bootstrap
+
+from common import storage
+from common.event_store import open_event_store
+from common.ics_builder import create_event, split_long_duration_event, write_calendar
+from common.logger import StageTimer
+from common.s3_utils import upload_ics
+
+SEOUL_TZ = ZoneInfo("Asia/Seoul")
+BUCKET = 'bench-bucket'
+RAW_PREFIX = 'raw/'
+MERGED_PREFIX = 'merged/'
+# 결과가 실행 날짜에 따라 달라지지 않도록 이벤트 기준일과 보존 기간 기준일을 고정
+BASE = datetime(2026, 11, 1)
+TITLES = ["장학금", "근로장학생 모집", "총학생회 간식 배부 행사", "수강신청 정정기간", "국가장학금 2차 신청"]
+STAGES = ('list', 'load_state', 'download', 'parse', 'dedupe', 'store', 'filter', 'upload', 'save_state')
+
+HANDLER_PATH = _bootstrap.CRAWLER_ROOT / 'functions' / 'merge' / 'handler.py'
+
+
+def load_merge_handler():
+    """functions/merge/handler.py를 모듈로 로드 (Lambda와 같은 common 패키지 사용)"""
+    spec = importlib.util.spec_from_file_location('merge_handler', HANDLER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def parse_mix(value: str) -> List[Tuple[str, float]]:
+    """'STANDARD:0.3,EVENT:0.7' -> [('STANDARD', 0.3), ('EVENT', 0.7)]"""
+    mix = []
+    for item in value.split(','):
+        name, _, weight = item.partition(':')
+        mix.append((name.strip(), float(weight or 1)))
+    return mix
+
+
+def generate_sources(
+    count: int,
+    sources: int,
+    mix: List[Tuple[str, float]],
+    multi_category: float,
+    long_ratio: float,
+    seed: int
+) -> Dict[str, list]:
+    """
+    크롤러와 같은 방식(create_event / split_long_duration_event)으로 소스별 EventRecord 생성
+
+    Args:
+        count: 전체 이벤트 수 (장기 일정 분리 후 기준)
+        sources: raw 파일 수
+        mix: 카테고리 -> 가중치
+        multi_category: 카테고리를 하나 더 가질 확률
+        long_ratio: 7일 이상 일정(시작/마감으로 분리) 비율
+        seed: 난수 시드
+
+    Returns:
+        raw 파일 키 -> EventRecord 리스트
+    """
+    rng = random.Random(seed)
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    records = []
+    n = 0
+    while len(records) < count:
+        title = f"{rng.choice(TITLES)} {n}"
+        url = f"https://scatch.ssu.ac.kr/notice/{n}"
+        n += 1
+        categories = [rng.choices(names, weights)[0]]
+        if len(names) > 1 and rng.random() < multi_category:
+            categories.append(rng.choice([name for name in names if name != categories[0]]))
+        start = BASE + timedelta(days=rng.randint(0, 180))
+        kind = rng.random()
+        if kind < long_ratio:
+            end = start + timedelta(days=rng.randint(7, 40))
+            records.extend(split_long_duration_event(
+                title, start, end, categories, url, description="2026학년도 2학기",
+            ))
+        elif kind < long_ratio + (1 - long_ratio) / 2:
+            timed = start.replace(hour=rng.randint(9, 17), tzinfo=SEOUL_TZ)
+            records.append(create_event(title, timed, timed + timedelta(hours=2), categories, url))
+        else:
+            records.append(create_event(title, start, categories=categories, url=url))
+    records = records[:count]
+
+    size = -(-len(records) // sources)
+    return {
+        f"{RAW_PREFIX}source_{i}.ics": records[i * size:(i + 1) * size]
+        for i in range(sources)
+    }
+
+
+class TracingStageTimer(StageTimer):
+    """단계마다 tracemalloc 최대/잔존 메모리도 기록하는 StageTimer (같은 단계는 가장 큰 값)"""
+    last = None
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.memory: Dict[str, dict] = {}
+        TracingStageTimer.last = self
+
+    @contextmanager
+    def stage(self, name: str):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        with super().stage(name) as run:
+            yield run
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            result = self.memory.setdefault(name, {'peak_mb': 0.0, 'retained_mb': 0.0})
+            result['peak_mb'] = max(result['peak_mb'], round((peak - base) / 2 ** 20, 2))
+            result['retained_mb'] = max(result['retained_mb'], round((current - base) / 2 ** 20, 2))
+
+
+def run_merge(handler) -> dict:
+    """
+    lambda_handler를 한 번 실행 (EMF 출력은 버림)
+
+    Returns:
+        응답 body
+
+    Raises:
+        RuntimeError: 병합이 실패한 경우
+    """
+    with redirect_stdout(io.StringIO()):
+        result = handler.lambda_handler({}, None)
+    if result['statusCode'] != 200 or result['body'].get('upload_failed'):
+        raise RuntimeError(f"병합 실패: {result['body']}")
+    return result['body']
+
+
+def _use_storage(kind: str, directory: str) -> None:
+    if kind == 'local':
+        storage.set_storage(storage.LocalStorage(str(Path(directory) / 'storage')))
+    else:
+        storage.set_storage(storage.MemoryStorage())
+
+
+def _output_bytes() -> int:
+    # 압축 변형(.gz, .br)을 제외한 merged/ ICS 파일 크기 합
+    return sum(info.size for info in storage.get_storage().list(BUCKET, MERGED_PREFIX) if info.key.endswith('.ics'))
+
+
+def bench_size(count: int, args, trace_memory: bool) -> Tuple[dict, Dict[str, dict]]:
+    """
+    count개 이벤트로 준비(겹치는 이전 병합) 후 측정 실행 (실행마다 핸들러 모듈을 새로 로드)
+
+    Returns:
+        (결과 요약, 단계별 측정값)
+    """
+    sources = generate_sources(count, args.sources, args.mix, args.multi_category, args.long_ratio, args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        _use_storage(args.storage, directory)
+        os.environ.update({'S3_BUCKET': BUCKET, 'S3_RAW_PREFIX': RAW_PREFIX, 'S3_MERGED_PREFIX': MERGED_PREFIX})
+        # 핸들러가 쓰는 함수 그대로, 이벤트 저장소 로컬 경로와 보존 기간 기준일만 고정
+        handler = load_merge_handler()
+        handler.open_event_store = functools.partial(
+            open_event_store, path=str(Path(directory) / 'event-store' / 'events.sqlite3')
+        )
+        handler.retention_cutoff = functools.partial(handler.retention_cutoff, today=BASE.date())
+
+        # 이전 병합: 소스마다 앞쪽 overlap 비율의 이벤트만 있던 상태
+        for key, records in sources.items():
+            upload_ics(write_calendar(records[:int(len(records) * args.overlap)]), BUCKET, key)
+        seed = run_merge(handler)
+        if not seed.get('total_events'):
+            raise RuntimeError(f"준비 병합에 이벤트가 없습니다: {seed}")
+
+        for key, records in sources.items():
+            upload_ics(write_calendar(records), BUCKET, key)
+        raw_events = sum(len(records) for records in sources.values())
+        del sources
+
+        if trace_memory:
+            handler.StageTimer = TracingStageTimer
+            tracemalloc.start()
+        try:
+            body = run_merge(handler)
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+        stages = {name: dict(body['stages'].get(name, {})) for name in STAGES}
+        if trace_memory:
+            for name, memory in TracingStageTimer.last.memory.items():
+                stages.setdefault(name, {}).update(memory)
+
+        noop = run_merge(handler)
+        summary = {
+            'raw_events': raw_events,
+            'previous_events': seed['total_events'],
+            'merged_events': body['total_events'],
+            'changes': body['changes'],
+            'sources': body['sources'],
+            'files': body['files_generated'],
+            'files_uploaded': body['files_uploaded'],
+            'output_bytes': _output_bytes(),
+            'handler_seconds': body['duration_seconds'],
+            'noop_seconds': noop['duration_seconds'],
+        }
+    return summary, stages
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', default='10000,30000,100000', help='이벤트 수 목록 (콤마 구분)')
+    parser.add_argument('--sources', type=int, default=3, help='raw 파일 수')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('STANDARD:0.3,SCHOLARSHIP:0.4,EVENT:0.3'),
+                        help='카테고리:가중치 목록')
+    parser.add_argument('--multi-category', type=float, default=0.1, help='카테고리를 두 개 가질 확률')
+    parser.add_argument('--long-ratio', type=float, default=0.3, help='시작/마감으로 분리되는 장기 일정 비율')
+    parser.add_argument('--overlap', type=float, default=0.8, help='이전 병합과 UID가 겹치는 비율')
+    parser.add_argument('--storage', choices=('local', 'memory'), default='local',
+                        help='저장소 (memory는 올린 객체를 모두 메모리에 두므로 upload 메모리가 커짐)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--skip-memory', action='store_true', help='tracemalloc 측정 생략')
+    parser.add_argument('--json-out', type=Path, help='측정 결과를 JSON으로 저장할 경로')
+    args = parser.parse_args()
+
+    # 단계 로그는 측정과 무관
+    logging.disable(logging.WARNING)
+
+    runs = []
+    print(f"{'events':>8s} {'stage':10s} {'seconds':>9s} {'peak MB':>9s} {'retained MB':>12s}")
+    for count in (int(value) for value in args.events.split(',')):
+        summary, timings = bench_size(count, args, trace_memory=False)
+        memory = {} if args.skip_memory else bench_size(count, args, trace_memory=True)[1]
+        stages = {
+            name: {
+                **timings[name],
+                **{key: memory[name][key] for key in ('peak_mb', 'retained_mb') if key in memory.get(name, {})},
+            }
+            for name in STAGES
+        }
+        for name, stage in stages.items():
+            print(
+                f"{count:8d} {name:10s} {stage.get('seconds', 0.0):9.3f} "
+                f"{stage.get('peak_mb', float('nan')):9.1f} {stage.get('retained_mb', float('nan')):12.1f}"
+            )
+        print(
+            f"{count:8d} {'total':10s} {summary['handler_seconds']:9.3f}  "
+            f"(병합 {summary['merged_events']}개, 파일 {summary['files']}개, 출력 {summary['output_bytes']:,} bytes)"
+        )
+        print(f"{count:8d} {'noop':10s} {summary['noop_seconds']:9.3f}  (바뀐 소스 없이 재실행)")
+        runs.append({'events': count, **summary, 'stages': stages})
+
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'params': {
+            'sources': args.sources,
+            'mix': dict(args.mix),
+            'multi_category': args.multi_category,
+            'long_ratio': args.long_ratio,
+            'overlap': args.overlap,
+            'storage': args.storage,
+            'seed': args.seed,
+        },
+        # 프로세스 전체 최대 RSS (Linux는 KiB 단위), Lambda 메모리 설정의 하한 참고값
+        'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'runs': runs,
+    }
+    if args.json_out:
+        args.json_out.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+        print(f"\n결과 저장: {args.json_out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+날짜 파싱 벤치마크 코퍼스
+저장소에 포함된 공지사항 문단(corpus/date_paragraphs.jsonl)을 읽고,
+요일 표기/공백/기간/시간을 섞은 합성 문단을 만듭니다.
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Dict, List
+
+CORPUS_PATH = Path(__file__).resolve().parent / 'corpus' / 'date_paragraphs.jsonl'
+
+WEEKDAYS = "월화수목금토일"
+PREFIXES = ["신청기간:", "접수기간 :", "제출기한", "행사 일시 :", "모집기간", "추천 마감", ""]
+SUFFIXES = ["까지", "(학생서비스팀 방문 제출)", "/ 장소: 학생회관", "", "※ 기한 엄수", "선착순 마감"]
+FILLERS = [
+    "자세한 사항은 첨부파일을 참고해 주시기 바랍니다.",
+    "문의는 총학생회 카카오톡 채널로 부탁드립니다.",
+    "대상: 2학기 재학생 중 직전학기 12학점 이상 이수자",
+    "선발 인원 00명 내외, 지급 금액 학기당 300만원",
+]
+
+
+def load_corpus(path: Path = CORPUS_PATH) -> List[Dict[str, str]]:
+    """코퍼스 파일을 {'source', 'text'} 딕셔너리 리스트로 읽음"""
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _weekday_marker(rng: random.Random) -> str:
+    day = rng.choice(WEEKDAYS)
+    return rng.choice([f"({day})", f"( {day} )", f" {day}요일", ""])
+
+
+def _spacing(rng: random.Random) -> str:
+    return rng.choice(["", " ", " ", "  ", "\t"])
+
+
+def _date(rng: random.Random, year: int) -> str:
+    month = rng.randint(1, 12)
+    day = rng.randint(1, 28)
+    sp = _spacing(rng)
+    style = rng.randrange(6)
+    if style == 0:
+        return f"{year}년{sp}{month}월{sp}{day}일"
+    if style == 1:
+        return f"{month}월{sp}{day}일"
+    if style == 2:
+        return f"{year}.{sp}{month:02d}.{sp}{day:02d}."
+    if style == 3:
+        return f"{year}.{month:02d}.{day:02d}"
+    if style == 4:
+        return f"{month}.{sp}{day}."
+    return f"{year % 100:02d}.{month:02d}.{day:02d}"
+
+
+def _time(rng: random.Random) -> str:
+    return rng.choice(["", f" {rng.randint(9, 18):02d}:{rng.choice(['00', '30', '59'])}"])
+
+
+def generate_variants(count: int, seed: int = 0, year: int = 2026) -> List[Dict[str, str]]:
+    """
+    합성 문단 생성
+
+    Args:
+        count: 생성할 문단 수
+        seed: 난수 시드 (같은 시드면 같은 코퍼스)
+        year: 날짜에 쓸 기준 연도
+
+    Returns:
+        {'source': 'synthetic', 'text'} 딕셔너리 리스트
+    """
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.2:
+            text = rng.choice(FILLERS)
+        else:
+            left = _date(rng, year) + _weekday_marker(rng) + _time(rng)
+            if kind < 0.6:
+                right = rng.choice([
+                    _date(rng, year) + _weekday_marker(rng) + _time(rng),
+                    f"{rng.randint(12, 23):02d}:00",
+                ])
+                text = f"{left}{_spacing(rng)}~{_spacing(rng)}{right}"
+            else:
+                text = left
+            text = f"{rng.choice(PREFIXES)} {text} {rng.choice(SUFFIXES)}".strip()
+        rows.append({'source': 'synthetic', 'text': text})
+    return rows
@@ -0,0 +1,81 @@
+"""
+비교 기준용 기존 날짜 파싱 구현 (user-001 이전)
+호출마다 형식별 정규식을 만들고 11x11+11개 기간 조합을 순서대로 검색합니다.
+벤치마크에서 시계를 고정할 수 있도록 기준 시각(now)만 인자로 받게 바꿨습니다.
+"""
+
+import re
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import _bootstrap  # noqa: F401
+from common.config import DATE_PATTERNS
+
+
+def _make_regex(pattern):
+    regex_string = pattern \
+        .replace("%Y", "\\d{4}") \
+        .replace("%m", "\\d{1,2}") \
+        .replace("%d", "\\d{1,2}") \
+        .replace("%a", "[월화수목금토일]") \
+        .replace("%H", "\\d{1,2}") \
+        .replace("%M", "\\d{1,2}") \
+        .replace(".", "\\.") \
+        .replace("(", "\\(").replace(")", "\\)") \
+        .replace(" ", "\\s*")
+    return re.compile(regex_string)
+
+
+def _restore_year(pattern, date, now):
+    if "%Y" in pattern or "%y" in pattern:
+        return date
+    return date.replace(year=now.year)
+
+
+def _single(text, now):
+    for pattern in DATE_PATTERNS:
+        match_string = _make_regex(pattern).search(text)
+        if match_string:
+            result = datetime.strptime(match_string.group(), pattern)
+            result = _restore_year(pattern, result, now)
+            if result.date() < now.date():
+                return None
+            return result.replace(tzinfo=ZoneInfo("Asia/Seoul"))
+    return None
+
+
+def _range(text, now):
+    pattern_combination = []
+    for pattern_a in DATE_PATTERNS:
+        for pattern_b in DATE_PATTERNS:
+            pattern_combination.append((pattern_a + " ~ " + pattern_b, (pattern_a, pattern_b)))
+        pattern_combination.append((pattern_a + " ~ %H:%M", (pattern_a, "%H:%M")))
+
+    for source, (left_pattern, right_pattern) in pattern_combination:
+        match_string = _make_regex(source).search(text)
+        if match_string is None:
+            continue
+        left_string, right_string = [t.strip() for t in match_string.group().split("~")]
+        left_time = _restore_year(left_pattern, datetime.strptime(left_string, left_pattern), now)
+        right_time = _restore_year(right_pattern, datetime.strptime(right_string, right_pattern), now)
+        if left_time >= right_time and left_time.year > right_time.year:
+            right_time = right_time.replace(year=left_time.year)
+        if right_pattern == "%H:%M":
+            right_time = right_time.replace(year=left_time.year, month=left_time.month, day=left_time.day)
+        if right_time.date() < now.date():
+            return None
+        tz = ZoneInfo("Asia/Seoul")
+        return (left_time.replace(tzinfo=tz), right_time.replace(tzinfo=tz))
+    return None
+
+
+def get_datetime_from_text(text, now=None):
+    now = now or datetime.now()
+    text = re.sub("\\(\\s*[월화수목금토일]\\s*\\)", "", text)
+    text = re.sub("[월화수목금토일]요일", "", text)
+    result = None
+    if '~' in text:
+        result = _range(text, now)
+    if result is None:
+        result = _single(text, now)
+    return result
@@ -0,0 +1,111 @@
+"""
+카테고리 조각 조합 모듈
+병합이 올린 카테고리별 조각(merged/categories/<category>.ics)과 manifest.json으로
+임의의 카테고리 조합 캘린더를 만듭니다. 조합 결과는 (카테고리 집합, 조각 ETag)를 키로
+프로세스 안 LRU 캐시에 보관하므로, 조각이 바뀌지 않으면 같은 조합을 다시 만들지 않습니다.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+from .config import COMPOSE_CACHE_SIZE, MERGE_CATEGORY_DIR, MERGE_CATEGORY_MANIFEST, S3_BUCKET, S3_MERGED_PREFIX
+from .ics_builder import assemble_calendar, event_sort_key
+from .ics_reader import RawEvent, read_raw_events
+from .s3_utils import download_ics, download_json
+
+logger = logging.getLogger(__name__)
+
+CATEGORY_MANIFEST_VERSION = 1
+
+
+def fragment_filename(category: str) -> str:
+    """카테고리 조각 파일명 (MERGE_CATEGORY_DIR 기준, 예: 'STANDARD' -> 'standard.ics')"""
+    return f"{category.lower()}.ics"
+
+
+def build_category_manifest(entries: Dict[str, dict]) -> dict:
+    """
+    카테고리 manifest 딕셔너리 생성 (병합 Lambda가 조각 업로드 뒤 저장)
+
+    Args:
+        entries: 카테고리 -> {'file', 'etag', 'events', 'size'}
+
+    Returns:
+        {'version', 'categories'} (카테고리 이름순, 내용이 같으면 같은 JSON)
+    """
+    return {
+        'version': CATEGORY_MANIFEST_VERSION,
+        'categories': {category: entries[category] for category in sorted(entries)},
+    }
+
+
+def load_category_manifest(bucket: str = S3_BUCKET, prefix: str = S3_MERGED_PREFIX) -> Optional[dict]:
+    """
+    카테고리 manifest 다운로드
+
+    Returns:
+        manifest 딕셔너리 (없거나 버전이 다르면 None)
+    """
+    manifest = download_json(bucket, f"{prefix}{MERGE_CATEGORY_DIR}{MERGE_CATEGORY_MANIFEST}")
+    if not manifest or manifest.get('version') != CATEGORY_MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def compose_calendar(
+    categories: Iterable[str],
+    bucket: str = S3_BUCKET,
+    prefix: str = S3_MERGED_PREFIX,
+    manifest: Optional[dict] = None
+) -> bytes:
+    """
+    카테고리 조합 캘린더 생성 (MERGE_COMBINATIONS의 같은 조합 파일과 같은 바이트)
+    manifest에 없는 카테고리는 이벤트가 없는 것으로 본다.
+
+    Args:
+        categories: 카테고리 집합 (비어 있으면 이벤트 없는 캘린더)
+        bucket: S3 버킷 이름
+        prefix: merged 파일 접두사 (예: 'merged/')
+        manifest: load_category_manifest 결과 (None이면 다운로드)
+
+    Returns:
+        ICS 문서 바이트
+
+    Raises:
+        ValueError: manifest가 없거나 조각 파일이 없는 경우
+    """
+    if manifest is None:
+        manifest = load_category_manifest(bucket, prefix)
+        if manifest is None:
+            raise ValueError(f"카테고리 manifest 없음: s3://{bucket}/{prefix}{MERGE_CATEGORY_DIR}")
+    entries = manifest['categories']
+    wanted = tuple(sorted(category for category in set(categories) if category in entries))
+    fragments = tuple((entries[category]['file'], entries[category]['etag']) for category in wanted)
+    return _compose(bucket, f"{prefix}{MERGE_CATEGORY_DIR}", fragments)
+
+
+@lru_cache(maxsize=COMPOSE_CACHE_SIZE)
+def _compose(bucket: str, directory: str, fragments: Tuple[Tuple[str, str], ...]) -> bytes:
+    # 여러 카테고리를 가진 이벤트는 조각마다 들어 있으므로 UID로 한 번만 넣고 출력 순서로 정렬
+    events: Dict[str, RawEvent] = {}
+    for filename, etag in fragments:
+        for event in _fragment_events(bucket, f"{directory}{filename}", etag):
+            events.setdefault(event.uid, event)
+    ordered = sorted(events.values(), key=event_sort_key)
+    return assemble_calendar(event.to_bytes() for event in ordered)
+
+
+@lru_cache(maxsize=COMPOSE_CACHE_SIZE)
+def _fragment_events(bucket: str, key: str, etag: str) -> Tuple[RawEvent, ...]:
+    # etag는 캐시 키로만 사용 (조각이 바뀌면 manifest의 ETag가 바뀌어 다시 읽는다)
+    content = download_ics(bucket, key)
+    if content is None:
+        raise ValueError(f"카테고리 조각 없음: s3://{bucket}/{key}")
+    return tuple(read_raw_events(content))
+
+
+def clear_compose_cache() -> None:
+    """조합/조각 캐시 비우기"""
+    _compose.cache_clear()
+    _fragment_events.cache_clear()
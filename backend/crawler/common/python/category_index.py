@@ -0,0 +1,91 @@
+"""
+카테고리 비트마스크 인덱스 모듈
+이벤트마다 카테고리 비트마스크를 한 번만 계산해 같은 마스크끼리 버킷으로 묶고,
+카테고리 조합 파일은 일치하는 버킷의 합집합으로 만듭니다.
+조합 수가 늘어나도 비용은 O(이벤트 + 출력)으로 유지됩니다.
+"""
+
+from itertools import chain
+from typing import Any, Dict, Iterable, List
+
+
+class CategoryIndex:
+    """
+    카테고리 비트마스크 -> 이벤트 버킷 인덱스
+
+    각 카테고리에 비트 하나를 할당하고, 이벤트는 자기 카테고리 비트의 OR 값(마스크)으로
+    버킷에 들어간다. 조합의 마스크와 AND가 0이 아닌 버킷이 그 조합에 포함된다.
+    버킷은 이벤트 위치를 오름차순으로 가지므로 select 결과는 입력 순서를 유지한다.
+    """
+
+    def __init__(self, events: Iterable[Any]):
+        self._events: List[Any] = []
+        self._bits: Dict[str, int] = {}
+        self._buckets: Dict[int, List[int]] = {}
+
+        # 같은 카테고리 조합은 마스크를 한 번만 계산
+        masks_by_categories: Dict[Any, int] = {}
+        for position, event in enumerate(events):
+            categories = event.categories or ()
+            try:
+                mask = masks_by_categories.get(categories)
+                if mask is None:
+                    mask = masks_by_categories[categories] = self.mask_of(categories)
+            except TypeError:
+                # ics.Event의 set 카테고리처럼 해시 불가능한 경우
+                mask = self.mask_of(categories)
+
+            bucket = self._buckets.get(mask)
+            if bucket is None:
+                bucket = self._buckets[mask] = []
+            bucket.append(position)
+            self._events.append(event)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def mask_of(self, categories: Iterable[str]) -> int:
+        """카테고리 집합의 비트마스크 (처음 보는 카테고리는 새 비트 할당)"""
+        mask = 0
+        bits = self._bits
+        for category in categories:
+            bit = bits.get(category)
+            if bit is None:
+                bit = bits[category] = 1 << len(bits)
+            mask |= bit
+        return mask
+
+    def _matching_buckets(self, categories: Iterable[str]) -> List[List[int]]:
+        # 인덱스에 없는 카테고리는 어떤 이벤트와도 겹치지 않으므로 비트를 새로 만들지 않는다
+        wanted = 0
+        for category in categories:
+            wanted |= self._bits.get(category, 0)
+        if not wanted:
+            return []
+        return [bucket for mask, bucket in self._buckets.items() if mask & wanted]
+
+    def count(self, categories: Iterable[str]) -> int:
+        """카테고리 조합에 포함되는 이벤트 수"""
+        return sum(len(bucket) for bucket in self._matching_buckets(categories))
+
+    def positions(self, categories: Iterable[str]) -> List[int]:
+        """카테고리 조합에 포함되는 이벤트의 입력 위치 (오름차순)"""
+        buckets = self._matching_buckets(categories)
+        if len(buckets) == 1:
+            return buckets[0]
+        # 각 버킷이 이미 정렬되어 있어 timsort가 run 병합만 수행한다
+        return sorted(chain.from_iterable(buckets))
+
+    def select(self, categories: Iterable[str]) -> List[Any]:
+        """
+        카테고리 조합과 교집합이 있는 이벤트 리스트
+        filter_events_by_categories와 같은 결과를 버킷 합집합으로 계산한다.
+
+        Args:
+            categories: 카테고리 집합 (비어 있으면 빈 리스트)
+
+        Returns:
+            입력 순서를 유지한 이벤트 리스트
+        """
+        events = self._events
+        return [events[position] for position in self.positions(categories)]
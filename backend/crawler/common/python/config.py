@@ -11,6 +11,53 @@ import os
 S3_BUCKET = os.environ.get('S3_BUCKET', 'ssu-time-crawler-output')
 S3_RAW_PREFIX = 'raw/'
 S3_MERGED_PREFIX = 'merged/'
+S3_STATE_PREFIX = 'state/'  # 병합 상태 (identity index 등)
+
+# 저장소 백엔드: s3 (기본), local (STORAGE_LOCAL_DIR 아래 <bucket>/<key>), memory (프로세스 메모리)
+STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 's3')
+STORAGE_LOCAL_DIR = os.environ.get('STORAGE_LOCAL_DIR', './.storage')
+
+# S3 클라이언트 설정 (Lambda 컨테이너 안에서 재사용되는 연결 풀)
+S3_MAX_POOL_CONNECTIONS = int(os.environ.get('S3_MAX_POOL_CONNECTIONS', '32'))
+S3_MAX_ATTEMPTS = int(os.environ.get('S3_MAX_ATTEMPTS', '5'))
+S3_CONNECT_TIMEOUT = float(os.environ.get('S3_CONNECT_TIMEOUT', '3'))
+S3_READ_TIMEOUT = float(os.environ.get('S3_READ_TIMEOUT', '20'))
+
+# 스트리밍 업로드: 이 크기 이상이면 멀티파트 업로드, 파트 크기 (S3 최소 파트 크기는 5 MiB)
+S3_MULTIPART_THRESHOLD = int(os.environ.get('S3_MULTIPART_THRESHOLD', str(8 * 1024 * 1024)))
+S3_MULTIPART_PART_SIZE = max(5 * 1024 * 1024, int(os.environ.get('S3_MULTIPART_PART_SIZE', str(8 * 1024 * 1024))))
+
+# download_ics 로컬 캐시 (warm 컨테이너에서 ETag가 같으면 전송 없이 재사용, 빈 값이면 비활성화)
+S3_CACHE_DIR = os.environ.get('S3_CACHE_DIR', '/tmp/s3-cache')
+
+# 병합 결과와 함께 올릴 미리 압축한 변형 (콤마 구분: gzip, br / 기본값은 빈 값(비활성화), br은 brotli 패키지 필요)
+# 변형 객체(.gz/.br)를 읽는 배포(CloudFront 등)가 준비된 환경에서만 켠다
+S3_COMPRESSED_VARIANTS = tuple(
+    encoding.strip() for encoding in os.environ.get('S3_COMPRESSED_VARIANTS', '').split(',') if encoding.strip()
+)
+
+# CloudWatch Embedded Metric Format 네임스페이스 (StageTimer.emit, 빈 값이면 EMF 출력 안 함)
+METRICS_NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'SsuTime/Crawler')
+
+# 병합 Lambda에서 raw 파일을 동시에 내려받을 최대 스레드 수
+MERGE_DOWNLOAD_WORKERS = int(os.environ.get('MERGE_DOWNLOAD_WORKERS', '8'))
+# 병합 결과 파일을 동시에 업로드할 최대 스레드 수
+MERGE_UPLOAD_WORKERS = int(os.environ.get('MERGE_UPLOAD_WORKERS', '8'))
+
+# 병합 identity index: (소스, 정규화 제목, 날짜) -> 고정 UID
+IDENTITY_INDEX_KEY = f'{S3_STATE_PREFIX}identity_index.json'
+
+# 병합 이벤트 저장소 (SQLite): 병합 상태의 원본, merged/*.ics는 여기서 만든 결과물
+EVENT_STORE_KEY = f'{S3_STATE_PREFIX}events.sqlite3'
+# warm 컨테이너에서 재사용하는 로컬 사본 (ETag가 같으면 다시 받지 않음)
+EVENT_STORE_PATH = os.environ.get('EVENT_STORE_PATH', '/tmp/event-store/events.sqlite3')
+
+# 병합 보존 기간: 종료일이 오늘보다 이 개월 수 이상 지난 이벤트는 병합 결과에서 제거 (0이면 제거하지 않음)
+# 크롤러 date_filter_months보다 길어야 크롤러가 다시 보내는 이벤트가 매번 추가/제거되지 않는다
+MERGE_RETENTION_MONTHS = int(os.environ.get('MERGE_RETENTION_MONTHS', '12'))
+
+# 병합 소스 manifest: raw 파일 키 -> 마지막으로 반영한 ETag, 기여한 UID (ETag가 바뀐 소스만 다시 처리)
+MERGE_MANIFEST_KEY = f'{S3_STATE_PREFIX}merge_manifest.json'
 
 
 @dataclass
@@ -70,6 +117,9 @@ SCHOLARSHIP_CONFIG = CrawlerConfig(
     timeout=300
 )
 
+# 전체 병합 파일: 다음 병합의 기준이 되므로 다른 파일이 모두 올라간 뒤 마지막에 업로드
+MERGED_ALL_FILENAME = 'merged_all.ics'
+
 # 병합 파일 조합 정의
 MERGE_COMBINATIONS = {
     'merged_empty.ics': set(),
@@ -81,3 +131,13 @@ MERGE_COMBINATIONS = {
     'merged_scholarship_event.ics': {'SCHOLARSHIP', 'EVENT'},
     'merged_all.ics': {'STANDARD', 'SCHOLARSHIP', 'EVENT'},
 }
+
+# 카테고리별 조각: merged/categories/<category>.ics (카테고리 하나짜리 캘린더) + manifest.json (ETag, 이벤트 수)
+# 임의의 조합은 calendar_compose.compose_calendar로 조각을 이어 만든다 (업로드 수는 카테고리 수에 비례)
+MERGE_CATEGORY_DIR = 'categories/'
+MERGE_CATEGORY_MANIFEST = 'manifest.json'
+# MERGE_COMBINATIONS 조합 파일도 계속 올릴지 (API가 merged_<조합>.ics를 직접 읽는 동안 유지, 0이면 merged_all.ics만)
+# 지원 중단 예정: API가 compose_calendar로 옮겨 가면 기본값을 0으로 바꾸고, 한 번의 배포 주기 뒤 조합 파일과 이 설정을 제거한다
+MERGE_LEGACY_COMBINATIONS = os.environ.get('MERGE_LEGACY_COMBINATIONS', '1') != '0'
+# compose_calendar 결과를 (카테고리 집합, 조각 ETag)별로 보관할 최대 개수 (프로세스 안 LRU)
+COMPOSE_CACHE_SIZE = int(os.environ.get('COMPOSE_CACHE_SIZE', '32'))
@@ -3,114 +3,426 @@
 모든 크롤러에서 사용하는 날짜 필터링 로직을 통합합니다.
 """
 
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import date, datetime, tzinfo
+from typing import Iterable, List
 from dateutil.relativedelta import relativedelta
 import calendar as cal_module
 from .config import DATE_PATTERNS
 from .logger import setup_logger
 import re
-from re import Pattern
 from zoneinfo import ZoneInfo
 
 logger = setup_logger(__name__)
 
-def get_datetime_from_text(text: str) -> datetime | tuple[datetime, datetime] | None:
+SEOUL_TZ = ZoneInfo("Asia/Seoul")
+
+
+@dataclass(frozen=True)
+class ParseContext:
+    """
+    크롤링 1회 실행 동안 공유하는 날짜 파싱 기준
+
+    실행 시작 시 한 번 만들어 모든 파싱 함수에 넘기면 시계 조회와 타임존 생성이
+    한 번으로 끝나고, 자정을 넘겨도 같은 기준으로 파싱된다.
+    """
+    reference: datetime  # 기준 시각 (tzinfo 기준의 naive datetime)
+    tzinfo: tzinfo = SEOUL_TZ
+    rollover_months: int = 3  # 연도 없는 날짜를 다음 해로 넘겨볼 최대 개월 수
+    range_rollover_days: int = 183  # 연도 없는 기간 종료일을 다음 해로 넘겨볼 최대 기간 길이 (반년)
+
+    @classmethod
+    def now(cls, tz: tzinfo = SEOUL_TZ, **kwargs) -> 'ParseContext':
+        """현재 시각(tz 기준)을 기준으로 하는 컨텍스트 생성"""
+        return cls(reference=datetime.now(tz).replace(tzinfo=None), tzinfo=tz, **kwargs)
+
+    @property
+    def today(self) -> date:
+        return self.reference.date()
+
+    def restore_year(self, pattern: str, value: datetime) -> datetime:
+        """
+        연도가 없는 형식으로 파싱된 날짜에 연도를 채움
+
+        기준일의 연도를 쓰되, 이미 지난 날짜가 다음 해로 넘기면 rollover_months 이내가
+        되는 경우(예: 12월 공지의 1월 일정)에는 다음 해로 본다.
+        """
+        if "%Y" in pattern or "%y" in pattern:
+            return value
+        restored = value.replace(year=self.reference.year)
+        if restored.date() < self.today:
+            rolled = value.replace(year=self.reference.year + 1)
+            if rolled <= self.reference + relativedelta(months=self.rollover_months):
+                return rolled
+        return restored
+
+    def is_too_old(self, value: datetime) -> bool:
+        return value.date() < self.today
+
+    def localize(self, value: datetime) -> datetime:
+        return value.replace(tzinfo=self.tzinfo)
+
+
+def __make_regex(pattern: str) -> str:
+    # 날짜 필드는 이름 있는 그룹으로 잡아 strptime 없이 datetime을 만든다
+    return pattern \
+    .replace(".", "\\.") \
+    .replace("(", "\\(").replace(")", "\\)") \
+    .replace(" ", "\\s*") \
+    .replace("%Y", "(?P<Y>\\d{4})") \
+    .replace("%y", "(?P<y>\\d{2})") \
+    .replace("%m", "(?P<m>\\d{1,2})") \
+    .replace("%d", "(?P<d>\\d{1,2})") \
+    .replace("%a", "[월화수목금토일]") \
+    .replace("%H", "(?P<H>\\d{1,2})") \
+    .replace("%M", "(?P<M>\\d{1,2})")
+
+def __to_datetime(match: re.Match) -> datetime:
+    """
+    __make_regex 로 만든 정규식의 매치에서 datetime 생성
+
+    strptime과 같은 기본값(연도 1900, 1월 1일 0시), 두 자리 연도 해석(69~99는 1900년대)과
+    범위 검사(ValueError)를 따르되, 형식의 공백이 텍스트에서 빠지거나 늘어난 경우
+    (예: "7월27일", 요일을 지운 "2.20.  16:30")도 처리한다.
+    """
+    fields = match.groupdict()
+    year = 1900
+    if fields.get("Y"):
+        year = int(fields["Y"])
+    elif fields.get("y"):
+        short_year = int(fields["y"])
+        year = short_year + (2000 if short_year < 69 else 1900)
+    return datetime(
+        year,
+        int(fields.get("m") or 1),
+        int(fields.get("d") or 1),
+        int(fields.get("H") or 0),
+        int(fields.get("M") or 0),
+    )
+
+def __required_literals(pattern: str) -> str:
+    """형식에서 날짜 지시자와 공백을 뺀 고정 문자들 (텍스트에 없으면 매치 불가)"""
+    literals = re.sub("%[a-zA-Z]", "", pattern).replace(" ", "")
+    return "".join(sorted(set(literals)))
+
+def __compile_formats(patterns: list, prefix: str = "", suffix: str = "") -> list:
+    return [
+        (pattern, re.compile(prefix + __make_regex(pattern) + suffix), __required_literals(pattern))
+        for pattern in patterns
+    ]
+
+# 모듈 import 시 한 번만 컴파일되는 날짜 문법
+# 범위는 `~` 위치를 기준으로 왼쪽(`~` 직전에서 끝나는) 형식과 오른쪽(`~` 직후에서 시작하는) 형식을 나눠 찾는다.
+__SINGLE_FORMATS = __compile_formats(DATE_PATTERNS)
+__RANGE_LEFT_FORMATS = __compile_formats(DATE_PATTERNS, suffix="\\s*\\Z")
+__RANGE_RIGHT_FORMATS = __compile_formats(DATE_PATTERNS + ["%H:%M"], prefix="\\s*")
+__DAY_OF_WEEK_PAREN = re.compile("\\(\\s*[월화수목금토일]\\s*\\)")
+__DAY_OF_WEEK_WORD = re.compile("[월화수목금토일]요일")
+__DIGIT = re.compile("\\d")
+
+def get_datetime_from_text(
+    text: str,
+    context: ParseContext | None = None,
+) -> datetime | tuple[datetime, datetime] | None:
+    if not __DIGIT.search(text):
+        return None
+    context = context or ParseContext.now()
     text = __remove_day_of_week(text)
     result = None
     if '~' in text:
-        result = __find_range_datetime(text)
+        result = __find_range_datetime(text, context)
     
     if result is None:
-        result = __find_single_datetime(text)
+        result = __find_single_datetime(text, context)
     
     return result
 
-def __find_single_datetime(text: str) -> datetime:
-    for pattern in DATE_PATTERNS:
-        regex = __make_regex(pattern)
-        match_string = regex.search(text)
-        if match_string:
-            result = datetime.strptime(match_string.group(), pattern)
-            result = __restore_year(pattern, result)
-            if (__is_to_old(result)):
+def __has_literals(text: str, literals: str) -> bool:
+    for literal in literals:
+        if literal not in text:
+            return False
+    return True
+
+def __find_single_datetime(text: str, context: ParseContext) -> datetime:
+    for pattern, regex, literals in __SINGLE_FORMATS:
+        if not __has_literals(text, literals):
+            continue
+        for match in regex.finditer(text):
+            try:
+                result = __to_datetime(match)
+                result = context.restore_year(pattern, result)
+            except ValueError:
+                # 형식은 맞지만 없는 날짜/시각 (예: 2월 30일, 13월, 24:00)은 다음 매치로
+                continue
+            if (context.is_too_old(result)):
                 return
-            result = __change_timezone(result)
+            result = context.localize(result)
             return result
     
 
-def __find_range_datetime(text: str) -> tuple[datetime, datetime] | None:
-    pattern_combination = []
-    for pattern_a in DATE_PATTERNS:
-        for pattern_b in DATE_PATTERNS:
-            pattern_combination.append((pattern_a + " ~ " + pattern_b, (pattern_a, pattern_b)))
-        pattern_combination.append((pattern_a + " ~ %H:%M", (pattern_a, "%H:%M")))
-    
-    for combination in pattern_combination:
-        regex = __make_regex(combination[0])
-        left_pattern, right_pattern = combination[1]
-        match_string = regex.search(text)
-        if match_string is None:
-            continue
-        left_string, right_string = [text.strip() for text in match_string.group().split("~")]
-        left_time = datetime.strptime(left_string, left_pattern)
-        left_time = __restore_year(left_pattern, left_time)
-        right_time = datetime.strptime(right_string, right_pattern)
-        right_time = __restore_year(right_pattern, right_time)
-
-        if left_time >= right_time and left_time.year > right_time.year:
-            right_time = right_time.replace(year = left_time.year)
-        if right_pattern == "%H:%M":
-            right_time = right_time.replace(year=left_time.year, month=left_time.month, day = left_time.day)
-
-        if __is_to_old(right_time):
-            return
-        left_time = __change_timezone(left_time)
-        right_time = __change_timezone(right_time)
-        return (left_time, right_time)
-    
-    # No Match
-    return None
-
-def __change_timezone(time: datetime) -> datetime:
-    return time.replace(tzinfo=ZoneInfo("Asia/Seoul"))
-
-def __restore_year(pattern: str, date: datetime) -> datetime:
-    if "%Y" in pattern:
-        return date
-    if "%y" in pattern:
-        return date
-    date = date.replace(year=datetime.now().year)
-    return date
-
-def __is_to_old(time: datetime) -> bool:
-    return time.date() < datetime.now().date()
-
-def __make_regex(pattern: str) -> Pattern:
-    regex_string = pattern \
-    .replace("%Y", "\\d{4}") \
-    .replace("%m", "\\d{1,2}") \
-    .replace("%d", "\\d{1,2}") \
-    .replace("%a", "[월화수목금토일]") \
-    .replace("%H", "\\d{1,2}") \
-    .replace("%M", "\\d{1,2}") \
-    .replace(".", "\\.") \
-    .replace("(", "\\(").replace(")", "\\)") \
-    .replace(" ", "\\s*")
-    return re.compile(regex_string)
+def __scan_range_candidates(text: str) -> list:
+    """
+    `~` 마다 왼쪽/오른쪽 형식의 매치 후보를 수집
+
+    `왼쪽 ~ 오른쪽` 형식 조합의 매치는 왼쪽 형식이 시작 위치 이후 첫 `~` 직전에서
+    끝나야 하므로, `~` 사이 구간별로 각 형식을 한 번씩만 검사하면 된다.
+
+    Returns:
+        (`~` 위치, 왼쪽 형식 순번 -> 매치, 오른쪽 형식 순번 -> 매치) 튜플 리스트
+    """
+    candidates = []
+    segment_start = 0
+    while True:
+        tilde = text.find('~', segment_start)
+        if tilde < 0:
+            break
+        segment = text[segment_start:tilde]
+        tail = text[tilde + 1:]
+
+        left_starts = {}
+        for index, (_, regex, literals) in enumerate(__RANGE_LEFT_FORMATS):
+            if not __has_literals(segment, literals):
+                continue
+            match = regex.search(text, segment_start, tilde)
+            if match:
+                left_starts[index] = match
+
+        right_ends = {}
+        if left_starts:
+            for index, (_, regex, literals) in enumerate(__RANGE_RIGHT_FORMATS):
+                if not __has_literals(tail, literals):
+                    continue
+                match = regex.match(text, tilde + 1)
+                if match:
+                    right_ends[index] = match
+
+        if left_starts and right_ends:
+            candidates.append((tilde, left_starts, right_ends))
+        segment_start = tilde + 1
+    return candidates
+
+def __find_range_datetime(text: str, context: ParseContext) -> tuple[datetime, datetime] | None:
+    candidates = __scan_range_candidates(text)
+    parsed = None
+    # 형식 조합의 우선순위(왼쪽 형식 순, 오른쪽 형식 순)대로 가장 앞선 `~` 후보를 고른다
+    # 없는 날짜/시각이라 해석할 수 없는 후보는 건너뛴다
+    for left_index in range(len(__RANGE_LEFT_FORMATS)):
+        for right_index in range(len(__RANGE_RIGHT_FORMATS)):
+            for tilde, left_starts, right_ends in candidates:
+                if left_index in left_starts and right_index in right_ends:
+                    found = (left_starts[left_index], right_ends[right_index], left_index, right_index)
+                    try:
+                        parsed = __parse_range(*found, context)
+                    except ValueError:
+                        continue
+                    break
+            if parsed:
+                break
+        if parsed:
+            break
+
+    if parsed is None:
+        # No Match
+        return None
+
+    left_time, right_time = parsed
+    if context.is_too_old(right_time):
+        return
+    left_time = context.localize(left_time)
+    right_time = context.localize(right_time)
+    return (left_time, right_time)
+
+def __parse_range(
+    left_match: re.Match,
+    right_match: re.Match,
+    left_index: int,
+    right_index: int,
+    context: ParseContext,
+) -> tuple[datetime, datetime]:
+    left_pattern = __RANGE_LEFT_FORMATS[left_index][0]
+    right_pattern = __RANGE_RIGHT_FORMATS[right_index][0]
+    left_time = __to_datetime(left_match)
+    left_time = context.restore_year(left_pattern, left_time)
+    right_time = __to_datetime(right_match)
+    if "%Y" not in right_pattern and "%y" not in right_pattern:
+        # 연도 없는 종료일은 시작일의 연도를 따르고, 시작일보다 앞서면 기간이 반년 이내일 때만 다음 해로 본다
+        # (예: 12.20 ~ 1.10), 그보다 길어지면 종료일이 잘못 적힌 것으로 보고 기간으로 쓰지 않는다
+        right_time = right_time.replace(year=left_time.year)
+        if right_time < left_time and right_pattern != "%H:%M":
+            rolled = right_time.replace(year=left_time.year + 1)
+            if (rolled - left_time).days > context.range_rollover_days:
+                raise ValueError(f"종료일이 시작일보다 앞섬: {left_time} ~ {right_time}")
+            right_time = rolled
+
+    if left_time >= right_time and left_time.year > right_time.year:
+        right_time = right_time.replace(year = left_time.year)
+    if right_pattern == "%H:%M":
+        right_time = right_time.replace(year=left_time.year, month=left_time.month, day = left_time.day)
+    return left_time, right_time
 
 def __remove_day_of_week(string: str) -> str:
-    string = re.sub("\\(\\s*[월화수목금토일]\\s*\\)", "" , string)
-    string = re.sub("[월화수목금토일]요일", "", string)
+    string = __DAY_OF_WEEK_PAREN.sub("" , string)
+    string = __DAY_OF_WEEK_WORD.sub("", string)
     return string
 
-def get_date_filter_range() -> tuple[datetime, datetime]:
+@dataclass(frozen=True)
+class DateMatch:
+    """텍스트에서 찾은 날짜(또는 기간) 하나"""
+    text_index: int  # 입력 텍스트 순번
+    start: int  # 원본 텍스트 기준 시작 위치
+    end: int  # 원본 텍스트 기준 끝 위치 (exclusive)
+    format: str  # 매치된 형식 (기간은 "왼쪽 ~ 오른쪽")
+    priority: int  # 같은 종류 안에서의 형식 우선순위 (작을수록 우선)
+    value: datetime | tuple[datetime, datetime]
+
+    @property
+    def is_range(self) -> bool:
+        return isinstance(self.value, tuple)
+
+
+def find_datetimes(
+    texts: str | Iterable[str],
+    include_past: bool = False,
+    context: ParseContext | None = None,
+) -> List[DateMatch]:
+    """
+    여러 텍스트(또는 문서 하나)에서 모든 날짜/기간을 한 번에 추출
+
+    기간이 우선하며, 기간에 포함된 날짜는 따로 반환하지 않는다.
+    같은 위치에서는 형식 우선순위(DATE_PATTERNS 순서)가 앞선 매치가 선택된다.
+
+    Args:
+        texts: 텍스트 리스트 또는 문서 문자열
+        include_past: 오늘 이전에 끝나는 날짜도 포함할지 여부
+        context: 파싱 기준 (없으면 현재 시각으로 생성)
+
+    Returns:
+        (text_index, start) 순으로 정렬된 DateMatch 리스트
+    """
+    if isinstance(texts, str):
+        texts = [texts]
+    context = context or ParseContext.now()
+
+    matches = []
+    for text_index, text in enumerate(texts):
+        if not text or not __DIGIT.search(text):
+            continue
+        matches.extend(__find_all_in_text(text_index, text, include_past, context))
+    return matches
+
+
+def pick_datetime(matches: List[DateMatch]) -> datetime | tuple[datetime, datetime] | None:
+    """
+    find_datetimes 결과에서 대표 날짜 하나를 선택
+
+    날짜가 있는 첫 텍스트에서 get_datetime_from_text 와 같은 규칙으로 고른다.
+    (기간 우선, 그 다음 형식 우선순위, 같으면 앞쪽 위치)
+
+    Args:
+        matches: find_datetimes 결과
+
+    Returns:
+        datetime 또는 (시작, 종료) 튜플 (없으면 None)
+    """
+    if not matches:
+        return None
+    first_index = min(match.text_index for match in matches)
+    candidates = [match for match in matches if match.text_index == first_index]
+    best = min(candidates, key=lambda match: (not match.is_range, match.priority, match.start))
+    return best.value
+
+
+def __find_all_in_text(
+    text_index: int,
+    original: str,
+    include_past: bool,
+    context: ParseContext,
+) -> List[DateMatch]:
+    text, offsets = __remove_day_of_week_with_offsets(original)
+    spans = []
+
+    # 1. 기간: `~` 마다 우선순위가 가장 높은 형식 조합 하나
+    right_count = len(__RANGE_RIGHT_FORMATS)
+    for tilde, left_starts, right_ends in __scan_range_candidates(text):
+        left_index = min(left_starts)
+        right_index = min(right_ends)
+        found = (left_starts[left_index], right_ends[right_index], left_index, right_index)
+        try:
+            value = __parse_range(*found, context)
+        except ValueError:
+            continue
+        if not include_past and context.is_too_old(value[1]):
+            continue
+        format = __RANGE_LEFT_FORMATS[left_index][0] + " ~ " + __RANGE_RIGHT_FORMATS[right_index][0]
+        value = (context.localize(value[0]), context.localize(value[1]))
+        spans.append((found[0].start(), found[1].end(), format, left_index * right_count + right_index, value))
+
+    # 2. 단일 날짜: 모든 형식의 모든 매치
+    for priority, (pattern, regex, literals) in enumerate(__SINGLE_FORMATS):
+        if not __has_literals(text, literals):
+            continue
+        for match in regex.finditer(text):
+            try:
+                value = context.restore_year(pattern, __to_datetime(match))
+            except ValueError:
+                continue
+            if not include_past and context.is_too_old(value):
+                continue
+            spans.append((match.start(), match.end(), pattern, priority, context.localize(value)))
+
+    # 기간 -> 앞쪽 위치 -> 형식 우선순위 순으로 겹치지 않게 선택
+    spans.sort(key=lambda span: (not isinstance(span[4], tuple), span[0], span[3]))
+    chosen = []
+    for span in spans:
+        if any(span[0] < end and start < span[1] for start, end, *_ in chosen):
+            continue
+        chosen.append(span)
+    chosen.sort(key=lambda span: span[0])
+
+    return [
+        DateMatch(
+            text_index=text_index,
+            start=offsets[start],
+            end=offsets[end - 1] + 1,
+            format=format,
+            priority=priority,
+            value=value,
+        )
+        for start, end, format, priority, value in chosen
+    ]
+
+
+def __remove_day_of_week_with_offsets(string: str) -> tuple[str, List[int]]:
+    """__remove_day_of_week 와 같지만 남은 문자의 원본 위치도 함께 반환"""
+    offsets = list(range(len(string)))
+    for regex in (__DAY_OF_WEEK_PAREN, __DAY_OF_WEEK_WORD):
+        pieces = []
+        kept = []
+        last = 0
+        for match in regex.finditer(string):
+            pieces.append(string[last:match.start()])
+            kept.extend(offsets[last:match.start()])
+            last = match.end()
+        if not pieces:
+            continue
+        pieces.append(string[last:])
+        kept.extend(offsets[last:])
+        string = "".join(pieces)
+        offsets = kept
+    return string, offsets
+
+
+def get_date_filter_range(context: ParseContext | None = None) -> tuple[datetime, datetime]:
     """
     현재월 1일 ~ 3달 뒤 마지막 날까지의 범위를 반환
 
+    Args:
+        context: 파싱 기준 (없으면 현재 시각 기준)
+
     Returns:
         (start_date, end_date) 튜플
     """
-    now = datetime.now()
+    now = context.reference if context else datetime.now()
 
     # 현재월 1일
     start_date = datetime(now.year, now.month, 1)
@@ -144,15 +456,23 @@ def is_within_range(
     return start <= event_date <= end
 
 
-def parse_date_string(date_str: str, format: str = "%Y.%m.%d") -> datetime:
+def parse_date_string(
+    date_str: str,
+    format: str = "%Y.%m.%d",
+    context: ParseContext | None = None,
+) -> datetime:
     """
     문자열을 datetime 객체로 변환
 
     Args:
         date_str: 날짜 문자열
         format: 날짜 형식
+        context: 파싱 기준 (주어지면 연도 없는 형식의 연도를 보정)
 
     Returns:
         datetime 객체
     """
-    return datetime.strptime(date_str.strip(), format)
+    result = datetime.strptime(date_str.strip(), format)
+    if context:
+        result = context.restore_year(format, result)
+    return result
@@ -0,0 +1,91 @@
+"""
+이벤트 레코드 모듈
+크롤러와 병합 단계에서 ics.Event 대신 사용하는 가벼운 불변 이벤트 타입을 제공합니다.
+ics.Event 변환은 라이브러리가 꼭 필요한 경계에서만 수행합니다.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, Tuple, Union
+
+from ics import Event
+
+ONE_DAY = timedelta(days=1)
+
+
+@dataclass(frozen=True, slots=True)
+class EventRecord:
+    """
+    ICS 이벤트 한 개
+
+    하루종일 이벤트는 start/end가 date이고 end는 ICS와 같이 종료일 다음 날(exclusive)이다.
+    시간 지정 이벤트는 start/end가 datetime이다 (naive는 UTC로 간주).
+    """
+    uid: str
+    title: str
+    start: Union[date, datetime]
+    end: Union[date, datetime]
+    all_day: bool
+    categories: Tuple[str, ...] = ()
+    url: Optional[str] = None
+    description: Optional[str] = None
+    created: Optional[datetime] = None  # DTSTAMP
+
+    @property
+    def has_explicit_end(self) -> bool:
+        """DTEND를 기록해야 하는지 (하루짜리 하루종일 이벤트는 생략)"""
+        return not self.all_day or self.end != self.start + ONE_DAY
+
+    @property
+    def end_date(self) -> date:
+        """이벤트가 끝나는 날 (하루종일 이벤트는 마지막 날)"""
+        if self.all_day:
+            return self.end - ONE_DAY
+        return self.end.date()
+
+    def to_ics_event(self) -> Event:
+        """ics.Event로 변환 (create_event의 기존 결과와 같은 속성)"""
+        event = Event()
+        event.name = self.title
+        event.created = self.created
+        event.begin = self.start
+        if self.all_day:
+            event.end = self.end - ONE_DAY if self.has_explicit_end else self.start
+            event.make_all_day()
+        else:
+            event.end = self.end
+        event.categories = list(self.categories)
+        if self.url:
+            event.url = self.url
+        if self.description:
+            event.description = self.description
+        event.uid = self.uid
+        return event
+
+    @classmethod
+    def from_ics_event(cls, event: Event) -> 'EventRecord':
+        """파싱된 ics.Event를 레코드로 변환 (카테고리는 정렬하여 순서를 고정)"""
+        if event.all_day:
+            start = event.begin.date()
+            end = event._end_time.date() if event._end_time else start + ONE_DAY
+        else:
+            start = event.begin.datetime
+            end = event.end.datetime if event.end else start
+        return cls(
+            uid=event.uid,
+            title=event.name or "",
+            start=start,
+            end=end,
+            all_day=event.all_day,
+            categories=tuple(sorted(event.categories or ())),
+            url=event.url,
+            description=event.description,
+            created=event.created.datetime if event.created else None,
+        )
+
+
+def to_utc(value: datetime) -> datetime:
+    """UTC로 변환 (naive datetime은 ics 라이브러리와 같이 UTC로 간주)"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
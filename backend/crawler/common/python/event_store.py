@@ -0,0 +1,296 @@
+"""
+병합 이벤트 저장소 모듈
+병합 결과 이벤트를 SQLite 파일 하나에 보관합니다 (uid, 카테고리, 종료일 인덱스).
+병합은 merged_all.ics를 다시 파싱하지 않고 이 저장소에서 이전 이벤트를 읽고 변경분만 기록하며,
+merged/*.ics 파일은 저장소 내용으로 만든 결과물이 됩니다.
+"""
+
+import contextlib
+import logging
+import os
+import sqlite3
+from datetime import date, datetime, time, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+from .config import EVENT_STORE_PATH
+from .event_record import to_utc
+from .ics_reader import RawEvent
+from .s3_utils import download_file, invalidate_file, upload_file
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+_CATEGORY_SEPARATOR = "\x1f"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    uid TEXT NOT NULL UNIQUE,
+    sort_key TEXT NOT NULL,
+    start_at TEXT,
+    end_at TEXT,
+    end_date TEXT,
+    created TEXT,
+    title TEXT NOT NULL,
+    categories TEXT NOT NULL,
+    raw TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_end_date ON events (end_date);
+CREATE TABLE IF NOT EXISTS event_categories (
+    uid TEXT NOT NULL,
+    category TEXT NOT NULL,
+    PRIMARY KEY (uid, category)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS event_categories_category ON event_categories (category);
+"""
+
+_COLUMNS = "uid, start_at, end_at, created, title, categories, raw"
+
+
+def _encode_time(value: Optional[Union[date, datetime]]) -> Optional[str]:
+    # date는 YYYY-MM-DD, datetime은 isoformat (TZID 시간대는 같은 시각의 UTC 오프셋으로 보관)
+    return value.isoformat() if value is not None else None
+
+
+def _decode_time(value: Optional[str]) -> Optional[Union[date, datetime]]:
+    if value is None:
+        return None
+    if len(value) == 10:
+        return date.fromisoformat(value)
+    return datetime.fromisoformat(value)
+
+
+def _sort_key(start: Optional[Union[date, datetime]]) -> str:
+    """ics_builder.event_sort_key와 같은 순서가 되는 UTC 시각 문자열"""
+    if start is None:
+        instant = datetime.min.replace(tzinfo=timezone.utc)
+    elif isinstance(start, datetime):
+        instant = to_utc(start)
+    else:
+        instant = datetime.combine(start, time(0, 0), timezone.utc)
+    return instant.replace(tzinfo=None).isoformat(timespec="microseconds")
+
+
+def _row(event: RawEvent) -> tuple:
+    end_date = event.end_date
+    return (
+        event.uid,
+        _sort_key(event.start),
+        _encode_time(event.start),
+        _encode_time(event.end),
+        end_date.isoformat() if end_date else None,
+        _encode_time(event.created),
+        event.title,
+        _CATEGORY_SEPARATOR.join(event.categories),
+        event.raw,
+    )
+
+
+def _event(row: tuple) -> RawEvent:
+    uid, start, end, created, title, categories, raw = row
+    return RawEvent(
+        uid=uid,
+        categories=tuple(categories.split(_CATEGORY_SEPARATOR)) if categories else (),
+        start=_decode_time(start),
+        end=_decode_time(end),
+        raw=raw,
+        created=_decode_time(created),
+        title=title,
+    )
+
+
+class EventStore:
+    """
+    SQLite 이벤트 저장소
+
+    RawEvent의 원본 블록과 병합에 필요한 속성을 그대로 보관하므로 읽을 때 ICS를 파싱하지 않는다.
+    파일은 /tmp 같은 임시 위치에 두고 변경 후 통째로 업로드하는 용도라 동기화(fsync)는 생략한다.
+    """
+
+    def __init__(self, path: str = ":memory:", on_modify: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            path: SQLite 파일 경로 (기본값 메모리)
+            on_modify: 처음 쓰기 직전에 한 번 호출 (로컬 사본 무효화 등)
+        """
+        self.path = path
+        self._on_modify = on_modify
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA synchronous = OFF")
+        self._conn.executescript(_SCHEMA)
+        version = self._conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if version is None:
+            self._modify()
+            with self._conn:
+                self._conn.execute("INSERT INTO meta (key, value) VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+        elif int(version[0]) != SCHEMA_VERSION:
+            raise ValueError(f"지원하지 않는 이벤트 저장소 버전: {version[0]}")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> 'EventStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def _modify(self) -> None:
+        if self._on_modify is not None:
+            callback, self._on_modify = self._on_modify, None
+            callback()
+
+    def load_events(self) -> List[RawEvent]:
+        """모든 이벤트 (시작 시각(UTC), UID 순)"""
+        rows = self._conn.execute(f"SELECT {_COLUMNS} FROM events ORDER BY sort_key, uid")
+        return [_event(row) for row in rows]
+
+    def get(self, uids: Iterable[str]) -> Dict[str, RawEvent]:
+        """UID -> 이벤트 (없는 UID는 제외)"""
+        result = {}
+        uids = list(uids)
+        for start in range(0, len(uids), 500):
+            batch = uids[start:start + 500]
+            placeholders = ", ".join("?" * len(batch))
+            for row in self._conn.execute(f"SELECT {_COLUMNS} FROM events WHERE uid IN ({placeholders})", batch):
+                result[row[0]] = _event(row)
+        return result
+
+    def select(self, categories: Iterable[str]) -> List[RawEvent]:
+        """
+        카테고리 중 하나라도 가진 이벤트 (CategoryIndex.select와 같은 조건)
+
+        Args:
+            categories: 카테고리 집합 (비어 있으면 빈 리스트)
+
+        Returns:
+            시작 시각(UTC), UID 순 이벤트 리스트
+        """
+        categories = sorted(set(categories))
+        if not categories:
+            return []
+        placeholders = ", ".join("?" * len(categories))
+        rows = self._conn.execute(
+            f"SELECT {_COLUMNS} FROM events WHERE uid IN "
+            f"(SELECT uid FROM event_categories WHERE category IN ({placeholders})) "
+            "ORDER BY sort_key, uid",
+            categories,
+        )
+        return [_event(row) for row in rows]
+
+    def uids_ending_before(self, day: date) -> List[str]:
+        """day 이전에 끝난 이벤트 UID (종료일 인덱스 사용)"""
+        rows = self._conn.execute("SELECT uid FROM events WHERE end_date < ?", (day.isoformat(),))
+        return [uid for (uid,) in rows]
+
+    def earliest_end_date(self) -> Optional[date]:
+        """가장 이른 종료일 (종료일 인덱스 사용, 날짜 없는 이벤트만 있거나 비어 있으면 None)"""
+        value = self._conn.execute("SELECT MIN(end_date) FROM events").fetchone()[0]
+        return date.fromisoformat(value) if value else None
+
+    def upsert(self, events: Iterable[RawEvent]) -> int:
+        """
+        이벤트 추가 또는 교체 (같은 UID)
+
+        Returns:
+            기록한 이벤트 수
+        """
+        rows = [_row(event) for event in events]
+        if not rows:
+            return 0
+        self._modify()
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM event_categories WHERE uid = ?", ((row[0],) for row in rows)
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO events "
+                "(uid, sort_key, start_at, end_at, end_date, created, title, categories, raw) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO event_categories (uid, category) VALUES (?, ?)",
+                ((row[0], category) for row in rows for category in row[7].split(_CATEGORY_SEPARATOR) if category),
+            )
+        return len(rows)
+
+    def delete(self, uids: Iterable[str]) -> int:
+        """
+        UID로 이벤트 삭제
+
+        Returns:
+            삭제한 이벤트 수
+        """
+        keys = [(uid,) for uid in uids]
+        if not keys:
+            return 0
+        self._modify()
+        with self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany("DELETE FROM events WHERE uid = ?", keys)
+            deleted = self._conn.total_changes - before
+            self._conn.executemany("DELETE FROM event_categories WHERE uid = ?", keys)
+        return deleted
+
+    def replace_all(self, events: Iterable[RawEvent]) -> int:
+        """저장소 내용을 events로 교체 (저장소를 처음 만들 때 사용)"""
+        self._modify()
+        with self._conn:
+            self._conn.execute("DELETE FROM events")
+            self._conn.execute("DELETE FROM event_categories")
+        return self.upsert(events)
+
+    def compact(self) -> None:
+        """삭제로 생긴 빈 페이지 정리 (업로드 크기 축소)"""
+        self._modify()
+        self._conn.execute("VACUUM")
+
+    def size_bytes(self) -> int:
+        if self.path == ":memory:":
+            page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+            page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+            return page_count * page_size
+        return os.path.getsize(self.path)
+
+
+def open_event_store(bucket: str, key: str, path: str = EVENT_STORE_PATH) -> EventStore:
+    """
+    S3의 이벤트 저장소를 path로 동기화하여 열기
+    warm 컨테이너에서는 ETag가 같으면 다시 받지 않고, 처음 수정할 때 로컬 사본을 무효화한다.
+
+    Args:
+        bucket: S3 버킷 이름
+        key: 저장소 객체 키
+        path: 로컬 SQLite 파일 경로
+
+    Returns:
+        EventStore (객체가 없거나 열 수 없으면 빈 저장소)
+    """
+    # 객체가 없으면 download_file이 디렉터리를 만들지 않으므로 (최초 실행) 먼저 만든다
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    download_file(bucket, key, path)
+    try:
+        return EventStore(path, on_modify=lambda: invalidate_file(path))
+    except (sqlite3.DatabaseError, ValueError) as e:
+        logger.warning(f"이벤트 저장소를 열 수 없어 새로 만듭니다: {path} ({e})")
+        invalidate_file(path)
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+        return EventStore(path)
+
+
+def save_event_store(store: EventStore, bucket: str, key: str) -> dict:
+    """
+    이벤트 저장소 파일을 S3에 업로드 (open_event_store와 짝)
+
+    Returns:
+        업로드 결과 딕셔너리 (upload_ics와 같은 형식)
+    """
+    return upload_file(bucket, key, store.path, content_type='application/vnd.sqlite3', content_encoding='gzip')
@@ -4,10 +4,27 @@ ics 라이브러리를 사용하여 통일된 ICS 파일을 생성합니다.
 """
 
 from ics import Calendar, Event
-from datetime import datetime, date, time
-from typing import List, Optional
+from dataclasses import replace
+from datetime import datetime, time, timezone
+from .event_record import EventRecord, ONE_DAY, to_utc
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Union
+import io
 import uuid
 
+CRLF = "\r\n"
+PRODID = "ics.py - http://git.io/lLljaA"
+MAX_LINE_OCTETS = 75
+
+# 이벤트 이터러블을 접어서(fold) 기록할 때의 VCALENDAR 헤더/푸터
+CALENDAR_HEADER = f"BEGIN:VCALENDAR{CRLF}VERSION:2.0{CRLF}PRODID:{PRODID}{CRLF}".encode("utf-8")
+CALENDAR_FOOTER = f"END:VCALENDAR{CRLF}".encode("utf-8")
+
+# 직렬화기가 직접 다루는 ics.Event 속성 외의 값이 있으면 ics 라이브러리 직렬화로 대체
+_UNSUPPORTED_EVENT_FIELDS = (
+    "_duration", "last_modified", "location", "transparent", "geo",
+    "organizer", "_status", "_classification",
+)
+
 
 def create_event(
     title: str,
@@ -16,50 +33,55 @@ def create_event(
     categories: List[str] = "EVENT",
     url: Optional[str] = None,
     description: Optional[str] = None,
-) -> Event:
+) -> EventRecord:
     """
     ICS 이벤트 생성
 
     Args:
         title: 이벤트 제목
-        start_date: 시작 날짜/시간
+        start_date: 시작 날짜/시간 (00:00이면 하루종일 이벤트)
         end_date: 종료 날짜/시간 (옵션)
-        category: 카테고리 (STANDARD, EVENT, SCHOLARSHIP)
+        categories: 카테고리 리스트 (STANDARD, EVENT, SCHOLARSHIP)
         url: 이벤트 URL (옵션)
-        all_day: 하루종일 이벤트 여부
+        description: 설명 (옵션)
 
     Returns:
-        Event 객체
+        EventRecord 객체
+
+    Raises:
+        ValueError: 종료가 시작보다 앞서는 경우
     """
-    event = Event()
-    event.name = title
-    event.created = datetime.now()
-    
     all_day = start_date.time() == time(0, 0)
     if end_date == None:
         end_date = start_date
 
     if all_day:
-        # 하루종일 이벤트
-        event.begin = start_date.date() if isinstance(start_date, datetime) else start_date
-        if end_date:
-            event.end = end_date.date() if isinstance(end_date, datetime) else end_date
-        event.make_all_day()
+        # 하루종일 이벤트: 종료일 다음 날까지 (ICS DTEND는 exclusive)
+        start = start_date.date() if isinstance(start_date, datetime) else start_date
+        last = end_date.date() if isinstance(end_date, datetime) else end_date
+        if last < start:
+            raise ValueError('End must be after begin')
+        end = last + ONE_DAY
     else:
         # 시간 지정 이벤트
-        event.begin = start_date
-        if end_date:
-            event.end = end_date
-
-    event.categories = categories
-    if url:
-        event.url = url
-    if description:
-        event.description = description
-
-    event.uid = f"{uuid.uuid5(uuid.NAMESPACE_OID, title)}@yourssu.com"
-
-    return event
+        if to_utc(end_date) < to_utc(start_date):
+            raise ValueError('End must be after begin')
+        start, end = start_date, end_date
+
+    if isinstance(categories, str):
+        categories = [categories]
+
+    return EventRecord(
+        uid=f"{uuid.uuid5(uuid.NAMESPACE_OID, title)}@yourssu.com",
+        title=title,
+        start=start,
+        end=end,
+        all_day=all_day,
+        categories=tuple(categories or ()),
+        url=url or None,
+        description=description or None,
+        created=datetime.now(timezone.utc),
+    )
 
 
 def split_long_duration_event(
@@ -70,7 +92,7 @@ def split_long_duration_event(
     url: Optional[str] = None,
     threshold_days: int = 7,
     description: Optional[str] = None,
-) -> List[Event]:
+) -> List[EventRecord]:
     """
     7일 이상 이벤트를 시작/마감으로 분리
 
@@ -84,7 +106,7 @@ def split_long_duration_event(
         has_time: 시간 정보 포함 여부
 
     Returns:
-        Event 객체 리스트 (1개 또는 2개)
+        EventRecord 리스트 (1개 또는 2개)
     """
     has_time = end_date.time() != time(0, 0)
     duration = (end_date - start_date).days
@@ -124,56 +146,328 @@ def split_long_duration_event(
     return events
 
 
-def create_calendar_from_events(events: List[Event]) -> Calendar:
+def create_calendar_from_events(events: Iterable[Union[EventRecord, Event]]) -> Calendar:
     """
     이벤트 리스트로 Calendar 객체 생성
+    ics 라이브러리 객체가 꼭 필요할 때만 사용 (직렬화는 write_calendar 사용)
 
     Args:
-        events: Event 객체 리스트
+        events: EventRecord 또는 Event 리스트
 
     Returns:
         Calendar 객체
     """
     calendar = Calendar()
     for event in events:
+        if isinstance(event, EventRecord):
+            event = event.to_ics_event()
         calendar.events.add(event)
     return calendar
 
 
-def serialize_calendar(calendar: Calendar) -> str:
+def serialize_calendar(calendar: Calendar, fold: bool = True) -> str:
     """
     Calendar 객체를 ICS 문자열로 직렬화
 
     Args:
         calendar: Calendar 객체
+        fold: RFC 5545 줄 접기 여부 (False면 ics 라이브러리의 str(Calendar)와 동일한 출력)
 
     Returns:
         ICS 형식 문자열
     """
-    return str(calendar)
+    return write_calendar(calendar, fold=fold)
+
+
+def escape_text(value: str) -> str:
+    """RFC 5545 TEXT 값 이스케이프 (백슬래시, 세미콜론, 쉼표, 줄바꿈)"""
+    return value.replace("\\", "\\\\") \
+        .replace(";", "\\;") \
+        .replace(",", "\\,") \
+        .replace("\n", "\\n") \
+        .replace("\r", "\\r")
+
+
+def fold_line(line: str) -> str:
+    """
+    RFC 5545 3.1 줄 접기: 75 옥텟을 넘는 줄을 CRLF + 공백으로 나눔
+    UTF-8 멀티바이트 문자는 중간에서 자르지 않는다.
+
+    Args:
+        line: 줄바꿈 없는 content line
+
+    Returns:
+        접힌 content line (마지막 CRLF 제외)
+    """
+    if len(line) <= MAX_LINE_OCTETS and line.isascii():
+        return line
+    if len(line.encode("utf-8")) <= MAX_LINE_OCTETS:
+        return line
+
+    parts = []
+    current = []
+    size = 0
+    limit = MAX_LINE_OCTETS
+    for char in line:
+        char_size = len(char.encode("utf-8"))
+        if size + char_size > limit:
+            parts.append("".join(current))
+            current = []
+            size = 0
+            limit = MAX_LINE_OCTETS - 1  # 이어지는 줄은 앞의 공백 1옥텟 포함
+        current.append(char)
+        size += char_size
+    parts.append("".join(current))
+    return (CRLF + " ").join(parts)
+
+
+def _format_utc(value) -> str:
+    return to_utc(value).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _format_date(value) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y%m%d")
+
+
+def iter_event_lines(event: Union[EventRecord, Event]) -> Iterator[str]:
+    """
+    이벤트 하나를 content line 단위로 생성
+    ics 라이브러리 EventSerializer와 같은 속성 순서를 따른다.
+
+    Args:
+        event: EventRecord 또는 Event 객체
+
+    Yields:
+        줄바꿈 없는 content line
+    """
+    if isinstance(event, EventRecord):
+        yield from _iter_record_lines(event)
+        return
+
+    if event.alarms or event.attendees or any(getattr(event, field, None) for field in _UNSUPPORTED_EVENT_FIELDS):
+        yield from event.serialize().split(CRLF)
+        return
+
+    yield "BEGIN:VEVENT"
+    for line in event.extra:
+        yield from str(line).split(CRLF)
+    if event.begin and event.all_day:
+        yield "DTSTART;VALUE=DATE:" + _format_date(event.begin)
+        if event._end_time:
+            yield "DTEND;VALUE=DATE:" + _format_date(event.end)
+    if event.categories:
+        yield "CATEGORIES:" + ",".join([escape_text(category) for category in event.categories])
+    if event.created:
+        yield "DTSTAMP:" + _format_utc(event.created)
+    if event.description:
+        yield "DESCRIPTION:" + escape_text(event.description)
+    if event.begin and event._end_time and not event.all_day:
+        yield "DTEND:" + _format_utc(event.end)
+    if event.begin and not event.all_day:
+        yield "DTSTART:" + _format_utc(event.begin)
+    if event.name:
+        yield "SUMMARY:" + escape_text(event.name)
+    yield "UID:" + event.uid
+    if event.url:
+        yield "URL:" + escape_text(event.url)
+    yield "END:VEVENT"
+
+
+def _iter_record_lines(record: EventRecord) -> Iterator[str]:
+    yield "BEGIN:VEVENT"
+    if record.all_day:
+        yield "DTSTART;VALUE=DATE:" + record.start.strftime("%Y%m%d")
+        if record.has_explicit_end:
+            yield "DTEND;VALUE=DATE:" + record.end.strftime("%Y%m%d")
+    if record.categories:
+        yield "CATEGORIES:" + ",".join([escape_text(category) for category in record.categories])
+    if record.created:
+        yield "DTSTAMP:" + _format_utc(record.created)
+    if record.description:
+        yield "DESCRIPTION:" + escape_text(record.description)
+    if not record.all_day:
+        yield "DTEND:" + _format_utc(record.end)
+        yield "DTSTART:" + _format_utc(record.start)
+    if record.title:
+        yield "SUMMARY:" + escape_text(record.title)
+    yield "UID:" + record.uid
+    if record.url:
+        yield "URL:" + escape_text(record.url)
+    yield "END:VEVENT"
+
+
+def iter_calendar_lines(source: Union[Calendar, Iterable[Union[EventRecord, Event]]]) -> Iterator[str]:
+    """
+    VCALENDAR 헤더, 각 VEVENT, 푸터를 content line 단위로 생성
+    Calendar가 주어지면 ics 라이브러리와 같이 PRODID/CALSCALE/METHOD 등 캘린더 속성도 기록한다.
+    """
+    calendar = source if isinstance(source, Calendar) else None
+    events = source.events if calendar else source
+
+    yield "BEGIN:VCALENDAR"
+    if calendar:
+        for line in calendar.extra:
+            yield from str(line).split(CRLF)
+    yield "VERSION:2.0"
+    yield "PRODID:" + (calendar.creator if calendar and calendar.creator else PRODID)
+    if calendar and calendar.scale:
+        yield "CALSCALE:" + calendar.scale.upper()
+    for event in events:
+        yield from iter_event_lines(event)
+    if calendar and calendar.method:
+        yield "METHOD:" + calendar.method.upper()
+    if calendar:
+        for todo in calendar.todos:
+            yield from todo.serialize().split(CRLF)
+    yield "END:VCALENDAR"
+
+
+def iter_calendar_chunks(source: Union[Calendar, Iterable[Union[EventRecord, Event]]], fold: bool = True) -> Iterator[str]:
+    """
+    ICS 문서를 줄 단위 문자열 조각으로 생성 (전체 문서를 메모리에 만들지 않음)
+
+    Args:
+        source: Calendar 또는 EventRecord/Event 이터러블
+        fold: True면 RFC 5545 줄 접기 + 모든 줄 CRLF 종료,
+              False면 ics 라이브러리 출력과 같이 접지 않고 마지막 CRLF 생략
+
+    Yields:
+        이어 붙이면 ICS 문서가 되는 문자열 조각
+    """
+    if fold:
+        for line in iter_calendar_lines(source):
+            yield fold_line(line) + CRLF
+        return
+
+    lines = iter_calendar_lines(source)
+    yield next(lines)
+    for line in lines:
+        yield CRLF + line
+
+
+def write_calendar(
+    source: Union[Calendar, Iterable[Union[EventRecord, Event]]],
+    target: Optional[IO] = None,
+    fold: bool = True,
+    encoding: str = "utf-8",
+) -> Union[str, int]:
+    """
+    이벤트들을 ICS 형식으로 직접 기록 (ics.Calendar.__str__ 미사용)
+
+    Args:
+        source: Calendar 또는 EventRecord/Event 이터러블
+        target: 기록할 스트림 (텍스트/바이너리 file-like). 없으면 문자열 반환
+        fold: RFC 5545 줄 접기 여부 (iter_calendar_chunks 참고)
+        encoding: 바이너리 스트림에 쓸 때의 인코딩
+
+    Returns:
+        target이 없으면 ICS 문자열, 있으면 기록한 바이트(텍스트 스트림은 문자) 수
+    """
+    chunks = iter_calendar_chunks(source, fold=fold)
+    if target is None:
+        return "".join(chunks)
+
+    written = 0
+    if isinstance(target, io.TextIOBase):
+        for chunk in chunks:
+            written += target.write(chunk)
+    else:
+        for chunk in chunks:
+            written += target.write(chunk.encode(encoding))
+    return written
+
+
+def event_sort_key(event) -> tuple:
+    """
+    출력 정렬 키: (시작 시각(UTC), UID)
+    하루종일 이벤트는 해당 날짜 00:00 UTC로 취급한다.
+    """
+    start = event.start if hasattr(event, "start") else event.begin
+    if start is None:
+        instant = datetime.min.replace(tzinfo=timezone.utc)
+    elif isinstance(start, datetime):
+        instant = to_utc(start)
+    else:
+        instant = datetime.combine(start, time(0, 0), timezone.utc)
+    return instant, event.uid
 
 
-def filter_events_by_categories(calendar: Calendar, categories: set) -> Calendar:
+def stabilize_events(
+    records: Iterable[EventRecord],
+    first_seen: Optional[Dict[str, datetime]] = None,
+) -> List[EventRecord]:
+    """
+    같은 입력이면 같은 바이트가 나오도록 이벤트 정리
+
+    - DTSTAMP: 이전 출력에 같은 UID가 있으면 그 값(최초 발견 시각)을 유지
+    - 순서: 시작 시각, UID 순으로 정렬
+
+    Args:
+        records: EventRecord 이터러블
+        first_seen: UID -> 최초 발견 시각 (ics_reader.read_first_seen 결과)
+
+    Returns:
+        정렬된 EventRecord 리스트
+    """
+    first_seen = first_seen or {}
+    stable = []
+    for record in records:
+        created = first_seen.get(record.uid)
+        if created is not None and created != record.created:
+            record = replace(record, created=created)
+        stable.append(record)
+    stable.sort(key=event_sort_key)
+    return stable
+
+
+def assemble_calendar(fragments: Iterable[bytes]) -> bytes:
+    """
+    VEVENT 바이트 조각들을 공통 헤더/푸터 사이에 이어 붙여 ICS 문서 생성
+    조각이 write_calendar와 같은 형식(접힌 줄, CRLF 종료)이면 write_calendar(events).encode()와 같은 바이트를 만든다.
+
+    Args:
+        fragments: BEGIN:VEVENT ~ END:VEVENT 바이트 이터러블 (예: RawEvent.to_bytes 결과)
+
+    Returns:
+        ICS 문서 바이트
+    """
+    return b"".join([CALENDAR_HEADER, *fragments, CALENDAR_FOOTER])
+
+
+def iter_calendar_fragments(fragments: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    assemble_calendar와 같은 바이트를 조각 단위로 생성 (스트리밍 업로드용, 전체 문서를 만들지 않음)
+
+    Args:
+        fragments: BEGIN:VEVENT ~ END:VEVENT 바이트 이터러블 (예: RawEvent.to_bytes 결과)
+
+    Yields:
+        헤더, 이벤트 조각, 푸터 바이트
+    """
+    yield CALENDAR_HEADER
+    yield from fragments
+    yield CALENDAR_FOOTER
+
+
+def filter_events_by_categories(
+    source: Union[Calendar, Iterable[Union[EventRecord, Event]]],
+    categories: set,
+) -> List[Union[EventRecord, Event]]:
     """
     카테고리로 이벤트 필터링
 
     Args:
-        calendar: Calendar 객체
+        source: Calendar 또는 EventRecord/Event 이터러블
         categories: 필터링할 카테고리 집합
 
     Returns:
-        필터링된 Calendar 객체
+        필터링된 이벤트 리스트 (write_calendar로 바로 직렬화 가능)
     """
     if not categories:
-        # 빈 집합이면 빈 캘린더 반환
-        return Calendar()
-
-    filtered_calendar = Calendar()
+        # 빈 집합이면 빈 리스트 반환
+        return []
 
-    for event in calendar.events:
-        # 이벤트의 카테고리가 필터 카테고리와 교집합이 있으면 포함
-        event_categories = set(event.categories) if event.categories else set()
-        if event_categories & categories:
-            filtered_calendar.events.add(event)
+    events = source.events if isinstance(source, Calendar) else source
 
-    return filtered_calendar
+    # 이벤트의 카테고리가 필터 카테고리와 교집합이 있으면 포함
+    return [event for event in events if not categories.isdisjoint(event.categories or ())]
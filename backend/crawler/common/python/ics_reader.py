@@ -0,0 +1,295 @@
+"""
+ICS 읽기 모듈
+ICS 문서를 VEVENT 블록 단위로 빠르게 나눕니다.
+병합에 필요한 UID, SUMMARY, CATEGORIES, DTSTART, DTEND, DTSTAMP만 추출하고 원본 블록은 그대로 보관하여
+ics 라이브러리 파싱 없이 다시 기록할 수 있게 합니다.
+"""
+
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+CRLF = "\r\n"
+ONE_DAY = timedelta(days=1)
+
+# 병합에서 사용하는 속성만 해석
+_WANTED_PROPERTIES = ("UID", "SUMMARY", "CATEGORIES", "DTSTART", "DTEND", "DTSTAMP")
+
+
+@dataclass(frozen=True, slots=True)
+class RawEvent:
+    """
+    원본 VEVENT 블록과 병합에 필요한 속성
+
+    raw는 BEGIN:VEVENT ~ END:VEVENT 원문이며 모든 줄이 CRLF로 끝난다 (접힌 줄 유지).
+    start/end는 DATE 값이면 date, DATE-TIME 값이면 datetime이다 (Z는 UTC, TZID는 해당 시간대).
+    """
+    uid: str
+    categories: Tuple[str, ...]
+    start: Optional[Union[date, datetime]]
+    end: Optional[Union[date, datetime]]
+    raw: str
+    created: Optional[datetime] = None  # DTSTAMP
+    title: str = ""  # SUMMARY
+
+    @property
+    def all_day(self) -> bool:
+        return self.start is not None and not isinstance(self.start, datetime)
+
+    @property
+    def end_date(self) -> Optional[date]:
+        """이벤트가 끝나는 날 (하루종일 이벤트의 DTEND는 exclusive)"""
+        if self.end is None:
+            if self.start is None:
+                return None
+            return self.start if self.all_day else self.start.date()
+        if isinstance(self.end, datetime):
+            return self.end.date()
+        return self.end - ONE_DAY
+
+    def to_bytes(self, encoding: str = "utf-8") -> bytes:
+        """원본 블록을 다시 기록할 바이트 (ics_builder.assemble_calendar/iter_calendar_fragments 조각)"""
+        return self.raw.encode(encoding)
+
+    @property
+    def start_date(self) -> Optional[date]:
+        if self.start is None or not isinstance(self.start, datetime):
+            return self.start
+        return self.start.date()
+
+    def with_uid(self, uid: str) -> 'RawEvent':
+        """UID 줄만 바꾼 새 RawEvent (하위 컴포넌트의 UID는 유지)"""
+        lines = []
+        depth = 0
+        skipping = False
+        for line in self.raw.split(CRLF)[:-1]:
+            if line[:1] in (" ", "\t"):
+                if not skipping:
+                    lines.append(line)
+                continue
+            skipping = False
+            upper = line[:6].upper()
+            if upper.startswith("BEGIN:"):
+                depth += 1
+            elif upper.startswith("END:"):
+                depth -= 1
+            elif depth == 1 and upper[:4] in ("UID:", "UID;"):
+                lines.append("UID:" + uid)
+                skipping = True
+                continue
+            lines.append(line)
+        return replace(self, uid=uid, raw=CRLF.join(lines) + CRLF)
+
+
+def _iter_physical_lines(source: Union[str, Iterable[str]]) -> Iterator[str]:
+    # str.splitlines()는 U+2028 등도 줄바꿈으로 보므로 LF 기준으로만 나눈다
+    lines = source.split("\n") if isinstance(source, str) else source
+    for line in lines:
+        if line.endswith("\n"):
+            line = line[:-1]
+        if line.endswith("\r"):
+            line = line[:-1]
+        yield line
+
+
+def _split_property(line: str) -> Tuple[str, Dict[str, str], str]:
+    """content line을 (이름, 파라미터, 값)으로 분리 (따옴표 안의 ':'/';'는 무시)"""
+    colon = line.find(":")
+    head = line if colon < 0 else line[:colon]
+    if '"' in head:
+        colon = _find_unquoted(line, ":")
+        head = line if colon < 0 else line[:colon]
+    value = "" if colon < 0 else line[colon + 1:]
+
+    name, _, param_text = head.partition(";")
+    params = {}
+    if param_text:
+        for param in param_text.split(";"):
+            key, _, param_value = param.partition("=")
+            params[key.upper()] = param_value.strip('"')
+    return name.upper(), params, value
+
+
+def _find_unquoted(line: str, char: str) -> int:
+    quoted = False
+    for index, current in enumerate(line):
+        if current == '"':
+            quoted = not quoted
+        elif current == char and not quoted:
+            return index
+    return -1
+
+
+def unescape_text(value: str) -> str:
+    """RFC 5545 TEXT 값 이스케이프 해제"""
+    if "\\" not in value:
+        return value
+    result = []
+    chars = iter(value)
+    for char in chars:
+        if char == "\\":
+            escaped = next(chars, "")
+            result.append("\n" if escaped in ("n", "N") else escaped)
+        else:
+            result.append(char)
+    return "".join(result)
+
+
+def split_text_list(value: str) -> List[str]:
+    """이스케이프되지 않은 쉼표로 나눈 TEXT 목록 (CATEGORIES 값)"""
+    if "\\" not in value:
+        return value.split(",")
+    items = []
+    start = 0
+    index = 0
+    while index < len(value):
+        char = value[index]
+        if char == "\\":
+            index += 2
+            continue
+        if char == ",":
+            items.append(unescape_text(value[start:index]))
+            start = index + 1
+        index += 1
+    items.append(unescape_text(value[start:]))
+    return items
+
+
+def parse_ics_datetime(value: str, params: Optional[Dict[str, str]] = None) -> Union[date, datetime]:
+    """
+    DATE / DATE-TIME 값 파싱
+
+    Args:
+        value: 20261101 / 20261101T090000 / 20261101T000000Z 형식 값
+        params: 속성 파라미터 (TZID 사용)
+
+    Returns:
+        date 또는 datetime (Z는 UTC, TZID는 해당 시간대, 그 외는 naive)
+
+    Raises:
+        ValueError: 형식이 맞지 않거나 TZID가 IANA 시간대가 아닌 경우
+    """
+    value = value.strip()
+    if len(value) == 8:
+        return date(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+    if len(value) not in (15, 16) or value[8] != "T":
+        raise ValueError(f"잘못된 ICS 날짜 값: {value!r}")
+
+    parsed = datetime(
+        int(value[0:4]), int(value[4:6]), int(value[6:8]),
+        int(value[9:11]), int(value[11:13]), int(value[13:15]),
+    )
+    if value.endswith("Z"):
+        return parsed.replace(tzinfo=timezone.utc)
+    tzid = (params or {}).get("TZID")
+    if tzid:
+        try:
+            zone = ZoneInfo(tzid)
+        except (ZoneInfoNotFoundError, ValueError) as e:
+            # VTIMEZONE 정의만 있는 비표준 TZID (예: "Korea Standard Time")는 시각을 추측하지 않는다
+            raise ValueError(f"알 수 없는 TZID: {tzid!r}") from e
+        return parsed.replace(tzinfo=zone)
+    return parsed
+
+
+def _build_event(lines: List[str], properties: Dict[str, Tuple[Dict[str, str], str]]) -> RawEvent:
+    categories = []
+    if "CATEGORIES" in properties:
+        for params, value in properties["CATEGORIES"]:
+            categories.extend(item for item in split_text_list(value) if item)
+
+    def _datetime(name):
+        if name not in properties:
+            return None
+        params, value = properties[name][0]
+        return parse_ics_datetime(value, params)
+
+    uid = properties["UID"][0][1] if "UID" in properties else ""
+    return RawEvent(
+        uid=uid,
+        categories=tuple(sorted(categories)),
+        start=_datetime("DTSTART"),
+        end=_datetime("DTEND"),
+        raw=CRLF.join(lines) + CRLF,
+        created=_datetime("DTSTAMP"),
+        title=unescape_text(properties["SUMMARY"][0][1]) if "SUMMARY" in properties else "",
+    )
+
+
+def iter_raw_events(source: Union[str, Iterable[str]]) -> Iterator[RawEvent]:
+    """
+    ICS 문서를 VEVENT 블록 단위로 스트리밍 분리
+
+    접힌 줄(CRLF + 공백/탭)은 속성 해석 시에만 펼치고 원본 블록에는 그대로 둔다.
+    VEVENT 안의 하위 컴포넌트(VALARM 등) 속성은 무시한다.
+
+    Args:
+        source: ICS 문자열 또는 줄 단위 이터러블 (열린 파일 등)
+
+    Yields:
+        RawEvent (CATEGORIES는 정렬된 튜플)
+
+    Raises:
+        ValueError: DTSTART/DTEND/DTSTAMP 값 형식이나 TZID가 잘못된 경우
+    """
+    block: Optional[List[str]] = None
+    properties: Dict[str, list] = {}
+    logical: List[str] = []
+    depth = 0
+
+    def _flush_logical():
+        if not logical:
+            return
+        line = logical[0] if len(logical) == 1 else "".join(logical)
+        logical.clear()
+        if depth != 1:
+            return
+        name, params, value = _split_property(line)
+        if name in _WANTED_PROPERTIES:
+            properties.setdefault(name, []).append((params, value))
+
+    for line in _iter_physical_lines(source):
+        if block is None:
+            if line.upper() == "BEGIN:VEVENT":
+                block = [line]
+                properties = {}
+                depth = 1
+            continue
+
+        block.append(line)
+        if line[:1] in (" ", "\t"):
+            logical.append(line[1:])
+            continue
+
+        _flush_logical()
+        upper = line.upper()
+        if upper.startswith("BEGIN:"):
+            depth += 1
+        elif upper.startswith("END:"):
+            depth -= 1
+            if depth == 0:
+                yield _build_event(block, properties)
+                block = None
+        else:
+            logical.append(line)
+
+
+def read_raw_events(source: Union[str, Iterable[str]]) -> List[RawEvent]:
+    """iter_raw_events 결과 리스트"""
+    return list(iter_raw_events(source))
+
+
+def read_first_seen(source: Optional[Union[str, Iterable[str]]]) -> Dict[str, datetime]:
+    """
+    이전 출력에서 UID -> DTSTAMP(최초 발견 시각) 매핑 생성
+
+    Args:
+        source: 이전 ICS 문서 (없으면 빈 매핑)
+
+    Returns:
+        UID -> DTSTAMP 딕셔너리
+    """
+    if not source:
+        return {}
+    return {event.uid: event.created for event in iter_raw_events(source) if event.created}
@@ -0,0 +1,194 @@
+"""
+이벤트 identity index 모듈
+(소스, 정규화 제목, 날짜)를 고정 UID에 매핑하여 병합 간 이벤트 정체성을 유지하고,
+이전 병합 결과 대비 추가/수정/삭제 diff를 계산합니다.
+"""
+
+import hashlib
+import re
+import unicodedata
+import uuid
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .ics_builder import event_sort_key
+from .ics_reader import RawEvent
+
+INDEX_VERSION = 1
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_title(title: str) -> str:
+    """제목 정규화 (NFKC, 공백 정리, 소문자)"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", title or "")).strip().lower()
+
+
+def identity_key(source: str, title: str, day: Optional[date]) -> str:
+    """identity index 키: 소스, 정규화 제목, 시작 날짜를 탭으로 연결 (정규화 제목에는 탭이 없음)"""
+    return f"{source}\t{normalize_title(title)}\t{day.isoformat() if day else ''}"
+
+
+def derive_uid(key: str) -> str:
+    """identity 키에서 결정적으로 만든 UID (크롤러 UID가 이미 다른 이벤트에 쓰인 경우 사용)"""
+    return f"{uuid.uuid5(uuid.NAMESPACE_OID, key)}@yourssu.com"
+
+
+def content_digest(event: RawEvent) -> str:
+    return hashlib.sha1(event.raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class MergeDiff:
+    """이전 병합 대비 변경된 이벤트 UID 목록"""
+    added: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    expired: List[str] = field(default_factory=list)  # 보존 기간이 지나 제거한 이벤트
+    expired_bytes: int = 0                             # 제거한 VEVENT 블록 크기 합
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.updated or self.removed or self.expired)
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            'added': len(self.added),
+            'updated': len(self.updated),
+            'removed': len(self.removed),
+            'unchanged': self.unchanged,
+            'expired': len(self.expired),
+            'expired_bytes': self.expired_bytes,
+        }
+
+
+class IdentityIndex:
+    """
+    identity 키 -> {uid, source, date, digest} 매핑
+
+    - 처음 보는 identity는 크롤러가 만든 UID를 그대로 쓰되, 다른 identity가 이미 쓰는 UID면
+      identity 키로 UID를 새로 만든다 (같은 제목, 다른 날짜 충돌 방지).
+    - 소스가 이번 실행에서 다룬 날짜 범위 안에서 사라진 identity는 삭제로 본다
+      (범위 밖은 크롤러 날짜 필터로 빠진 과거 이벤트이므로 유지).
+    """
+
+    def __init__(self, entries: Optional[Dict[str, dict]] = None):
+        self.entries: Dict[str, dict] = entries or {}
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> 'IdentityIndex':
+        if not data or data.get('version') != INDEX_VERSION:
+            return cls()
+        return cls(dict(data.get('entries', {})))
+
+    def to_dict(self) -> dict:
+        return {'version': INDEX_VERSION, 'entries': self.entries}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def uids_by_source(self) -> Dict[str, List[str]]:
+        """소스 -> 그 소스가 기여한 UID 목록"""
+        result: Dict[str, List[str]] = {}
+        for entry in self.entries.values():
+            result.setdefault(entry['source'], []).append(entry['uid'])
+        return result
+
+    def forget_uids(self, uids: Iterable[str]) -> int:
+        """
+        UID에 해당하는 identity 삭제 (보존 기간이 지난 이벤트)
+        다시 크롤링되면 새 이벤트로 추가된다.
+
+        Returns:
+            삭제한 identity 수
+        """
+        uids = set(uids)
+        if not uids:
+            return 0
+        keys = [key for key, entry in self.entries.items() if entry['uid'] in uids]
+        for key in keys:
+            del self.entries[key]
+        return len(keys)
+
+    def apply(
+        self,
+        sources: Dict[str, Iterable[RawEvent]],
+        existing: Iterable[RawEvent] = (),
+    ) -> Tuple[List[RawEvent], MergeDiff]:
+        """
+        소스별 새 이벤트를 index에 반영하고 병합 결과와 diff 계산
+
+        Args:
+            sources: 소스 키(raw 파일 키) -> RawEvent 목록 (이번에 읽은 소스만)
+            existing: 이전 병합 결과 (기존 merged_all.ics)
+
+        Returns:
+            (시작 시각/UID 순으로 정렬된 병합 이벤트, MergeDiff)
+        """
+        diff = MergeDiff()
+        events_by_uid = {event.uid: event for event in existing}
+        owners = {entry['uid']: key for key, entry in self.entries.items()}
+        seen = set()
+
+        for source, events in sources.items():
+            first_day = last_day = None
+            for event in events:
+                day = event.start_date
+                key = identity_key(source, event.title, day)
+                if key in seen:
+                    continue  # 같은 소스 안의 완전히 같은 이벤트는 처음 것만 사용
+                seen.add(key)
+                if day is not None:
+                    first_day = day if first_day is None else min(first_day, day)
+                    last_day = day if last_day is None else max(last_day, day)
+
+                entry = self.entries.get(key)
+                if entry is not None:
+                    uid = entry['uid']
+                elif event.uid and owners.get(event.uid, key) == key:
+                    uid = event.uid
+                else:
+                    uid = derive_uid(key)
+                if event.uid != uid:
+                    event = event.with_uid(uid)
+
+                digest = content_digest(event)
+                if entry is None:
+                    diff.added.append(uid)
+                elif entry['digest'] != digest or uid not in events_by_uid:
+                    diff.updated.append(uid)
+                else:
+                    diff.unchanged += 1
+
+                self.entries[key] = {
+                    'uid': uid,
+                    'source': source,
+                    'date': day.isoformat() if day else None,
+                    'digest': digest,
+                }
+                owners[uid] = key
+                events_by_uid[uid] = event
+
+            if first_day is not None:
+                self._remove_missing(source, first_day.isoformat(), last_day.isoformat(), seen, events_by_uid, diff)
+
+        merged = sorted(events_by_uid.values(), key=event_sort_key)
+        return merged, diff
+
+    def _remove_missing(
+        self,
+        source: str,
+        first_day: str,
+        last_day: str,
+        seen: set,
+        events_by_uid: Dict[str, RawEvent],
+        diff: MergeDiff,
+    ) -> None:
+        for key in [key for key, entry in self.entries.items() if entry['source'] == source and key not in seen]:
+            day = self.entries[key]['date']
+            if day is None or not (first_day <= day <= last_day):
+                continue
+            uid = self.entries.pop(key)['uid']
+            events_by_uid.pop(uid, None)
+            diff.removed.append(uid)
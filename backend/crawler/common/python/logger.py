@@ -1,12 +1,21 @@
 """
 통합 로깅 모듈
-Lambda CloudWatch에 최적화된 로거를 제공합니다.
+Lambda CloudWatch에 최적화된 로거와 단계별 실행 시간 측정(StageTimer)을 제공합니다.
+단계별 시간/건수/바이트는 CloudWatch Embedded Metric Format(EMF)으로 출력하여 로그에서 바로 메트릭이 됩니다.
 """
 
+import asyncio
+import functools
 import logging
 import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Dict, Iterator, Optional
+
+from .config import METRICS_NAMESPACE
 
 
 def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
@@ -36,12 +45,165 @@ def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     return logger
 
 
+@dataclass
+class StageStats:
+    """단계 하나의 누적 측정값 (stage 블록 안에서 count, bytes를 채운다)"""
+    seconds: float = 0.0
+    calls: int = 0
+    count: int = 0   # 처리한 항목 수 (페이지, 이벤트 등)
+    bytes: int = 0   # 주고받거나 만든 바이트 수
+
+    def to_dict(self) -> dict:
+        result = {'seconds': round(self.seconds, 4), 'calls': self.calls}
+        if self.count:
+            result['count'] = self.count
+        if self.bytes:
+            result['bytes'] = self.bytes
+        return result
+
+
+class StageTimer:
+    """
+    Lambda 실행 1회의 단계별 소요 시간, 건수, 바이트 기록
+
+    같은 이름의 단계를 여러 번 실행하면 누적한다. 스레드/코루틴에서 동시에 실행된 단계는
+    각 실행 시간의 합이므로 전체 실행 시간보다 클 수 있다.
+
+    사용 예:
+        timer = StageTimer('scholarship')
+        with timer.stage('fetch') as stage:
+            html = fetch(url)
+            stage.bytes = len(html)
+        timer.emit()
+        body['stages'] = timer.summary()
+    """
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: 함수 이름 (EMF Function 차원 값, 예: 크롤러 이름)
+        """
+        self.name = name
+        self.stages: Dict[str, StageStats] = {}
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageStats]:
+        """
+        블록 실행 시간을 name 단계에 누적 (예외가 나도 기록)
+
+        Yields:
+            이번 실행의 StageStats (count, bytes를 채우면 함께 누적)
+        """
+        run = StageStats(calls=1)
+        start = time.perf_counter()
+        try:
+            yield run
+        finally:
+            run.seconds = time.perf_counter() - start
+            self.add(name, run)
+
+    def add(self, name: str, run: StageStats) -> None:
+        """측정값을 name 단계에 누적 (스레드 안전)"""
+        with self._lock:
+            total = self.stages.get(name)
+            if total is None:
+                total = self.stages[name] = StageStats()
+            total.seconds += run.seconds
+            total.calls += run.calls
+            total.count += run.count
+            total.bytes += run.bytes
+
+    def timed(self, name: str) -> Callable:
+        """함수(일반/async) 호출 시간을 name 단계에 누적하는 데코레이터"""
+        def decorator(func: Callable) -> Callable:
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.stage(name):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @property
+    def elapsed(self) -> float:
+        """StageTimer 생성 후 경과 시간 (초)"""
+        return time.perf_counter() - self._started
+
+    def summary(self) -> Dict[str, dict]:
+        """단계 -> {seconds, calls, count, bytes} (실행 순서, 반환 body용)"""
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self.stages.items()}
+
+    def emit(self, namespace: str = METRICS_NAMESPACE, **properties) -> Optional[dict]:
+        """
+        단계별 측정값을 CloudWatch Embedded Metric Format 한 줄로 출력
+
+        메트릭 이름은 Duration(전체), <단계>.Duration, <단계>.Count, <단계>.Bytes이며 차원은 Function 하나다.
+
+        logger가 아니라 print로 stdout에 쓰는 이유: CloudWatch는 로그 줄 전체가 JSON 객체일 때만 EMF로 인식하는데,
+        setup_logger의 핸들러는 '[시각] 레벨 [이름]' 접두사를 붙이고 stderr로 쓴다.
+        Lambda는 stdout도 같은 로그 스트림으로 보내므로 print 한 줄이 그대로 EMF 레코드가 된다.
+
+        Args:
+            namespace: CloudWatch 네임스페이스 (빈 값이면 출력하지 않음)
+            **properties: 메트릭이 아닌 추가 필드 (예: status='error')
+
+        Returns:
+            출력한 EMF 딕셔너리 (출력하지 않았으면 None)
+
+        Raises:
+            ValueError: properties 이름이 _aws, Function 또는 메트릭 이름과 겹치는 경우 (메트릭 값을 덮어쓰지 않도록)
+        """
+        if not namespace:
+            return None
+        definitions = [{'Name': 'Duration', 'Unit': 'Milliseconds'}]
+        values = {'Duration': round(self.elapsed * 1000, 1)}
+        with self._lock:
+            for name, stats in self.stages.items():
+                definitions.append({'Name': f'{name}.Duration', 'Unit': 'Milliseconds'})
+                values[f'{name}.Duration'] = round(stats.seconds * 1000, 1)
+                if stats.count:
+                    definitions.append({'Name': f'{name}.Count', 'Unit': 'Count'})
+                    values[f'{name}.Count'] = stats.count
+                if stats.bytes:
+                    definitions.append({'Name': f'{name}.Bytes', 'Unit': 'Bytes'})
+                    values[f'{name}.Bytes'] = stats.bytes
+        reserved = {'_aws', 'Function', *values}
+        collisions = sorted(reserved.intersection(properties))
+        if collisions:
+            raise ValueError(f"EMF 속성 이름이 예약된 키와 겹칩니다: {', '.join(collisions)}")
+        document = {
+            '_aws': {
+                'Timestamp': int(time.time() * 1000),
+                'CloudWatchMetrics': [{
+                    'Namespace': namespace,
+                    'Dimensions': [['Function']],
+                    'Metrics': definitions,
+                }],
+            },
+            'Function': self.name,
+            **properties,
+            **values,
+        }
+        print(json.dumps(document, ensure_ascii=False), flush=True)
+        return document
+
+
 def log_execution_metrics(
     logger: logging.Logger,
     crawler_name: str,
     duration: float,
     events_count: int,
-    s3_key: str
+    s3_key: str,
+    timer: Optional[StageTimer] = None
 ):
     """
     실행 메트릭을 JSON 형식으로 로깅
@@ -53,6 +215,7 @@ def log_execution_metrics(
         duration: 실행 시간 (초)
         events_count: 생성된 이벤트 수
         s3_key: S3 저장 위치
+        timer: 단계별 측정값 (있으면 stages 필드 추가 + EMF 출력)
     """
     metrics = {
         'crawler': crawler_name,
@@ -61,7 +224,11 @@ def log_execution_metrics(
         's3_key': s3_key,
         'timestamp': datetime.now().isoformat()
     }
+    if timer is not None:
+        metrics['stages'] = timer.summary()
     logger.info(f"Execution metrics: {json.dumps(metrics)}")
+    if timer is not None:
+        timer.emit(status='success', events_count=events_count)
 
 
 def log_crawler_start(logger: logging.Logger, crawler_name: str, url: str):
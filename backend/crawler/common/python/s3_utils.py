@@ -1,46 +1,131 @@
 """
 S3 유틸리티 모듈
-ICS 파일을 S3에 업로드/다운로드하는 기능을 제공합니다.
+ICS 파일(및 병합 상태 JSON)을 S3에 업로드/다운로드하는 기능을 제공합니다.
+실제 요청은 storage.get_storage()가 고른 저장소(S3, 로컬 디렉터리, 메모리)로 보내며,
+S3 클라이언트는 첫 S3 호출 때 만들어 프로세스 안에서 재사용합니다 (warm invocation 간 연결 재사용).
 """
 
-import boto3
-from typing import Optional
-from botocore.exceptions import ClientError
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zlib
+from datetime import datetime
+from typing import IO, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
 import logging
 
+from .config import S3_CACHE_DIR, S3_COMPRESSED_VARIANTS
+from .ics_reader import read_first_seen
+from .storage import StorageError, get_storage
+
 logger = logging.getLogger(__name__)
-s3_client = boto3.client('s3')
 
+_cache_stats = {'hits': 0, 'misses': 0, 'bytes_saved': 0, 'bytes_downloaded': 0}
+_cache_lock = threading.Lock()
+
+# Content-Encoding -> 압축 변형 키 접미사
+COMPRESSED_SUFFIXES = {'gzip': '.gz', 'br': '.br'}
+
+# 파일 객체 source를 읽을 단위
+STREAM_READ_SIZE = 256 * 1024
+
+# upload_ics_stream source: 조각 이터러블, 파일 객체, 또는 이를 새로 만드는 호출 가능 객체
+ChunkSource = Union[Iterable[Union[str, bytes]], IO, Callable[[], Union[Iterable[Union[str, bytes]], IO]]]
+
+
+def find_unchanged_etag(body: bytes, bucket: str, key: str) -> Optional[str]:
+    """
+    S3 객체가 body와 같은 내용이면 그 ETag 반환 (HEAD 요청 한 번)
+
+    단일 PUT 객체의 ETag는 본문 MD5이므로 바로 비교하고, 멀티파트 등으로 ETag가 MD5가 아니면
+    업로드 때 메타데이터에 기록한 sha256과 비교한다.
 
-def upload_ics(ics_content: str, bucket: str, key: str) -> dict:
+    Args:
+        body: 업로드할 바이트
+        bucket: S3 버킷 이름
+        key: S3 객체 키
+
+    Returns:
+        같은 내용이면 ETag, 다르거나 객체가 없으면 None
+    """
+    return _find_unchanged(bucket, key, hashlib.md5(body).hexdigest(), hashlib.sha256(body).hexdigest())
+
+
+def _find_unchanged(bucket: str, key: str, md5_hex: str, sha256_hex: str) -> Optional[str]:
+    try:
+        head = get_storage().head(bucket, key)
+    except StorageError as e:
+        logger.warning(f"S3 HEAD 실패, 업로드 진행: s3://{bucket}/{key} ({e})")
+        return None
+    if head is None:
+        return None
+
+    plain = head.etag.strip('"')
+    if '-' not in plain and plain == md5_hex:
+        return head.etag
+    if head.metadata.get('sha256') == sha256_hex:
+        return head.etag
+    return None
+
+
+def upload_ics(
+    ics_content: Union[str, bytes],
+    bucket: str,
+    key: str,
+    content_encoding: Optional[str] = None,
+    skip_unchanged: bool = False,
+) -> dict:
     """
     ICS 파일을 S3에 업로드
 
     Args:
-        ics_content: ICS 파일 내용
+        ics_content: ICS 파일 내용 (str이면 UTF-8로 인코딩)
         bucket: S3 버킷 이름
         key: S3 객체 키
+        content_encoding: 이미 압축된 내용이면 Content-Encoding 값 (gzip, br)
+        skip_unchanged: True면 S3 객체와 내용이 같을 때 PUT을 생략 (ETag 유지)
 
     Returns:
-        업로드 결과 딕셔너리
+        업로드 결과 딕셔너리 (uploaded: 실제로 PUT 했는지 여부)
     """
+    body = ics_content.encode('utf-8') if isinstance(ics_content, str) else ics_content
+
+    if skip_unchanged:
+        etag = find_unchanged_etag(body, bucket, key)
+        if etag:
+            logger.info(f"S3 업로드 생략 (변경 없음): s3://{bucket}/{key} ({len(body)} bytes)")
+            return {
+                'success': True,
+                'uploaded': False,
+                'bucket': bucket,
+                'key': key,
+                'size': len(body),
+                'etag': etag
+            }
+
     try:
-        response = s3_client.put_object(
-            Bucket=bucket,
-            Key=key,
-            Body=ics_content.encode('utf-8'),
-            ContentType='text/calendar',
-            CacheControl='max-age=3600'
+        info = get_storage().put(
+            bucket,
+            key,
+            body,
+            content_type='text/calendar',
+            content_encoding=content_encoding,
+            cache_control='max-age=3600',
+            metadata={'sha256': hashlib.sha256(body).hexdigest()},
         )
-        logger.info(f"S3 업로드 성공: s3://{bucket}/{key} ({len(ics_content)} bytes)")
+        logger.info(f"S3 업로드 성공: s3://{bucket}/{key} ({len(body)} bytes)")
+        # 방금 올린 내용으로 캐시 갱신 (다음 실행의 download_ics가 조건부 GET으로 재사용)
+        _write_cache(bucket, key, info.etag, body)
         return {
             'success': True,
+            'uploaded': True,
             'bucket': bucket,
             'key': key,
-            'size': len(ics_content),
-            'etag': response.get('ETag')
+            'size': len(body),
+            'etag': info.etag
         }
-    except ClientError as e:
+    except StorageError as e:
         logger.error(f"S3 업로드 실패: {e}")
         return {
             'success': False,
@@ -48,9 +133,126 @@ def upload_ics(ics_content: str, bucket: str, key: str) -> dict:
         }
 
 
+def _cache_paths(bucket: str, key: str):
+    name = hashlib.sha1(f"{bucket}/{key}".encode('utf-8')).hexdigest()
+    base = os.path.join(S3_CACHE_DIR, name)
+    return base + '.body', base + '.etag'
+
+
+def _cache_enabled() -> bool:
+    # 로컬/메모리 저장소는 캐시보다 원본 읽기가 빠르거나 같다
+    return bool(S3_CACHE_DIR) and get_storage().remote
+
+
+def _read_cache(bucket: str, key: str):
+    """캐시된 (etag, body) 또는 (None, None)"""
+    if not _cache_enabled():
+        return None, None
+    body_path, etag_path = _cache_paths(bucket, key)
+    try:
+        with open(etag_path, 'r', encoding='utf-8') as f:
+            etag = f.read()
+        with open(body_path, 'rb') as f:
+            return etag, f.read()
+    except OSError:
+        return None, None
+
+
+def _write_cache(bucket: str, key: str, etag: Optional[str], body: bytes) -> None:
+    """캐시 기록 (임시 파일 + rename으로 원자적 교체, 실패는 무시)"""
+    if not _cache_enabled() or not etag:
+        return
+    body_path, _ = _cache_paths(bucket, key)
+    try:
+        os.makedirs(S3_CACHE_DIR, exist_ok=True)
+        with open(body_path + _cache_temp_suffix(), 'wb') as f:
+            f.write(body)
+    except OSError as e:
+        logger.warning(f"로컬 캐시 기록 실패: s3://{bucket}/{key} ({e})")
+        return
+    _commit_cache(bucket, key, etag)
+
+
+def _cache_temp_suffix() -> str:
+    return f".{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _commit_cache(bucket: str, key: str, etag: Optional[str]) -> None:
+    """같은 스레드가 임시 파일에 써 둔 본문을 etag와 함께 캐시로 교체 (임시 파일이 없으면 무시)"""
+    body_path, etag_path = _cache_paths(bucket, key)
+    suffix = _cache_temp_suffix()
+    if not os.path.exists(body_path + suffix):
+        return
+    try:
+        if not etag:
+            os.remove(body_path + suffix)
+            return
+        with open(etag_path + suffix, 'w') as f:
+            f.write(etag)
+        # etag를 나중에 교체하므로 etag가 가리키는 본문은 항상 새 본문이다
+        os.replace(body_path + suffix, body_path)
+        os.replace(etag_path + suffix, etag_path)
+    except OSError as e:
+        logger.warning(f"로컬 캐시 기록 실패: s3://{bucket}/{key} ({e})")
+
+
+def _tee_to_cache(chunks: Iterable[bytes], bucket: str, key: str) -> Iterator[bytes]:
+    """업로드하는 조각을 캐시 임시 파일에도 기록 (업로드 성공 후 _commit_cache로 교체)"""
+    if not _cache_enabled():
+        yield from chunks
+        return
+    body_path, _ = _cache_paths(bucket, key)
+    try:
+        os.makedirs(S3_CACHE_DIR, exist_ok=True)
+        cache_file = open(body_path + _cache_temp_suffix(), 'wb')
+    except OSError as e:
+        logger.warning(f"로컬 캐시 기록 실패: s3://{bucket}/{key} ({e})")
+        yield from chunks
+        return
+    with cache_file:
+        for chunk in chunks:
+            cache_file.write(chunk)
+            yield chunk
+
+
+def _discard_cache_temp(bucket: str, key: str) -> None:
+    body_path, _ = _cache_paths(bucket, key)
+    try:
+        os.remove(body_path + _cache_temp_suffix())
+    except OSError:
+        pass
+
+
+def _count_cache(hit: bool, size: int) -> None:
+    with _cache_lock:
+        if hit:
+            _cache_stats['hits'] += 1
+            _cache_stats['bytes_saved'] += size
+        else:
+            _cache_stats['misses'] += 1
+            _cache_stats['bytes_downloaded'] += size
+
+
+def get_download_cache_stats(reset: bool = False) -> Dict[str, int]:
+    """
+    download_ics 로컬 캐시 카운터 (hits, misses, bytes_saved, bytes_downloaded)
+
+    Args:
+        reset: True면 반환 후 0으로 초기화 (핸들러가 호출 단위로 보고할 때 사용)
+    """
+    with _cache_lock:
+        stats = dict(_cache_stats)
+        if reset:
+            for name in _cache_stats:
+                _cache_stats[name] = 0
+    return stats
+
+
 def download_ics(bucket: str, key: str) -> Optional[str]:
     """
     S3에서 ICS 파일 다운로드
+    S3_CACHE_DIR에 (bucket/key, ETag)로 캐시하고, 캐시가 있으면 IfNoneMatch 조건부 GET으로
+    변경되지 않은 객체는 전송 없이 로컬 파일을 반환한다.
 
     Args:
         bucket: S3 버킷 이름
@@ -59,49 +261,501 @@ def download_ics(bucket: str, key: str) -> Optional[str]:
     Returns:
         ICS 파일 내용 (실패시 None)
     """
+    cached_etag, cached_body = _read_cache(bucket, key)
     try:
-        response = s3_client.get_object(Bucket=bucket, Key=key)
-        content = response['Body'].read().decode('utf-8')
-        logger.info(f"S3 다운로드 성공: s3://{bucket}/{key} ({len(content)} bytes)")
-        return content
-    except ClientError as e:
-        if e.response['Error']['Code'] == 'NoSuchKey':
-            logger.warning(f"S3 파일 없음: s3://{bucket}/{key}")
-            return None
-        else:
-            logger.error(f"S3 다운로드 실패: {e}")
-            raise
+        stored = get_storage().get(bucket, key, if_none_match=cached_etag)
+    except StorageError as e:
+        logger.error(f"S3 다운로드 실패: {e}")
+        raise
 
+    if stored is None:
+        logger.warning(f"S3 파일 없음: s3://{bucket}/{key}")
+        return None
+    if stored.not_modified:
+        _count_cache(True, len(cached_body))
+        logger.info(f"S3 캐시 사용 (변경 없음): s3://{bucket}/{key} ({len(cached_body)} bytes)")
+        return cached_body.decode('utf-8')
 
-def list_ics_files(bucket: str, prefix: str) -> list:
+    _write_cache(bucket, key, stored.info.etag, stored.body)
+    _count_cache(False, len(stored.body))
+    logger.info(f"S3 다운로드 성공: s3://{bucket}/{key} ({len(stored.body)} bytes)")
+    return stored.body.decode('utf-8')
+
+
+def load_first_seen(bucket: str, key: str) -> Dict[str, datetime]:
     """
-    S3 버킷에서 ICS 파일 목록 조회
+    이전에 업로드한 ICS 파일에서 UID -> DTSTAMP(최초 발견 시각) 매핑 로드
+    결정적 출력(ics_builder.stabilize_events)을 위한 상태로 사용하며, 실패해도 빈 매핑을 반환한다.
 
     Args:
         bucket: S3 버킷 이름
-        prefix: 검색할 접두사
+        key: S3 객체 키
+
+    Returns:
+        UID -> DTSTAMP 딕셔너리
+    """
+    try:
+        return read_first_seen(download_ics(bucket, key))
+    except Exception as e:
+        logger.warning(f"이전 ICS 로드 실패, 새 DTSTAMP 사용: s3://{bucket}/{key} ({e})")
+        return {}
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """
+    Content-Encoding에 맞게 본문 압축 (같은 입력이면 같은 바이트)
+
+    Args:
+        body: 원본 바이트
+        encoding: 'gzip' 또는 'br' (br은 brotli 패키지 필요)
+
+    Returns:
+        압축된 바이트
+
+    Raises:
+        ValueError: 지원하지 않는 인코딩이거나 brotli 패키지가 없는 경우
+    """
+    return b''.join(iter_compressed((body,), encoding))
+
+
+def iter_compressed(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """
+    바이트 조각을 스트리밍 압축 (compress_body와 같은 바이트, 인코딩 검사는 호출 시점에 수행)
+
+    Args:
+        chunks: 원본 바이트 조각
+        encoding: 'gzip' 또는 'br'
+
+    Returns:
+        압축된 바이트 조각 이터레이터
+
+    Raises:
+        ValueError: 지원하지 않는 인코딩이거나 brotli 패키지가 없는 경우
+    """
+    if encoding == 'gzip':
+        # wbits=31: gzip 헤더 (mtime 0 고정)
+        compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+        process, finish = compressor.compress, compressor.flush
+    elif encoding == 'br':
+        try:
+            import brotli
+        except ImportError:
+            raise ValueError("brotli 패키지가 설치되어 있지 않습니다.")
+        compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=11)
+        process, finish = compressor.process, compressor.finish
+    else:
+        raise ValueError(f"지원하지 않는 인코딩: {encoding}")
+    return _compress_chunks(chunks, process, finish)
+
+
+def _compress_chunks(chunks: Iterable[bytes], process, finish) -> Iterator[bytes]:
+    for chunk in chunks:
+        compressed = process(chunk)
+        if compressed:
+            yield compressed
+    yield finish()
+
+
+def _iter_chunks(source: Union[Iterable[Union[str, bytes]], IO]) -> Iterator[bytes]:
+    """조각 이터러블 또는 파일 객체를 바이트 조각으로 (str은 UTF-8로 인코딩)"""
+    if hasattr(source, 'read'):
+        chunks = iter(lambda: source.read(STREAM_READ_SIZE), source.read(0))
+    else:
+        chunks = source
+    for chunk in chunks:
+        yield chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+
+
+def _digest_chunks(chunks: Iterable[bytes]) -> Tuple[int, str, str]:
+    """(크기, MD5, SHA-256) - 본문을 모으지 않고 계산"""
+    md5, sha256 = hashlib.md5(), hashlib.sha256()
+    size = 0
+    for chunk in chunks:
+        md5.update(chunk)
+        sha256.update(chunk)
+        size += len(chunk)
+    return size, md5.hexdigest(), sha256.hexdigest()
+
+
+def upload_ics_stream(
+    source: ChunkSource,
+    bucket: str,
+    key: str,
+    content_encoding: Optional[str] = None,
+    skip_unchanged: bool = False,
+) -> dict:
+    """
+    ICS 조각을 스트리밍으로 S3에 업로드 (전체 문서를 메모리에 만들지 않음)
+    S3_MULTIPART_THRESHOLD 이상이면 멀티파트로 올리므로 메모리 사용량은 파트 크기로 제한된다.
+
+    source가 호출 가능 객체면 두 번 열어서, 먼저 해시만 계산해 sha256 메타데이터를 붙이고
+    skip_unchanged면 기존 객체와 비교한 뒤 다시 열어 업로드한다.
+    한 번만 읽을 수 있는 이터러블/파일 객체는 skip_unchanged를 쓸 수 없다.
+
+    Args:
+        source: bytes/str 조각 이터러블, 파일 객체, 또는 이를 새로 만드는 호출 가능 객체
+        bucket: S3 버킷 이름
+        key: S3 객체 키
+        content_encoding: 이미 압축된 내용이면 Content-Encoding 값 (gzip, br)
+        skip_unchanged: True면 S3 객체와 내용이 같을 때 업로드 생략
 
     Returns:
-        파일 키 리스트
+        업로드 결과 딕셔너리 (upload_ics와 같은 형식)
+
+    Raises:
+        ValueError: 한 번만 읽을 수 있는 source에 skip_unchanged를 지정한 경우
     """
+    reopenable = callable(source)
+    metadata = None
+    if reopenable:
+        size, md5_hex, sha256_hex = _digest_chunks(_iter_chunks(source()))
+        metadata = {'sha256': sha256_hex}
+        if skip_unchanged:
+            etag = _find_unchanged(bucket, key, md5_hex, sha256_hex)
+            if etag:
+                logger.info(f"S3 업로드 생략 (변경 없음): s3://{bucket}/{key} ({size} bytes)")
+                return {
+                    'success': True,
+                    'uploaded': False,
+                    'bucket': bucket,
+                    'key': key,
+                    'size': size,
+                    'etag': etag
+                }
+    elif skip_unchanged:
+        raise ValueError("skip_unchanged에는 다시 열 수 있는 source(호출 가능 객체)가 필요합니다.")
+
+    chunks = _tee_to_cache(_iter_chunks(source() if reopenable else source), bucket, key)
     try:
-        response = s3_client.list_objects_v2(
-            Bucket=bucket,
-            Prefix=prefix
+        info = get_storage().put_stream(
+            bucket,
+            key,
+            chunks,
+            content_type='text/calendar',
+            content_encoding=content_encoding,
+            cache_control='max-age=3600',
+            metadata=metadata,
         )
+    except StorageError as e:
+        _discard_cache_temp(bucket, key)
+        logger.error(f"S3 업로드 실패: {e}")
+        return {
+            'success': False,
+            'error': str(e)
+        }
+    except BaseException:
+        _discard_cache_temp(bucket, key)
+        raise
+    _commit_cache(bucket, key, info.etag)
+    logger.info(f"S3 업로드 성공: s3://{bucket}/{key} ({info.size} bytes)")
+    return {
+        'success': True,
+        'uploaded': True,
+        'bucket': bucket,
+        'key': key,
+        'size': info.size,
+        'etag': info.etag
+    }
 
-        if 'Contents' not in response:
-            return []
 
-        files = [obj['Key'] for obj in response['Contents'] if obj['Key'].endswith('.ics')]
-        logger.info(f"S3 파일 목록 조회: {len(files)}개 파일")
-        return files
+def upload_compressed_variants(
+    ics_content: Union[str, bytes, Callable[[], Iterable[Union[str, bytes]]]],
+    bucket: str,
+    key: str,
+    encodings: Iterable[str] = S3_COMPRESSED_VARIANTS,
+    skip_unchanged: bool = False,
+) -> Dict[str, dict]:
+    """
+    원본 옆에 미리 압축한 변형(key.gz, key.br)을 Content-Encoding과 함께 업로드
+    압축은 배포 시점에 한 번만 수행하고, 요청마다 압축하지 않도록 한다.
+    압축 결과는 메모리에 모으지 않고 임시 파일에 한 번 써 둔 뒤 upload_ics_stream으로 스트리밍하므로
+    메모리는 출력 크기와 관계없이 파트 크기로 제한된다.
+
+    Args:
+        ics_content: ICS 파일 내용, 또는 내용 조각을 새로 만드는 호출 가능 객체
+        bucket: S3 버킷 이름
+        key: 원본 S3 객체 키
+        encodings: 만들 인코딩 목록 (기본값 S3_COMPRESSED_VARIANTS)
+        skip_unchanged: True면 내용이 같은 변형은 PUT 생략 (upload_ics 참고)
+
+    Returns:
+        인코딩 -> 업로드 결과 (key, size, original_size, reduction 포함)
+    """
+    if callable(ics_content):
+        def _open():
+            return _iter_chunks(ics_content())
+    else:
+        body = ics_content.encode('utf-8') if isinstance(ics_content, str) else ics_content
 
-    except ClientError as e:
+        def _open():
+            return iter((body,))
+
+    results = {}
+    for encoding in encodings:
+        original_size = 0
+
+        def _counted(chunks):
+            nonlocal original_size
+            for chunk in chunks:
+                original_size += len(chunk)
+                yield chunk
+
+        try:
+            compressed = iter_compressed(_counted(_open()), encoding)
+        except ValueError as e:
+            logger.warning(f"압축 변형 생략: s3://{bucket}/{key} ({encoding}: {e})")
+            results[encoding] = {'success': False, 'error': str(e)}
+            continue
+
+        with tempfile.TemporaryFile() as spool:
+            for chunk in compressed:
+                spool.write(chunk)
+            compressed_size = spool.tell()
+
+            def _rewound(spool=spool):
+                spool.seek(0)
+                return spool
+
+            result = upload_ics_stream(
+                _rewound, bucket, key + COMPRESSED_SUFFIXES[encoding],
+                content_encoding=encoding, skip_unchanged=skip_unchanged,
+            )
+        if result.get('success'):
+            result['original_size'] = original_size
+            result['reduction'] = round(1 - compressed_size / original_size, 4) if original_size else 0.0
+        results[encoding] = result
+    return results
+
+
+def upload_json(data: dict, bucket: str, key: str) -> dict:
+    """
+    JSON 상태 파일을 S3에 업로드
+
+    Args:
+        data: 저장할 딕셔너리
+        bucket: S3 버킷 이름
+        key: S3 객체 키
+
+    Returns:
+        업로드 결과 딕셔너리 (upload_ics와 같은 형식)
+    """
+    body = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    try:
+        info = get_storage().put(bucket, key, body, content_type='application/json')
+        logger.info(f"S3 업로드 성공: s3://{bucket}/{key} ({len(body)} bytes)")
+        return {
+            'success': True,
+            'bucket': bucket,
+            'key': key,
+            'size': len(body),
+            'etag': info.etag
+        }
+    except StorageError as e:
+        logger.error(f"S3 업로드 실패: {e}")
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+
+def download_json(bucket: str, key: str) -> Optional[dict]:
+    """
+    S3에서 JSON 상태 파일 다운로드
+
+    Args:
+        bucket: S3 버킷 이름
+        key: S3 객체 키
+
+    Returns:
+        파싱된 딕셔너리 (파일이 없으면 None)
+    """
+    try:
+        stored = get_storage().get(bucket, key)
+    except StorageError as e:
+        logger.error(f"S3 다운로드 실패: {e}")
+        raise
+    if stored is None:
+        logger.warning(f"S3 파일 없음: s3://{bucket}/{key}")
+        return None
+    return json.loads(stored.body.decode('utf-8'))
+
+
+def download_file(bucket: str, key: str, path: str) -> Optional[str]:
+    """
+    S3 객체를 로컬 파일로 동기화 (상태 파일용)
+    path.etag에 기록한 ETag로 조건부 GET을 보내므로 warm 컨테이너에서 바뀌지 않은 객체는 전송 없이 재사용한다.
+    로컬 파일을 수정하기 전에는 invalidate_file을 호출해야 한다.
+
+    Args:
+        bucket: S3 버킷 이름
+        key: S3 객체 키
+        path: 로컬 파일 경로
+
+    Returns:
+        현재 ETag (객체가 없으면 None, 이때 로컬 파일도 삭제)
+    """
+    etag_path = path + '.etag'
+    cached_etag = None
+    if os.path.exists(path):
+        try:
+            with open(etag_path, 'r', encoding='utf-8') as f:
+                cached_etag = f.read() or None
+        except OSError:
+            pass
+
+    try:
+        stored = get_storage().get(bucket, key, if_none_match=cached_etag)
+    except StorageError as e:
+        logger.error(f"S3 다운로드 실패: {e}")
+        raise
+
+    if stored is None:
+        for stale in (etag_path, path):
+            if os.path.exists(stale):
+                os.remove(stale)
+        logger.warning(f"S3 파일 없음: s3://{bucket}/{key}")
+        return None
+    if stored.not_modified:
+        size = os.path.getsize(path)
+        _count_cache(True, size)
+        logger.info(f"로컬 파일 사용 (변경 없음): s3://{bucket}/{key} -> {path} ({size} bytes)")
+        return cached_etag
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    invalidate_file(path)
+    temp = path + _cache_temp_suffix()
+    with open(temp, 'wb') as f:
+        if stored.info.content_encoding == 'gzip':
+            # upload_file(content_encoding='gzip')로 올린 객체는 풀어서 저장
+            decompressor = zlib.decompressobj(31)
+            for start in range(0, len(stored.body), STREAM_READ_SIZE):
+                f.write(decompressor.decompress(stored.body[start:start + STREAM_READ_SIZE]))
+            f.write(decompressor.flush())
+        else:
+            f.write(stored.body)
+    os.replace(temp, path)
+    _write_file_etag(path, stored.info.etag)
+    _count_cache(False, len(stored.body))
+    logger.info(f"S3 다운로드 성공: s3://{bucket}/{key} -> {path} ({len(stored.body)} bytes)")
+    return stored.info.etag
+
+
+def upload_file(
+    bucket: str,
+    key: str,
+    path: str,
+    content_type: str = 'application/octet-stream',
+    content_encoding: Optional[str] = None,
+) -> dict:
+    """
+    로컬 파일을 스트리밍으로 S3에 업로드하고 path.etag 갱신 (download_file과 짝)
+
+    Args:
+        bucket: S3 버킷 이름
+        key: S3 객체 키
+        path: 로컬 파일 경로
+        content_type: Content-Type
+        content_encoding: 'gzip'이면 압축해서 업로드 (download_file이 풀어서 저장)
+
+    Returns:
+        업로드 결과 딕셔너리 (upload_ics와 같은 형식)
+    """
+    try:
+        with open(path, 'rb') as f:
+            chunks = _iter_chunks(f)
+            if content_encoding:
+                chunks = iter_compressed(chunks, content_encoding)
+            info = get_storage().put_stream(
+                bucket, key, chunks, content_type=content_type, content_encoding=content_encoding
+            )
+    except (OSError, StorageError) as e:
+        logger.error(f"S3 업로드 실패: {e}")
+        return {
+            'success': False,
+            'error': str(e)
+        }
+    _write_file_etag(path, info.etag)
+    logger.info(f"S3 업로드 성공: {path} -> s3://{bucket}/{key} ({info.size} bytes)")
+    return {
+        'success': True,
+        'uploaded': True,
+        'bucket': bucket,
+        'key': key,
+        'size': info.size,
+        'etag': info.etag
+    }
+
+
+def invalidate_file(path: str) -> None:
+    """download_file로 받은 로컬 파일이 S3 객체와 달라짐을 표시 (다음 download_file이 다시 받음)"""
+    try:
+        os.remove(path + '.etag')
+    except FileNotFoundError:
+        pass
+
+
+def _write_file_etag(path: str, etag: Optional[str]) -> None:
+    if not etag:
+        return
+    temp = path + '.etag' + _cache_temp_suffix()
+    with open(temp, 'w', encoding='utf-8') as f:
+        f.write(etag)
+    os.replace(temp, path + '.etag')
+
+
+def list_ics_files(bucket: str, prefix: str) -> list:
+    """
+    S3 버킷에서 ICS 파일 목록 조회 (1000개 이상이면 페이지를 이어서 조회)
+
+    Args:
+        bucket: S3 버킷 이름
+        prefix: 검색할 접두사
+
+    Returns:
+        파일 키 리스트 (실패시 빈 리스트)
+    """
+    try:
+        return list(list_ics_etags(bucket, prefix))
+    except StorageError as e:
         logger.error(f"S3 목록 조회 실패: {e}")
         return []
 
 
+def list_ics_etags(bucket: str, prefix: str) -> Dict[str, str]:
+    """
+    S3 버킷의 ICS 파일 키 -> ETag (목록 요청만 사용, 본문은 읽지 않음)
+    실패를 빈 목록으로 바꾸지 않는다: 호출자가 빈 목록을 "모든 파일 삭제"로 해석하지 않도록 예외를 그대로 올린다.
+
+    Args:
+        bucket: S3 버킷 이름
+        prefix: 검색할 접두사
+
+    Returns:
+        파일 키 -> ETag 딕셔너리 (키 순서)
+
+    Raises:
+        StorageError: 목록 조회 실패
+    """
+    files = {info.key: info.etag for info in get_storage().list(bucket, prefix) if info.key.endswith('.ics')}
+    logger.info(f"S3 파일 목록 조회: {len(files)}개 파일")
+    return files
+
+
+def object_exists(bucket: str, key: str) -> bool:
+    """
+    S3 객체 존재 여부 (HEAD 요청 한 번, 실패하면 False)
+
+    Args:
+        bucket: S3 버킷 이름
+        key: S3 객체 키
+    """
+    try:
+        return get_storage().head(bucket, key) is not None
+    except StorageError as e:
+        logger.warning(f"S3 HEAD 실패: s3://{bucket}/{key} ({e})")
+        return False
+
+
 def delete_ics(bucket: str, key: str) -> bool:
     """
     S3에서 ICS 파일 삭제
@@ -114,9 +768,9 @@ def delete_ics(bucket: str, key: str) -> bool:
         성공 여부
     """
     try:
-        s3_client.delete_object(Bucket=bucket, Key=key)
+        get_storage().delete(bucket, key)
         logger.info(f"S3 삭제 성공: s3://{bucket}/{key}")
         return True
-    except ClientError as e:
+    except StorageError as e:
         logger.error(f"S3 삭제 실패: {e}")
         return False
@@ -0,0 +1,86 @@
+"""
+병합 소스 manifest 모듈
+raw 파일 키별로 마지막으로 병합에 반영한 ETag와 그 소스가 기여한 UID를 기록하여,
+다음 병합에서 ETag가 바뀐 소스만 다시 읽고 파싱하도록 합니다.
+병합 결과에서 가장 이른 종료일(expires)도 기록하여, 소스가 그대로여도 보존 기간이 지난 이벤트가 생기면 병합합니다.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class SourceChanges:
+    """현재 raw 목록과 manifest 비교 결과 (목록 순서)"""
+    changed: List[str] = field(default_factory=list)    # 새로 생겼거나 ETag가 바뀐 소스
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)    # manifest에는 있지만 목록에 없는 소스
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            'changed': len(self.changed),
+            'unchanged': len(self.unchanged),
+            'removed': len(self.removed),
+        }
+
+
+class SourceManifest:
+    """
+    raw 파일 키 -> {etag, uids}
+
+    병합 결과(merged_all.ics)와 identity index가 저장된 뒤에만 갱신해야 한다.
+    ETag가 같은 소스는 이미 merged_all.ics에 반영되어 있으므로 다시 읽지 않는다.
+    """
+
+    def __init__(self, sources: Optional[Dict[str, dict]] = None, expires: Optional[str] = None):
+        self.sources: Dict[str, dict] = sources or {}
+        self.expires = expires  # 병합 결과에서 가장 이른 종료일 (YYYY-MM-DD)
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> 'SourceManifest':
+        if not data or data.get('version') != MANIFEST_VERSION:
+            return cls()
+        return cls(dict(data.get('sources', {})), data.get('expires'))
+
+    def to_dict(self) -> dict:
+        return {'version': MANIFEST_VERSION, 'sources': self.sources, 'expires': self.expires}
+
+    def expired_before(self, cutoff: Optional[date]) -> bool:
+        """보존 기간 기준일보다 먼저 끝난 이벤트가 병합 결과에 남아 있는지"""
+        return cutoff is not None and self.expires is not None and self.expires < cutoff.isoformat()
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def diff(self, etags: Dict[str, str]) -> SourceChanges:
+        """
+        현재 raw 목록의 ETag와 비교
+
+        Args:
+            etags: raw 파일 키 -> 현재 ETag (목록 순서)
+
+        Returns:
+            SourceChanges
+        """
+        changes = SourceChanges()
+        for key, etag in etags.items():
+            entry = self.sources.get(key)
+            if entry is not None and entry.get('etag') == etag:
+                changes.unchanged.append(key)
+            else:
+                changes.changed.append(key)
+        changes.removed = [key for key in self.sources if key not in etags]
+        return changes
+
+    def record(self, key: str, etag: str, uids: Iterable[str]) -> None:
+        """소스를 병합에 반영한 결과 기록 (UID는 정렬해서 저장)"""
+        self.sources[key] = {'etag': etag, 'uids': sorted(uids)}
+
+    def forget(self, key: str) -> None:
+        self.sources.pop(key, None)
+
+    def uids(self, key: str) -> List[str]:
+        return list(self.sources.get(key, {}).get('uids', []))
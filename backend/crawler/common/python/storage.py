@@ -0,0 +1,583 @@
+"""
+저장소 백엔드 모듈
+s3_utils의 업로드/다운로드가 사용하는 객체 저장소 인터페이스(get/put/head/list/delete, ETag)와
+S3, 로컬 디렉터리, 메모리 구현을 제공합니다.
+STORAGE_BACKEND 환경 변수로 구현을 선택하므로 AWS 없이도 크롤러 -> raw -> 병합 -> merged 전체 흐름을
+실행하거나 S3 지연과 분리해 처리량을 측정할 수 있습니다.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterable, List, Optional
+
+from .config import (
+    S3_CONNECT_TIMEOUT,
+    S3_MAX_ATTEMPTS,
+    S3_MAX_POOL_CONNECTIONS,
+    S3_MULTIPART_PART_SIZE,
+    S3_MULTIPART_THRESHOLD,
+    S3_READ_TIMEOUT,
+    STORAGE_BACKEND,
+    STORAGE_LOCAL_DIR,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class StorageError(Exception):
+    """저장소 요청 실패 (없는 객체는 예외가 아니라 None으로 표현)"""
+
+
+@dataclass(frozen=True)
+class ObjectInfo:
+    """저장된 객체의 메타데이터 (etag는 S3처럼 따옴표로 감싼 값)"""
+    key: str
+    etag: str
+    size: int
+    content_type: Optional[str] = None
+    content_encoding: Optional[str] = None
+    metadata: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    """get 결과 (if_none_match가 현재 ETag와 같으면 body는 None)"""
+    info: ObjectInfo
+    body: Optional[bytes]
+
+    @property
+    def not_modified(self) -> bool:
+        return self.body is None
+
+
+def compute_etag(body: bytes) -> str:
+    """단일 PUT 객체의 S3 ETag와 같은 값 (본문 MD5)"""
+    return f'"{hashlib.md5(body).hexdigest()}"'
+
+
+class StorageBackend(ABC):
+    """
+    객체 저장소 인터페이스
+
+    head/get/put/list/delete는 구현이 모두 재정의해야 한다 (빠뜨리면 인스턴스를 만들 때 TypeError).
+    remote가 True인 구현만 s3_utils의 /tmp 다운로드 캐시를 사용한다
+    (로컬/메모리 구현은 캐시가 원본보다 느리거나 같다).
+    """
+    name = 'base'
+    remote = False
+
+    @abstractmethod
+    def head(self, bucket: str, key: str) -> Optional[ObjectInfo]:
+        """객체 메타데이터 (없으면 None)"""
+
+    @abstractmethod
+    def get(self, bucket: str, key: str, if_none_match: Optional[str] = None) -> Optional[StoredObject]:
+        """
+        객체 읽기
+
+        Args:
+            bucket: 버킷 이름
+            key: 객체 키
+            if_none_match: 이 ETag와 같으면 본문 없이 반환 (조건부 GET)
+
+        Returns:
+            StoredObject (없으면 None)
+        """
+
+    @abstractmethod
+    def put(
+        self,
+        bucket: str,
+        key: str,
+        body: bytes,
+        content_type: Optional[str] = None,
+        content_encoding: Optional[str] = None,
+        cache_control: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> ObjectInfo:
+        """객체 쓰기 (같은 키는 덮어씀)"""
+
+    def put_stream(
+        self,
+        bucket: str,
+        key: str,
+        chunks: Iterable[bytes],
+        content_type: Optional[str] = None,
+        content_encoding: Optional[str] = None,
+        cache_control: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> ObjectInfo:
+        """
+        바이트 조각 이터러블을 객체로 쓰기 (전체 본문을 한 번에 만들지 않는 구현은 재정의)
+
+        Args:
+            chunks: 본문 바이트 조각 (한 번만 순회)
+            나머지는 put과 같음
+        """
+        return self.put(bucket, key, b''.join(chunks), content_type, content_encoding, cache_control, metadata)
+
+    @abstractmethod
+    def list(self, bucket: str, prefix: str = '') -> List[ObjectInfo]:
+        """접두사로 시작하는 객체 목록 (키 오름차순)"""
+
+    @abstractmethod
+    def delete(self, bucket: str, key: str) -> None:
+        """객체 삭제 (없는 객체면 아무것도 하지 않음)"""
+
+
+class MemoryStorage(StorageBackend):
+    """프로세스 메모리 저장소 (테스트, 벤치마크, 한 프로세스 안의 end-to-end 실행용)"""
+    name = 'memory'
+
+    def __init__(self):
+        self._objects: Dict[tuple, StoredObject] = {}
+        self._lock = threading.Lock()
+
+    def head(self, bucket: str, key: str) -> Optional[ObjectInfo]:
+        stored = self._objects.get((bucket, key))
+        return stored.info if stored else None
+
+    def get(self, bucket: str, key: str, if_none_match: Optional[str] = None) -> Optional[StoredObject]:
+        stored = self._objects.get((bucket, key))
+        if stored is None:
+            return None
+        if if_none_match and if_none_match == stored.info.etag:
+            return StoredObject(stored.info, None)
+        return stored
+
+    def put(self, bucket, key, body, content_type=None, content_encoding=None, cache_control=None, metadata=None):
+        info = ObjectInfo(key, compute_etag(body), len(body), content_type, content_encoding, dict(metadata or {}))
+        with self._lock:
+            self._objects[(bucket, key)] = StoredObject(info, bytes(body))
+        return info
+
+    def list(self, bucket: str, prefix: str = '') -> List[ObjectInfo]:
+        with self._lock:
+            items = [stored.info for (b, key), stored in self._objects.items() if b == bucket and key.startswith(prefix)]
+        return sorted(items, key=lambda info: info.key)
+
+    def delete(self, bucket: str, key: str) -> None:
+        with self._lock:
+            self._objects.pop((bucket, key), None)
+
+
+class LocalStorage(StorageBackend):
+    """
+    로컬 디렉터리 저장소
+
+    객체는 <root>/<bucket>/<key>에 그대로 저장하고 (직접 넣은 ICS 파일도 읽을 수 있음),
+    ETag와 Content-Type 등은 <root>/.meta/<bucket>/<key>.json에 둔다.
+    메타데이터 파일이 없거나 본문과 맞지 않으면 ETag를 본문에서 다시 계산한다.
+    """
+    name = 'local'
+    META_DIR = '.meta'
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def _path(self, bucket: str, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, bucket, key))
+        if not path.startswith(os.path.join(self.root, bucket) + os.sep):
+            raise StorageError(f"저장소 밖을 가리키는 키: {bucket}/{key}")
+        return path
+
+    def _meta_path(self, bucket: str, key: str) -> str:
+        return os.path.join(self.root, self.META_DIR, bucket, key + '.json')
+
+    def _read_info(self, bucket: str, key: str, body: Optional[bytes] = None) -> Optional[ObjectInfo]:
+        path = self._path(bucket, key)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return None
+        try:
+            with open(self._meta_path(bucket, key), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('size') == size and meta.get('mtime_ns') == os.stat(path).st_mtime_ns:
+                return ObjectInfo(
+                    key, meta['etag'], size,
+                    meta.get('content_type'), meta.get('content_encoding'), meta.get('metadata', {}),
+                )
+        except (OSError, ValueError, KeyError):
+            pass
+        # 메타데이터가 없거나 파일이 직접 바뀐 경우
+        if body is None:
+            body = self._read_body(path)
+        return ObjectInfo(key, compute_etag(body), size)
+
+    @staticmethod
+    def _read_body(path: str) -> bytes:
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError as e:
+            raise StorageError(str(e)) from e
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp, 'wb') as f:
+            f.write(data)
+        os.replace(temp, path)
+
+    def head(self, bucket: str, key: str) -> Optional[ObjectInfo]:
+        return self._read_info(bucket, key)
+
+    def get(self, bucket: str, key: str, if_none_match: Optional[str] = None) -> Optional[StoredObject]:
+        path = self._path(bucket, key)
+        if not os.path.isfile(path):
+            return None
+        info = self._read_info(bucket, key)
+        if info is None:
+            return None
+        if if_none_match and if_none_match == info.etag:
+            return StoredObject(info, None)
+        return StoredObject(info, self._read_body(path))
+
+    def put(self, bucket, key, body, content_type=None, content_encoding=None, cache_control=None, metadata=None):
+        path = self._path(bucket, key)
+        info = ObjectInfo(key, compute_etag(body), len(body), content_type, content_encoding, dict(metadata or {}))
+        try:
+            self._write_atomic(path, body)
+        except OSError as e:
+            raise StorageError(str(e)) from e
+        self._write_meta(bucket, key, path, info)
+        return info
+
+    def _write_meta(self, bucket: str, key: str, path: str, info: ObjectInfo) -> None:
+        try:
+            meta = {
+                'etag': info.etag,
+                'size': info.size,
+                'mtime_ns': os.stat(path).st_mtime_ns,
+                'content_type': info.content_type,
+                'content_encoding': info.content_encoding,
+                'metadata': info.metadata,
+            }
+            self._write_atomic(self._meta_path(bucket, key), json.dumps(meta).encode('utf-8'))
+        except OSError as e:
+            raise StorageError(str(e)) from e
+
+    def put_stream(self, bucket, key, chunks, content_type=None, content_encoding=None, cache_control=None, metadata=None):
+        path = self._path(bucket, key)
+        temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        digest = hashlib.md5()
+        size = 0
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+            os.replace(temp, path)
+        except OSError as e:
+            raise StorageError(str(e)) from e
+        finally:
+            if os.path.exists(temp):
+                os.remove(temp)
+        info = ObjectInfo(key, f'"{digest.hexdigest()}"', size, content_type, content_encoding, dict(metadata or {}))
+        self._write_meta(bucket, key, path, info)
+        return info
+
+    def list(self, bucket: str, prefix: str = '') -> List[ObjectInfo]:
+        base = os.path.join(self.root, bucket)
+        items = []
+        for directory, _, filenames in os.walk(base):
+            for filename in filenames:
+                if filename.endswith('.tmp'):
+                    continue
+                key = os.path.relpath(os.path.join(directory, filename), base).replace(os.sep, '/')
+                if key.startswith(prefix):
+                    info = self._read_info(bucket, key)
+                    if info is not None:
+                        items.append(info)
+        return sorted(items, key=lambda info: info.key)
+
+    def delete(self, bucket: str, key: str) -> None:
+        for path in (self._path(bucket, key), self._meta_path(bucket, key)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                raise StorageError(str(e)) from e
+
+
+class S3Storage(StorageBackend):
+    """boto3 S3 저장소 (클라이언트는 get_s3_client로 공유)"""
+    name = 's3'
+    remote = True
+
+    def _call(self, operation: str, **kwargs):
+        from botocore.exceptions import ClientError
+        try:
+            return getattr(get_s3_client(), operation)(**kwargs)
+        except ClientError as e:
+            raise StorageError(str(e)) from e
+
+    @staticmethod
+    def _error_code(error: StorageError) -> str:
+        cause = error.__cause__
+        return getattr(cause, 'response', {}).get('Error', {}).get('Code', '')
+
+    @staticmethod
+    def _info(key: str, response: dict) -> ObjectInfo:
+        return ObjectInfo(
+            key,
+            response.get('ETag', ''),
+            response.get('ContentLength', 0),
+            response.get('ContentType'),
+            response.get('ContentEncoding'),
+            response.get('Metadata', {}),
+        )
+
+    def head(self, bucket: str, key: str) -> Optional[ObjectInfo]:
+        try:
+            return self._info(key, self._call('head_object', Bucket=bucket, Key=key))
+        except StorageError as e:
+            if self._error_code(e) in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise
+
+    def get(self, bucket: str, key: str, if_none_match: Optional[str] = None) -> Optional[StoredObject]:
+        request = {'Bucket': bucket, 'Key': key}
+        if if_none_match:
+            request['IfNoneMatch'] = if_none_match
+        try:
+            response = self._call('get_object', **request)
+        except StorageError as e:
+            code = self._error_code(e)
+            if code == 'NoSuchKey':
+                return None
+            if if_none_match and code in ('304', 'NotModified'):
+                return StoredObject(ObjectInfo(key, if_none_match, 0), None)
+            raise
+        body = response['Body'].read()
+        return StoredObject(replace(self._info(key, response), size=len(body)), body)
+
+    def put(self, bucket, key, body, content_type=None, content_encoding=None, cache_control=None, metadata=None):
+        request = {'Bucket': bucket, 'Key': key, 'Body': body}
+        for name, value in (
+            ('ContentType', content_type),
+            ('ContentEncoding', content_encoding),
+            ('CacheControl', cache_control),
+            ('Metadata', metadata),
+        ):
+            if value:
+                request[name] = value
+        response = self._call('put_object', **request)
+        return ObjectInfo(key, response.get('ETag', ''), len(body), content_type, content_encoding, dict(metadata or {}))
+
+    def put_stream(self, bucket, key, chunks, content_type=None, content_encoding=None, cache_control=None, metadata=None):
+        """
+        S3_MULTIPART_THRESHOLD 미만이면 put_object 한 번, 이상이면 S3_MULTIPART_PART_SIZE 단위 멀티파트 업로드
+        메모리에는 최대 파트 하나(+ 마지막 조각)만 둔다. 실패하면 멀티파트 업로드를 중단(abort)한다.
+        """
+        iterator = iter(chunks)
+        buffer = bytearray()
+        for chunk in iterator:
+            buffer += chunk
+            if len(buffer) >= S3_MULTIPART_THRESHOLD:
+                break
+        else:
+            return self.put(bucket, key, bytes(buffer), content_type, content_encoding, cache_control, metadata)
+
+        request = {'Bucket': bucket, 'Key': key}
+        for name, value in (
+            ('ContentType', content_type),
+            ('ContentEncoding', content_encoding),
+            ('CacheControl', cache_control),
+            ('Metadata', metadata),
+        ):
+            if value:
+                request[name] = value
+        upload_id = self._call('create_multipart_upload', **request)['UploadId']
+        parts = []
+        size = 0
+
+        def _upload_part(data: bytes) -> None:
+            number = len(parts) + 1
+            response = self._call(
+                'upload_part', Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=number, Body=data,
+            )
+            parts.append({'PartNumber': number, 'ETag': response['ETag']})
+
+        try:
+            while True:
+                while len(buffer) >= S3_MULTIPART_PART_SIZE:
+                    _upload_part(bytes(buffer[:S3_MULTIPART_PART_SIZE]))
+                    size += S3_MULTIPART_PART_SIZE
+                    del buffer[:S3_MULTIPART_PART_SIZE]
+                chunk = next(iterator, None)
+                if chunk is None:
+                    break
+                buffer += chunk
+            if buffer:
+                _upload_part(bytes(buffer))
+                size += len(buffer)
+            response = self._call(
+                'complete_multipart_upload',
+                Bucket=bucket, Key=key, UploadId=upload_id, MultipartUpload={'Parts': parts},
+            )
+        except BaseException:
+            try:
+                self._call('abort_multipart_upload', Bucket=bucket, Key=key, UploadId=upload_id)
+            except StorageError as e:
+                logger.warning(f"멀티파트 업로드 중단 실패: s3://{bucket}/{key} ({e})")
+            raise
+        logger.info(f"멀티파트 업로드 완료: s3://{bucket}/{key} ({size} bytes, {len(parts)}개 파트)")
+        return ObjectInfo(key, response.get('ETag', ''), size, content_type, content_encoding, dict(metadata or {}))
+
+    def list(self, bucket: str, prefix: str = '') -> List[ObjectInfo]:
+        from botocore.exceptions import ClientError
+        items = []
+        try:
+            paginator = get_s3_client().get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+                items.extend(
+                    ObjectInfo(obj['Key'], obj.get('ETag', ''), obj.get('Size', 0))
+                    for obj in page.get('Contents', [])
+                )
+        except ClientError as e:
+            raise StorageError(str(e)) from e
+        return items
+
+    def delete(self, bucket: str, key: str) -> None:
+        self._call('delete_object', Bucket=bucket, Key=key)
+
+
+_storage: Optional[StorageBackend] = None
+_storage_lock = threading.Lock()
+
+
+def create_storage(name: str = STORAGE_BACKEND, local_dir: str = STORAGE_LOCAL_DIR) -> StorageBackend:
+    """
+    이름으로 저장소 구현 생성
+
+    Args:
+        name: 's3', 'local', 'memory'
+        local_dir: local 저장소의 루트 디렉터리
+
+    Raises:
+        ValueError: 알 수 없는 이름인 경우
+    """
+    name = (name or 's3').lower()
+    if name == 's3':
+        return S3Storage()
+    if name == 'local':
+        return LocalStorage(local_dir)
+    if name == 'memory':
+        return MemoryStorage()
+    raise ValueError(f"지원하지 않는 저장소: {name} (s3, local, memory)")
+
+
+def get_storage() -> StorageBackend:
+    """프로세스 단위로 공유하는 저장소 (처음 호출 시 STORAGE_BACKEND로 생성)"""
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = create_storage()
+                logger.info(f"저장소 백엔드: {_storage.name}")
+    return _storage
+
+
+def set_storage(storage: Optional[StorageBackend]) -> None:
+    """저장소 교체 (벤치마크, 로컬 실행용 / None이면 다음 호출 때 환경 변수로 다시 생성)"""
+    global _storage
+    with _storage_lock:
+        _storage = storage
+
+
+# ---------------------------------------------------------------------------
+# S3 클라이언트 (Lambda 컨테이너 안에서 재사용)
+# ---------------------------------------------------------------------------
+
+_client = None
+_client_lock = threading.Lock()
+_timings: Dict[str, float] = {}
+_timings_lock = threading.Lock()
+
+
+def get_s3_client():
+    """
+    프로세스 단위로 캐시된 S3 클라이언트 반환 (처음 호출 시 boto3 import + 생성)
+
+    연결 풀 크기, 재시도(standard 모드), TCP keep-alive, 타임아웃은 config 값을 사용한다.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _create_client()
+    return _client
+
+
+def _create_client():
+    started = time.perf_counter()
+    import boto3
+    from botocore.config import Config
+    imported = time.perf_counter()
+
+    client = boto3.client('s3', config=Config(
+        max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+        retries={'max_attempts': S3_MAX_ATTEMPTS, 'mode': 'standard'},
+        tcp_keepalive=True,
+        connect_timeout=S3_CONNECT_TIMEOUT,
+        read_timeout=S3_READ_TIMEOUT,
+    ))
+    created = time.perf_counter()
+
+    import_ms = round((imported - started) * 1000, 2)
+    create_ms = round((created - imported) * 1000, 2)
+    with _timings_lock:
+        _timings['boto3_import_ms'] = import_ms
+        _timings['client_create_ms'] = create_ms
+    client.meta.events.register('before-call.s3', _before_call)
+    client.meta.events.register('after-call.s3', _after_call)
+    logger.info(
+        f"S3 클라이언트 생성: import {import_ms}ms, "
+        f"생성 {create_ms}ms (pool {S3_MAX_POOL_CONNECTIONS})"
+    )
+    return client
+
+
+def _before_call(context=None, **kwargs):
+    if context is not None:
+        context['s3_utils_started'] = time.perf_counter()
+
+
+def _after_call(context=None, **kwargs):
+    started = (context or {}).get('s3_utils_started')
+    if started is None:
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    with _timings_lock:
+        _timings.setdefault('first_call_ms', round(elapsed_ms, 2))
+        _timings['calls'] = _timings.get('calls', 0) + 1
+        _timings['call_total_ms'] = round(_timings.get('call_total_ms', 0) + elapsed_ms, 2)
+
+
+def get_s3_timings(reset: bool = False) -> Dict[str, float]:
+    """
+    S3 클라이언트 타이밍 (boto3 import, 클라이언트 생성, 첫 호출, 누적 호출 수/시간)
+    마지막 초기화 이후의 값이므로, 핸들러가 시작할 때와 보고할 때 초기화하면 호출 단위 값이 된다.
+    import/생성 값은 클라이언트를 만든 호출에서만 나온다 (warm invocation에서는 없음).
+    S3가 아닌 저장소에서는 빈 딕셔너리다.
+
+    Args:
+        reset: True면 반환 후 비움 (get_download_cache_stats와 같은 방식)
+    """
+    with _timings_lock:
+        timings = dict(_timings)
+        if reset:
+            _timings.clear()
+    return timings
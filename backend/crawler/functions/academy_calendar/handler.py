@@ -18,10 +18,11 @@ sys.path.insert(0, '/opt/python')
 import requests
 from bs4 import BeautifulSoup
 
-from common.logger import setup_logger, log_crawler_start, log_crawler_complete, log_execution_metrics
-from common.date_utils import get_date_filter_range
-from common.ics_builder import create_event, split_long_duration_event, create_calendar_from_events, serialize_calendar
-from common.s3_utils import upload_ics
+from common.logger import setup_logger, log_crawler_start, log_crawler_complete, log_execution_metrics, StageTimer
+from common.date_utils import get_date_filter_range, ParseContext
+from common.ics_builder import create_event, split_long_duration_event, stabilize_events, write_calendar
+from common.s3_utils import load_first_seen, upload_ics, get_download_cache_stats
+from common.storage import get_s3_timings
 from common.config import ACADEMIC_CONFIG, S3_BUCKET
 
 logger = setup_logger(__name__)
@@ -42,7 +43,13 @@ def clean_date_text(date_text: str) -> str:
     return text.strip()
 
 
-def crawl_academic_calendar(year: int, month_filter: int, events: List) -> int:
+def crawl_academic_calendar(
+    year: int,
+    month_filter: int,
+    events: List,
+    context: ParseContext | None = None,
+    timer: StageTimer | None = None,
+) -> int:
     """
     특정 연도의 학사일정을 크롤링하여 이벤트 리스트에 추가
 
@@ -50,28 +57,54 @@ def crawl_academic_calendar(year: int, month_filter: int, events: List) -> int:
         year: 크롤링할 연도
         month_filter: 필터링 기준 월 (해당 월 이상/이하만 포함)
         events: 이벤트를 추가할 리스트
+        context: 날짜 파싱 기준
+        timer: 단계별 측정 (fetch, parse_html, extract_dates)
 
     Returns:
         추가된 이벤트 수
     """
+    timer = timer or StageTimer(ACADEMIC_CONFIG.name)
     url = f'https://ssu.ac.kr/%ED%95%99%EC%82%AC/%ED%95%99%EC%82%AC%EC%9D%BC%EC%A0%95/?years={year}'
 
     logger.info(f"{year}년 학사일정 크롤링 시작 (필터: {month_filter}월)")
 
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
+        with timer.stage('fetch') as stage:
+            response = requests.get(url, timeout=30)
+            response.raise_for_status()
+            stage.count, stage.bytes = 1, len(response.content)
+        with timer.stage('parse_html') as stage:
+            soup = BeautifulSoup(response.text, 'html.parser')
+            rows = soup.find_all('div', class_='row')
+            stage.count = len(rows)
     except Exception as e:
         logger.error(f"{year}년 학사일정 크롤링 실패: {e}")
         return 0
 
-    rows = soup.find_all('div', class_='row')
     seen = set()
     initial_count = len(events)
 
+    with timer.stage('extract_dates') as stage:
+        _extract_rows(rows, year, month_filter, events, seen, context)
+        stage.count = len(events) - initial_count
+
+    added_count = len(events) - initial_count
+    logger.info(f"{year}년 학사일정 크롤링 완료: {added_count}개 이벤트 추가")
+
+    return added_count
+
+
+def _extract_rows(
+    rows: List,
+    year: int,
+    month_filter: int,
+    events: List,
+    seen: set,
+    context: ParseContext | None,
+) -> None:
+    """학사일정 행에서 날짜/제목을 추출해 이벤트 추가 (crawl_academic_calendar의 extract_dates 단계)"""
     # 날짜 필터링 범위
-    filter_start, filter_end = get_date_filter_range()
+    filter_start, filter_end = get_date_filter_range(context)
 
     for row in rows:
         date_div = row.find('div', class_='col-12 col-lg-4 col-xl-3 font-weight-normal text-primary')
@@ -159,11 +192,6 @@ def crawl_academic_calendar(year: int, month_filter: int, events: List) -> int:
             )
             events.extend(split_events)
 
-    added_count = len(events) - initial_count
-    logger.info(f"{year}년 학사일정 크롤링 완료: {added_count}개 이벤트 추가")
-
-    return added_count
-
 
 def lambda_handler(event, context):
     """
@@ -177,6 +205,10 @@ def lambda_handler(event, context):
         실행 결과 딕셔너리
     """
     start_time = time.time()
+    timer = StageTimer(ACADEMIC_CONFIG.name)
+    # warm 컨테이너에서 이전 호출의 S3/캐시 카운터가 이번 결과에 섞이지 않도록 초기화
+    get_s3_timings(reset=True)
+    get_download_cache_stats(reset=True)
 
     log_crawler_start(logger, ACADEMIC_CONFIG.name, ACADEMIC_CONFIG.url)
 
@@ -184,26 +216,35 @@ def lambda_handler(event, context):
         # 이벤트 리스트
         events = []
 
+        # 실행 1회 동안 공유하는 날짜 기준
+        parse_context = ParseContext.now()
+
         # 현재 연도와 다음 연도 크롤링
-        current_year = datetime.now().year
+        current_year = parse_context.reference.year
         next_year = current_year + 1
-        current_month = datetime.now().month
+        current_month = parse_context.reference.month
 
         # 현재 연도 (현재 월 이상)
-        crawl_academic_calendar(current_year, current_month, events)
+        crawl_academic_calendar(current_year, current_month, events, parse_context, timer)
 
         # 다음 연도 (2월 이하)
-        crawl_academic_calendar(next_year, 2, events)
-
-        # Calendar 생성
-        calendar = create_calendar_from_events(events)
-        ics_content = serialize_calendar(calendar)
+        crawl_academic_calendar(next_year, 2, events, parse_context, timer)
 
-        # S3 업로드
         bucket = os.environ.get('S3_BUCKET', S3_BUCKET)
         s3_key = ACADEMIC_CONFIG.output_key
 
-        upload_result = upload_ics(ics_content, bucket, s3_key)
+        # ICS 생성 (이전 출력의 DTSTAMP 유지 + 정렬로 같은 입력이면 같은 바이트)
+        with timer.stage('load_state'):
+            first_seen = load_first_seen(bucket, s3_key)
+        with timer.stage('serialize') as stage:
+            ics_content = write_calendar(stabilize_events(events, first_seen))
+            stage.count, stage.bytes = len(events), len(ics_content.encode('utf-8'))
+
+        # S3 업로드
+        with timer.stage('upload') as stage:
+            upload_result = upload_ics(ics_content, bucket, s3_key, skip_unchanged=True)
+            if upload_result.get('uploaded'):
+                stage.count, stage.bytes = 1, upload_result.get('size') or 0
 
         if not upload_result.get('success'):
             raise Exception(f"S3 업로드 실패: {upload_result.get('error')}")
@@ -211,7 +252,7 @@ def lambda_handler(event, context):
         duration = time.time() - start_time
 
         log_crawler_complete(logger, ACADEMIC_CONFIG.name, len(events), duration)
-        log_execution_metrics(logger, ACADEMIC_CONFIG.name, duration, len(events), s3_key)
+        log_execution_metrics(logger, ACADEMIC_CONFIG.name, duration, len(events), s3_key, timer)
 
         return {
             'statusCode': 200,
@@ -221,20 +262,26 @@ def lambda_handler(event, context):
                 'duration_seconds': round(duration, 2),
                 's3_bucket': bucket,
                 's3_key': s3_key,
-                'file_size': upload_result.get('size')
+                'uploaded': upload_result.get('uploaded', False),
+                's3_timings': get_s3_timings(reset=True),
+                'download_cache': get_download_cache_stats(reset=True),
+                'file_size': upload_result.get('size'),
+                'stages': timer.summary()
             }
         }
 
     except Exception as e:
         duration = time.time() - start_time
         logger.error(f"크롤링 실패: {e}", exc_info=True)
+        timer.emit(status='error')
 
         return {
             'statusCode': 500,
             'body': {
                 'crawler': ACADEMIC_CONFIG.name,
                 'error': str(e),
-                'duration_seconds': round(duration, 2)
+                'duration_seconds': round(duration, 2),
+                'stages': timer.summary()
             }
         }
 
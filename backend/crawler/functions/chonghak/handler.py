@@ -19,10 +19,11 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 
-from common.logger import setup_logger, log_crawler_start, log_crawler_complete, log_execution_metrics
-from common.date_utils import get_date_filter_range, get_datetime_from_text
-from common.ics_builder import create_event, split_long_duration_event, create_calendar_from_events, serialize_calendar
-from common.s3_utils import upload_ics
+from common.logger import setup_logger, log_crawler_start, log_crawler_complete, log_execution_metrics, StageTimer
+from common.date_utils import get_datetime_from_text, find_datetimes, pick_datetime, ParseContext
+from common.ics_builder import create_event, split_long_duration_event, stabilize_events, write_calendar
+from common.s3_utils import load_first_seen, upload_ics, get_download_cache_stats
+from common.storage import get_s3_timings
 from common.config import CHONGHAK_CONFIG, S3_BUCKET
 
 logger = setup_logger(__name__)
@@ -143,12 +144,16 @@ def is_keyword_matched(title: str, keywords: List[str]) -> bool:
     return any(keyword in title for keyword in keywords)
 
 
-def extract_date_info(article: WebElement) -> datetime | tuple[datetime, datetime] | None:
+def extract_date_info(
+    article: WebElement,
+    context: ParseContext | None = None,
+) -> datetime | tuple[datetime, datetime] | None:
     """
     게시물에서 날짜 정보를 추출합니다.
 
     Args:
         article: WebElement 객체
+        context: 날짜 파싱 기준
 
     Returns:
         datetime 객체
@@ -163,57 +168,66 @@ def extract_date_info(article: WebElement) -> datetime | tuple[datetime, datetim
     # 태그가 없을 경우 article 전체 텍스트 확인
     if len(all_contents) == 0:
         article_text = article.text
-        return get_datetime_from_text(article_text)
+        return get_datetime_from_text(article_text, context)
 
-    # 각 요소에서 패턴 매칭
+    # 모든 요소의 텍스트를 모아 한 번에 패턴 매칭
+    texts = []
     for content in all_contents:
         content_text = content.text.strip()
         if not content_text or len(content_text) < 5:
             continue
+        texts.append(content_text)
 
-        result = get_datetime_from_text(content_text)
-        if result:
-            return result
+    return pick_datetime(find_datetimes(texts, context=context))
 
-    return None
 
-
-def crawl_page(driver: webdriver.Chrome, page_url: str) -> List[Dict]:
+def crawl_page(
+    driver: webdriver.Chrome,
+    page_url: str,
+    context: ParseContext | None = None,
+    timer: StageTimer | None = None,
+) -> List[Dict]:
     """
     단일 페이지를 크롤링하여 데이터를 추출합니다.
 
     Args:
         driver: Selenium WebDriver
         page_url: 크롤링할 페이지 URL
-        keywords: 필터링 키워드
+        context: 날짜 파싱 기준
+        timer: 단계별 측정 (fetch, parse_html, extract_dates)
 
     Returns:
         추출된 데이터 리스트
     """
+    timer = timer or StageTimer(CHONGHAK_CONFIG.name)
     try:
-        driver.get(page_url)
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "a[href^='/notice/']"))
-        )
+        with timer.stage('fetch') as stage:
+            driver.get(page_url)
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "a[href^='/notice/']"))
+            )
+            stage.count = 1
     except Exception as e:
         logger.error(f"페이지 로드 실패 ({page_url}): {e}")
         return []
 
     # 1단계: 키워드가 포함된 게시물 수집
-    items = driver.find_elements(By.CSS_SELECTOR, "a[href^='/notice/']")
-    articles_to_crawl = []
-
-    for item in items:
-        try:
-            title_element = item.find_element(By.TAG_NAME, "h1")
-            title = title_element.text
-
-            if title:
-                url = item.get_attribute('href')
-                articles_to_crawl.append({"title": title, "url": url})
-        except Exception as e:
-            logger.debug(f"게시물 제목 추출 실패: {e}")
-            continue
+    with timer.stage('parse_html') as stage:
+        items = driver.find_elements(By.CSS_SELECTOR, "a[href^='/notice/']")
+        articles_to_crawl = []
+
+        for item in items:
+            try:
+                title_element = item.find_element(By.TAG_NAME, "h1")
+                title = title_element.text
+
+                if title:
+                    url = item.get_attribute('href')
+                    articles_to_crawl.append({"title": title, "url": url})
+            except Exception as e:
+                logger.debug(f"게시물 제목 추출 실패: {e}")
+                continue
+        stage.count = len(articles_to_crawl)
 
     logger.info(f"  키워드 매칭 게시물: {len(articles_to_crawl)}개")
 
@@ -224,15 +238,19 @@ def crawl_page(driver: webdriver.Chrome, page_url: str) -> List[Dict]:
         url = article_info["url"]
 
         try:
-            driver.get(url)
-            wait = WebDriverWait(driver, 10)
-            wait.until(
-                EC.visibility_of_element_located((By.CSS_SELECTOR, "article > section > div > section"))
-            )
+            with timer.stage('fetch') as stage:
+                driver.get(url)
+                wait = WebDriverWait(driver, 10)
+                wait.until(
+                    EC.visibility_of_element_located((By.CSS_SELECTOR, "article > section > div > section"))
+                )
+                stage.count = 1
 
             article = driver.find_element(By.CSS_SELECTOR, "article > section")
 
-            date = extract_date_info(article)
+            with timer.stage('extract_dates') as stage:
+                date = extract_date_info(article, context)
+                stage.count = 1 if date else 0
 
             if date:
                 parsed_title = parse_title(title)
@@ -255,7 +273,7 @@ def create_events_from_data(data_list: List[Dict]) -> List:
         data_list: 크롤링 데이터 리스트
 
     Returns:
-        Event 객체 리스트
+        EventRecord 리스트
     """
     events = []
 
@@ -303,10 +321,15 @@ def lambda_handler(event, context):
         실행 결과 딕셔너리
     """
     start_time = time.time()
+    timer = StageTimer(CHONGHAK_CONFIG.name)
+    # warm 컨테이너에서 이전 호출의 S3/캐시 카운터가 이번 결과에 섞이지 않도록 초기화
+    get_s3_timings(reset=True)
+    get_download_cache_stats(reset=True)
 
     log_crawler_start(logger, CHONGHAK_CONFIG.name, CHONGHAK_CONFIG.url)
 
-
+    # 실행 1회 동안 공유하는 날짜 파싱 기준
+    parse_context = ParseContext.now()
 
     # 페이지 크롤링 (1페이지)
     all_data = []
@@ -317,24 +340,27 @@ def lambda_handler(event, context):
     driver = None
     try:
         # Selenium 드라이버 설정
-        driver = setup_driver(current_tmp_dir)
+        with timer.stage('driver'):
+            driver = setup_driver(current_tmp_dir)
         page_url = f"{base_url}&page={page_num}"
         logger.info(f"페이지 {page_num} 크롤링 중...")
 
-        page_data = crawl_page(driver, page_url)
+        page_data = crawl_page(driver, page_url, parse_context, timer)
         all_data.extend(page_data)
 
         logger.info(f"페이지 {page_num} 완료: {len(page_data)}개 항목")
     except Exception as e:
         duration = time.time() - start_time
         logger.error(f"크롤링 실패: {e}", exc_info=True)
+        timer.emit(status='error')
 
         return {
             'statusCode': 500,
             'body': {
                 'crawler': CHONGHAK_CONFIG.name,
                 'error': str(e),
-                'duration_seconds': round(duration, 2)
+                'duration_seconds': round(duration, 2),
+                'stages': timer.summary()
             }
         }
 
@@ -343,25 +369,34 @@ def lambda_handler(event, context):
             driver.quit()
 
     # 이벤트 생성
-    events = create_events_from_data(all_data)
-
-    # Calendar 생성
-    calendar = create_calendar_from_events(events)
-    ics_content = serialize_calendar(calendar)
+    with timer.stage('build_events') as stage:
+        events = create_events_from_data(all_data)
+        stage.count = len(events)
 
-    # S3 업로드
     bucket = os.environ.get('S3_BUCKET', S3_BUCKET)
     s3_key = CHONGHAK_CONFIG.output_key
 
-    upload_result = upload_ics(ics_content, bucket, s3_key)
+    # ICS 생성 (이전 출력의 DTSTAMP 유지 + 정렬로 같은 입력이면 같은 바이트)
+    with timer.stage('load_state'):
+        first_seen = load_first_seen(bucket, s3_key)
+    with timer.stage('serialize') as stage:
+        ics_content = write_calendar(stabilize_events(events, first_seen))
+        stage.count, stage.bytes = len(events), len(ics_content.encode('utf-8'))
+
+    # S3 업로드
+    with timer.stage('upload') as stage:
+        upload_result = upload_ics(ics_content, bucket, s3_key, skip_unchanged=True)
+        if upload_result.get('uploaded'):
+            stage.count, stage.bytes = 1, upload_result.get('size') or 0
 
     if not upload_result.get('success'):
+        timer.emit(status='error')
         raise Exception(f"S3 업로드 실패: {upload_result.get('error')}")
 
     duration = time.time() - start_time
 
     log_crawler_complete(logger, CHONGHAK_CONFIG.name, len(events), duration)
-    log_execution_metrics(logger, CHONGHAK_CONFIG.name, duration, len(events), s3_key)
+    log_execution_metrics(logger, CHONGHAK_CONFIG.name, duration, len(events), s3_key, timer)
 
     return {
         'statusCode': 200,
@@ -372,7 +407,11 @@ def lambda_handler(event, context):
             'duration_seconds': round(duration, 2),
             's3_bucket': bucket,
             's3_key': s3_key,
-            'file_size': upload_result.get('size')
+            'uploaded': upload_result.get('uploaded', False),
+            's3_timings': get_s3_timings(reset=True),
+            'download_cache': get_download_cache_stats(reset=True),
+            'file_size': upload_result.get('size'),
+            'stages': timer.summary()
         }
     }
 
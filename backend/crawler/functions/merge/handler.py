@@ -7,147 +7,383 @@ S3 raw/ 폴더의 ICS 파일들을 읽어서 카테고리별 조합으로 병합
 import sys
 import os
 import time
-from typing import Dict, Set
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import unquote_plus
+
+from dateutil.relativedelta import relativedelta
 
 # Lambda Layer에서 common 모듈 import
 # Layer 구조: /opt/python/common/
 sys.path.insert(0, '/opt/python')
 
-from ics import Calendar
-
-from common.logger import setup_logger, log_execution_metrics
-from common.ics_builder import filter_events_by_categories
-from common.s3_utils import download_ics, upload_ics, list_ics_files
-from common.config import MERGE_COMBINATIONS, S3_BUCKET, S3_RAW_PREFIX, S3_MERGED_PREFIX
+from common.logger import setup_logger, log_execution_metrics, StageTimer
+from common.calendar_compose import build_category_manifest, fragment_filename
+from common.category_index import CategoryIndex
+from common.date_utils import SEOUL_TZ
+from common.ics_builder import iter_calendar_fragments
+from common.event_store import EventStore, open_event_store, save_event_store
+from common.identity_index import IdentityIndex, MergeDiff, identity_key
+from common.source_manifest import SourceChanges, SourceManifest
+from common.ics_reader import RawEvent, read_raw_events
+from common.s3_utils import download_ics, download_json, upload_compressed_variants, upload_ics_stream, upload_json, list_ics_etags, list_ics_files, object_exists, get_download_cache_stats, delete_ics, COMPRESSED_SUFFIXES
+from common.storage import get_s3_timings
+from common.config import MERGE_COMBINATIONS, MERGE_CATEGORY_DIR, MERGE_CATEGORY_MANIFEST, MERGE_LEGACY_COMBINATIONS, MERGE_DOWNLOAD_WORKERS, MERGE_UPLOAD_WORKERS, MERGED_ALL_FILENAME, S3_BUCKET, S3_RAW_PREFIX, S3_MERGED_PREFIX, IDENTITY_INDEX_KEY, MERGE_MANIFEST_KEY, EVENT_STORE_KEY, MERGE_RETENTION_MONTHS
 
 logger = setup_logger(__name__)
 
+# 업로드 스트림 조각 크기 (업로드 스레드마다 이 크기의 버퍼 몇 개만 둔다)
+UPLOAD_BLOCK_SIZE = 64 * 1024
 
-def merge_all_ics_files(bucket: str, raw_prefix: str) -> Calendar:
+
+def merge_all_ics_files(
+    bucket: str,
+    raw_prefix: str,
+    keys: Optional[List[str]] = None,
+    timer: Optional[StageTimer] = None
+) -> Dict[str, List[RawEvent]]:
     """
-    S3 raw/ 폴더의 모든 ICS 파일을 병합하여 하나의 Calendar 반환
+    S3 raw/ 폴더의 ICS 파일을 소스(파일 키)별 이벤트로 로드
 
     Args:
         bucket: S3 버킷 이름
         raw_prefix: raw 파일 접두사 (예: 'raw/')
+        keys: 읽을 파일 키 (None이면 raw_prefix 아래 전체를 조회)
+        timer: 단계별 측정 (download는 스레드별 시간의 합, parse)
 
     Returns:
-        병합된 Calendar 객체
+        파일 키 -> RawEvent 리스트 (목록 순서, 다운로드/파싱에 실패한 파일은 제외)
     """
     logger.info("=" * 70)
     logger.info("S3 raw/ 폴더에서 ICS 파일 병합 시작")
     logger.info("=" * 70)
 
-    # raw/ 폴더의 모든 ICS 파일 조회
-    ics_files = list_ics_files(bucket, raw_prefix)
+    timer = timer or StageTimer('merge')
+
+    # raw/ 폴더의 ICS 파일 조회 (변경된 소스만 지정된 경우 그 파일만)
+    if keys is None:
+        with timer.stage('list'):
+            ics_files = list_ics_files(bucket, raw_prefix)
+    else:
+        ics_files = list(keys)
 
     if not ics_files:
         logger.warning(f"S3 {raw_prefix}에 ICS 파일이 없습니다.")
-        return Calendar()
+        return {}
 
-    merged_calendar = Calendar()
+    loaded = {}
     total_events = 0
 
-    for s3_key in ics_files:
-        logger.info(f"파일 다운로드 중: {s3_key}")
+    def _download(s3_key: str) -> Optional[str]:
+        with timer.stage('download') as stage:
+            content = download_ics(bucket, s3_key)
+            if content:
+                stage.count, stage.bytes = 1, len(content.encode('utf-8'))
+        return content
+
+    # 다운로드는 스레드 풀에서 동시에, 파싱은 도착하는 순서대로 처리
+    workers = max(1, min(MERGE_DOWNLOAD_WORKERS, len(ics_files)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='download') as executor:
+        futures = {executor.submit(_download, s3_key): s3_key for s3_key in ics_files}
 
-        ics_content = download_ics(bucket, s3_key)
-        if not ics_content:
-            logger.warning(f"  ⚠️  파일 다운로드 실패: {s3_key}")
-            continue
+        for future in as_completed(futures):
+            s3_key = futures[future]
+            try:
+                ics_content = future.result()
+            except Exception as e:
+                logger.error(f"  ✗ {s3_key} 다운로드 실패: {e}")
+                continue
 
-        try:
-            cal = Calendar(ics_content)
-            event_count = len(cal.events)
+            if not ics_content:
+                logger.warning(f"  ⚠️  파일 다운로드 실패: {s3_key}")
+                continue
 
-            # 이벤트 추가
-            for event in cal.events:
-                merged_calendar.events.add(event)
+            try:
+                with timer.stage('parse') as stage:
+                    raw_events = read_raw_events(ics_content)
+                    stage.count = event_count = len(raw_events)
 
-            total_events += event_count
-            logger.info(f"  ✓ {s3_key}: {event_count}개 이벤트 로드")
+                # 이벤트 추가
+                loaded[s3_key] = raw_events
 
-        except Exception as e:
-            logger.error(f"  ✗ {s3_key} 파싱 실패: {e}")
-            continue
+                total_events += event_count
+                logger.info(f"  ✓ {s3_key}: {event_count}개 이벤트 로드")
+
+            except Exception as e:
+                logger.error(f"  ✗ {s3_key} 파싱 실패: {e}")
+                continue
+
+    # 완료 순서와 관계없이 목록 순서로 정렬 (identity index 반영 순서 고정)
+    events_by_source = {s3_key: loaded[s3_key] for s3_key in ics_files if s3_key in loaded}
 
     logger.info(f"\n총 {total_events}개 이벤트 병합 완료")
     logger.info("=" * 70)
 
-    return merged_calendar
+    return events_by_source
 
 
-def merge_with_existing(bucket: str, merged_prefix: str, new_calendar: Calendar) -> Calendar:
+def load_previous_events(bucket: str, merged_prefix: str, store: EventStore) -> Optional[List[RawEvent]]:
     """
-    기존 merged_all.ics와 새 Calendar를 UID 기반으로 병합
+    이전 병합 결과 로드 (이벤트 저장소, 저장소가 비어 있으면 merged_all.ics)
 
     Args:
         bucket: S3 버킷 이름
         merged_prefix: merged 파일 접두사 (예: 'merged/')
-        new_calendar: 새로 병합된 Calendar 객체
+        store: 이벤트 저장소
+
+    Returns:
+        이전 RawEvent 리스트 (둘 다 없으면 None)
+    """
+    if len(store):
+        existing_events = store.load_events()
+        logger.info(f"기존 이벤트 {len(existing_events)}개 로드: 이벤트 저장소 ({store.size_bytes():,} bytes)")
+        return existing_events
+    # 이벤트 저장소가 생기기 전의 상태는 merged_all.ics에서 한 번 가져온다
+    return load_existing_events(bucket, merged_prefix)
+
+
+def update_event_store(
+    store: EventStore,
+    merged_events: List[RawEvent],
+    diff: MergeDiff,
+    rebuild: bool
+) -> int:
+    """
+    병합 결과를 이벤트 저장소에 반영 (변경분만, rebuild면 전체 교체)
 
     Returns:
-        기존 이벤트와 병합된 Calendar 객체
+        기록 또는 삭제한 이벤트 수
     """
-    events_by_uid = {}
+    if rebuild:
+        return store.replace_all(merged_events)
+    changed = set(diff.added) | set(diff.updated)
+    written = store.upsert(event for event in merged_events if event.uid in changed)
+    return written + store.delete(diff.removed + diff.expired)
 
-    # 1. 기존 merged_all.ics 로드
-    existing_key = f"{merged_prefix}merged_all.ics"
+
+def load_existing_events(bucket: str, merged_prefix: str) -> Optional[List[RawEvent]]:
+    """
+    기존 merged_all.ics 로드
+
+    Args:
+        bucket: S3 버킷 이름
+        merged_prefix: merged 파일 접두사 (예: 'merged/')
+
+    Returns:
+        기존 RawEvent 리스트 (파일이 없거나 파싱에 실패하면 None)
+    """
+    existing_key = f"{merged_prefix}{MERGED_ALL_FILENAME}"
     existing_content = download_ics(bucket, existing_key)
 
-    if existing_content:
-        try:
-            existing_cal = Calendar(existing_content)
-            for event in existing_cal.events:
-                events_by_uid[event.uid] = event
-            logger.info(f"기존 이벤트 {len(existing_cal.events)}개 로드: {existing_key}")
-        except Exception as e:
-            logger.warning(f"기존 파일 파싱 실패, 새 이벤트만 사용: {e}")
-    else:
+    if not existing_content:
         logger.info(f"기존 파일 없음, 새 이벤트만 사용: {existing_key}")
+        return None
+    try:
+        existing_events = read_raw_events(existing_content)
+    except Exception as e:
+        logger.warning(f"기존 파일 파싱 실패, 새 이벤트만 사용: {e}")
+        return None
+    logger.info(f"기존 이벤트 {len(existing_events)}개 로드: {existing_key}")
+    return existing_events
 
-    # 2. 새 이벤트로 덮어쓰기
-    for event in new_calendar.events:
-        events_by_uid[event.uid] = event
 
-    # 3. 최종 Calendar 생성
-    merged_calendar = Calendar()
-    for event in events_by_uid.values():
-        merged_calendar.events.add(event)
+def retention_cutoff(months: int = MERGE_RETENTION_MONTHS, today: Optional[date] = None) -> Optional[date]:
+    """
+    보존 기간 기준일 (종료일이 이 날보다 앞선 이벤트를 병합 결과에서 제거)
+
+    Args:
+        months: 보존 개월 수 (0 이하면 보존 기간 없음)
+        today: 기준일 (기본값 서울 기준 오늘)
+
+    Returns:
+        기준일 (보존 기간이 없으면 None)
+    """
+    if months <= 0:
+        return None
+    today = today or datetime.now(SEOUL_TZ).date()
+    return today - relativedelta(months=months)
+
+
+def prune_expired(
+    merged_events: List[RawEvent],
+    diff: MergeDiff,
+    index: IdentityIndex,
+    store: Optional[EventStore],
+    cutoff: date,
+    events_by_source: Optional[Dict[str, List[RawEvent]]] = None
+) -> List[RawEvent]:
+    """
+    종료일이 cutoff보다 앞선 이벤트를 병합 결과와 identity index에서 제거하고 diff.expired에 기록
 
-    logger.info(f"병합 결과: 기존 + 신규 = {len(merged_calendar.events)}개 이벤트")
-    return merged_calendar
+    제거 대상은 병합 결과를 훑지 않고 정한다. 이전 병합 이벤트는 이벤트 저장소의 종료일 인덱스로 찾고
+    (O(log n + 제거 수)), 종료일을 직접 보는 것은 이번에 다시 읽은 소스의 이벤트뿐이다.
+    병합 결과 리스트는 제거할 이벤트가 있을 때만 한 번 거른다 (O(n), 보통은 하루에 한 번 이하).
+    store나 events_by_source가 없으면 (저장소를 새로 만드는 실행) 모든 이벤트의 종료일을 검사한다.
+
+    Args:
+        merged_events: index.apply 결과
+        diff: index.apply 결과 (expired, expired_bytes 갱신, 제거된 UID는 added/updated에서 뺌)
+        index: identity index
+        store: 이전 병합 결과를 담은 이벤트 저장소 (아직 이번 diff 반영 전)
+        cutoff: 보존 기간 기준일
+        events_by_source: index.apply에 넘긴 소스별 새 이벤트 (추가/수정된 이벤트의 종료일 확인용)
+
+    Returns:
+        보존 기간 안의 이벤트 리스트 (순서 유지, 제거할 이벤트가 없으면 merged_events 그대로)
+    """
+    if store is None or events_by_source is None:
+        dropped = {
+            event.uid for event in merged_events
+            if event.end_date is not None and event.end_date < cutoff
+        }
+    else:
+        # 수정된 이벤트는 저장소의 이전 종료일이 아니라 새 종료일로 판단
+        fresh = set(diff.added) | set(diff.updated)
+        dropped = set(store.uids_ending_before(cutoff)) - fresh
+        if fresh:
+            dropped |= _fresh_expired_uids(events_by_source, index, fresh, cutoff)
+    if not dropped:
+        return merged_events
+
+    added = set(diff.added)
+    kept = []
+    for event in merged_events:
+        if event.uid not in dropped:
+            kept.append(event)
+        # 이전 결과에 없던 이벤트 (크롤러가 다시 보낸 지난 이벤트)는 추가하지 않을 뿐 제거 통계에는 넣지 않는다
+        elif event.uid not in added:
+            diff.expired.append(event.uid)
+            diff.expired_bytes += len(event.to_bytes())
+
+    diff.added = [uid for uid in diff.added if uid not in dropped]
+    diff.updated = [uid for uid in diff.updated if uid not in dropped]
+    index.forget_uids(dropped)
+    logger.info(
+        f"보존 기간 정리: 종료일 {cutoff.isoformat()} 이전 이벤트 {len(diff.expired)}개 제거 "
+        f"({diff.expired_bytes:,} bytes), 새로 들어온 지난 이벤트 {len(dropped) - len(diff.expired)}개 제외"
+    )
+    return kept
+
+
+def _fresh_expired_uids(
+    events_by_source: Dict[str, List[RawEvent]],
+    index: IdentityIndex,
+    fresh: Set[str],
+    cutoff: date
+) -> Set[str]:
+    """이번에 추가/수정된 이벤트 중 종료일이 cutoff 이전인 UID (identity 키로 index.apply가 고정한 UID를 찾음)"""
+    expired = set()
+    for source, events in events_by_source.items():
+        seen = set()
+        for event in events:
+            key = identity_key(source, event.title, event.start_date)
+            if key in seen:
+                continue  # index.apply와 같이 같은 소스 안의 중복은 처음 것만 사용
+            seen.add(key)
+            end = event.end_date
+            if end is None or end >= cutoff:
+                continue
+            entry = index.entries.get(key)
+            if entry is not None and entry['uid'] in fresh:
+                expired.add(entry['uid'])
+    return expired
+
+
+def merge_with_existing(
+    existing_events: List[RawEvent],
+    events_by_source: Dict[str, List[RawEvent]],
+    index: IdentityIndex,
+    store: Optional[EventStore] = None,
+    cutoff: Optional[date] = None
+) -> Tuple[List[RawEvent], MergeDiff]:
+    """
+    이전 병합 이벤트와 새 이벤트를 identity index 기반으로 병합하고 보존 기간이 지난 이벤트 제거
+
+    Args:
+        existing_events: 이전 병합 이벤트 (load_previous_events 결과)
+        events_by_source: 소스별 새 RawEvent 리스트 (이번에 다시 읽은 소스만)
+        index: identity index (이번 결과로 갱신됨)
+        store: existing_events를 담은 이벤트 저장소 (종료일 인덱스로 정리 대상 조회, 없으면 전체 검사)
+        cutoff: 보존 기간 기준일 (retention_cutoff 결과, None이면 제거하지 않음)
+
+    Returns:
+        (기존 이벤트와 병합된 RawEvent 리스트, 추가/수정/삭제/만료 diff)
+    """
+    # identity index로 UID 고정 + 추가/수정/삭제 반영 (시작 시각, UID 순 정렬)
+    merged_events, diff = index.apply(events_by_source, existing_events)
+    if cutoff is not None:
+        merged_events = prune_expired(merged_events, diff, index, store, cutoff, events_by_source)
+
+    logger.info(f"병합 결과: 기존 + 신규 = {len(merged_events)}개 이벤트")
+    logger.info(
+        f"  변경: 추가 {len(diff.added)}, 수정 {len(diff.updated)}, "
+        f"삭제 {len(diff.removed)}, 만료 {len(diff.expired)}, 유지 {diff.unchanged}"
+    )
+    return merged_events, diff
+
+
+def publish_plan(merged_events: List[RawEvent]) -> Tuple[Dict[str, Set[str]], List[str]]:
+    """
+    올릴 파일 목록: 카테고리마다 조각 하나 + merged_all.ics (+ MERGE_LEGACY_COMBINATIONS면 기존 조합 파일)
+    카테고리가 늘어도 파일 수는 카테고리 수에 비례한다.
+
+    Returns:
+        (파일명 -> 카테고리 집합, 병합 결과의 카테고리 목록)
+
+    Raises:
+        ValueError: 대소문자만 다른 카테고리가 있어 조각 파일명이 겹치는 경우 (한쪽 조각이 다른 쪽을 덮어씀)
+    """
+    if MERGE_LEGACY_COMBINATIONS:
+        logger.warning(
+            "MERGE_LEGACY_COMBINATIONS: merged_<조합>.ics 업로드는 지원 중단 예정입니다. "
+            "API가 categories/manifest.json 조합으로 옮겨 가면 MERGE_LEGACY_COMBINATIONS=0으로 끄세요."
+        )
+        combinations = dict(MERGE_COMBINATIONS)
+    else:
+        combinations = {MERGED_ALL_FILENAME: MERGE_COMBINATIONS[MERGED_ALL_FILENAME]}
+    categories = sorted({category for event in merged_events for category in event.categories})
+    for category in categories:
+        filename = f"{MERGE_CATEGORY_DIR}{fragment_filename(category)}"
+        if filename in combinations:
+            other, = combinations[filename]
+            raise ValueError(f"대소문자만 다른 카테고리는 조각 파일이 겹칩니다: {other!r}, {category!r} ({filename})")
+        combinations[filename] = {category}
+    return combinations, categories
 
 
 def generate_category_combinations(
-    merged_calendar: Calendar,
+    merged_events: List[RawEvent],
     combinations: Dict[str, Set[str]]
-) -> Dict[str, str]:
+) -> Dict[str, List[bytes]]:
     """
     카테고리 조합별로 필터링된 ICS 파일 생성
+    이벤트마다 카테고리 마스크를 한 번만 계산하고, 각 조합은 일치하는 버킷을 합쳐서 만든다.
+    VEVENT는 한 번만 바이트로 인코딩하고 모든 파일이 같은 bytes 객체를 참조하므로,
+    파일 수와 관계없이 메모리는 merged_all.ics 한 벌 정도다. 문서는 업로드 때 조각 단위로 이어 붙인다.
 
     Args:
-        merged_calendar: 병합된 Calendar 객체
+        merged_events: 병합된 RawEvent 리스트
         combinations: 파일명 -> 카테고리 집합 매핑
 
     Returns:
-        파일명 -> ICS 내용 딕셔너리
+        파일명 -> VEVENT 바이트 리스트 (calendar_chunks로 ICS 문서 조각이 됨)
     """
     logger.info("카테고리 조합별 파일 생성 중...")
     logger.info("-" * 70)
 
     results = {}
+    index = CategoryIndex(merged_events)
+    fragments = [event.to_bytes() for event in merged_events]
 
     for filename, categories in combinations.items():
-        # 카테고리 필터링
-        filtered_cal = filter_events_by_categories(merged_calendar, categories)
-        event_count = len(filtered_cal.events)
-
-        # ICS 문자열 생성
-        ics_content = str(filtered_cal)
+        # 카테고리 필터링 (일치하는 마스크 버킷의 합집합)
+        positions = index.positions(categories)
+        event_count = len(positions)
 
+        # 문서를 만들지 않고 공유 조각의 참조 리스트만 보관 (업로드 때 스트리밍으로 이어 붙임)
         category_str = ', '.join(sorted(categories)) if categories else '없음'
-        results[filename] = ics_content
+        results[filename] = [fragments[position] for position in positions]
 
         logger.info(f"  ✓ {filename:35s} {event_count:2d}개 이벤트 - [{category_str}]")
 
@@ -155,47 +391,255 @@ def generate_category_combinations(
     return results
 
 
+def calendar_chunks(fragments: List[bytes]) -> Iterator[bytes]:
+    """
+    generate_category_combinations의 VEVENT 바이트 리스트를 ICS 문서 조각으로
+    압축/해시 호출 수를 줄이도록 UPLOAD_BLOCK_SIZE 단위로 묶는다.
+    """
+    block, size = [], 0
+    for fragment in iter_calendar_fragments(fragments):
+        block.append(fragment)
+        size += len(fragment)
+        if size >= UPLOAD_BLOCK_SIZE:
+            yield b''.join(block)
+            block, size = [], 0
+    if block:
+        yield b''.join(block)
+
+
+def _timed_upload(fragments: List[bytes], bucket: str, s3_key: str) -> dict:
+    started = time.perf_counter()
+
+    def _chunks():
+        return calendar_chunks(fragments)
+
+    # 압축 변형을 먼저 올리고 원본을 마지막에 올려, 원본이 갱신되면 변형도 최신이 되도록 함
+    # 내용이 같은 객체는 PUT을 생략하여 ETag와 하위 캐시를 유지
+    variants = upload_compressed_variants(_chunks, bucket, s3_key, skip_unchanged=True)
+    result = upload_ics_stream(_chunks, bucket, s3_key, skip_unchanged=True)
+    result['latency_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    if variants:
+        result['variants'] = {
+            encoding: {
+                'success': variant.get('success', False),
+                'uploaded': variant.get('uploaded', False),
+                'size': variant.get('size'),
+                'reduction': variant.get('reduction'),
+            }
+            for encoding, variant in variants.items()
+        }
+    return result
+
+
 def upload_merged_files(
     bucket: str,
     merged_prefix: str,
-    files: Dict[str, str]
+    files: Dict[str, List[bytes]]
 ) -> Dict[str, dict]:
     """
     병합된 파일들을 S3 merged/ 폴더에 업로드
 
+    merged_all.ics를 제외한 파일은 MERGE_UPLOAD_WORKERS개까지 동시에 업로드하고,
+    merged_all.ics는 나머지가 모두 성공한 뒤 마지막에 업로드한다.
+    merged_all.ics가 갱신되었다면 같은 실행의 다른 파일도 모두 갱신된 상태이며,
+    하나라도 실패하면 merged_all.ics는 이전 버전으로 남아 다음 병합이 다시 시도한다.
+
     Args:
         bucket: S3 버킷 이름
         merged_prefix: merged 파일 접두사 (예: 'merged/')
-        files: 파일명 -> ICS 내용 딕셔너리
+        files: 파일명 -> VEVENT 바이트 리스트 (generate_category_combinations 결과)
 
     Returns:
-        파일명 -> 업로드 결과 딕셔너리
+        파일명 -> 업로드 결과 딕셔너리 (files 순서, latency_ms 포함)
     """
     logger.info("S3 merged/ 폴더에 업로드 중...")
     logger.info("-" * 70)
 
     upload_results = {}
+    others = [filename for filename in files if filename != MERGED_ALL_FILENAME]
+
+    if others:
+        workers = max(1, min(MERGE_UPLOAD_WORKERS, len(others)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='upload') as executor:
+            futures = {
+                executor.submit(_timed_upload, files[filename], bucket, f"{merged_prefix}{filename}"): filename
+                for filename in others
+            }
+            for future in as_completed(futures):
+                filename = futures[future]
+                try:
+                    upload_results[filename] = future.result()
+                except Exception as e:
+                    upload_results[filename] = {'success': False, 'error': str(e)}
+
+    if MERGED_ALL_FILENAME in files:
+        if all(result.get('success') for result in upload_results.values()):
+            upload_results[MERGED_ALL_FILENAME] = _timed_upload(
+                files[MERGED_ALL_FILENAME], bucket, f"{merged_prefix}{MERGED_ALL_FILENAME}"
+            )
+        else:
+            upload_results[MERGED_ALL_FILENAME] = {
+                'success': False,
+                'error': '다른 병합 파일 업로드 실패로 건너뜀',
+                'skipped': True,
+            }
 
-    for filename, ics_content in files.items():
-        s3_key = f"{merged_prefix}{filename}"
-
-        result = upload_ics(ics_content, bucket, s3_key)
-
+    upload_results = {filename: upload_results[filename] for filename in files}
+    for filename, result in upload_results.items():
         if result.get('success'):
-            upload_results[filename] = result
-            logger.info(f"  ✓ {filename}: {result.get('size'):,} bytes")
+            variants = ', '.join(
+                f"{encoding} {variant['size']:,} bytes (-{variant['reduction']:.0%})"
+                for encoding, variant in result.get('variants', {}).items() if variant['success']
+            )
+            logger.info(
+                f"  ✓ {filename}: {result.get('size'):,} bytes ({result.get('latency_ms')}ms)"
+                + ("" if result.get('uploaded') else " (변경 없음)")
+                + (f" [{variants}]" if variants else "")
+            )
         else:
             logger.error(f"  ✗ {filename}: 업로드 실패 - {result.get('error')}")
-            upload_results[filename] = result
 
     logger.info("-" * 70)
     return upload_results
 
 
+def publish_category_manifest(
+    bucket: str,
+    merged_prefix: str,
+    categories: List[str],
+    merged_files: Dict[str, List[bytes]],
+    upload_results: Dict[str, dict]
+) -> dict:
+    """
+    카테고리 조각이 모두 올라갔으면 manifest(ETag, 이벤트 수) 저장, 사라진 카테고리의 조각 삭제
+
+    Returns:
+        {'success', 'uploaded', 'categories'} (조각 업로드가 하나라도 실패하면 이전 manifest 유지)
+    """
+    manifest_key = f"{merged_prefix}{MERGE_CATEGORY_DIR}{MERGE_CATEGORY_MANIFEST}"
+    entries = {}
+    for category in categories:
+        filename = f"{MERGE_CATEGORY_DIR}{fragment_filename(category)}"
+        result = upload_results.get(filename, {})
+        if not result.get('success'):
+            logger.error(f"카테고리 조각 업로드 실패로 manifest 저장을 건너뜁니다: {filename}")
+            return {'success': False, 'uploaded': False, 'categories': len(categories)}
+        entries[category] = {
+            'file': fragment_filename(category),
+            'etag': result.get('etag'),
+            'events': len(merged_files[filename]),
+            'size': result.get('size'),
+        }
+
+    manifest = build_category_manifest(entries)
+    previous = download_json(bucket, manifest_key) or {}
+    if previous == manifest:
+        return {'success': True, 'uploaded': False, 'categories': len(categories)}
+    result = upload_json(manifest, bucket, manifest_key)
+    if not result.get('success'):
+        logger.error(f"카테고리 manifest 저장 실패: {result.get('error')}")
+        return {'success': False, 'uploaded': False, 'categories': len(categories)}
+
+    # manifest가 더 이상 가리키지 않는 조각 정리
+    for category, entry in previous.get('categories', {}).items():
+        if category not in entries:
+            for suffix in ('', *COMPRESSED_SUFFIXES.values()):
+                delete_ics(bucket, f"{merged_prefix}{MERGE_CATEGORY_DIR}{entry['file']}{suffix}")
+    counts = ', '.join(f"{category} {entry['events']}개" for category, entry in entries.items())
+    logger.info(f"카테고리 manifest 저장: {counts}")
+    return {'success': True, 'uploaded': True, 'categories': len(categories)}
+
+
+def _triggered_keys(event) -> List[str]:
+    """
+    S3 이벤트 알림으로 실행된 경우 변경된 객체 키 (스케줄 실행이면 빈 리스트)
+    알림의 키는 URL 인코딩되어 있으므로 (공백은 '+') 목록의 키와 비교할 수 있게 디코딩한다.
+    """
+    if not isinstance(event, dict):
+        return []
+    return [
+        unquote_plus(record['s3']['object']['key'])
+        for record in event.get('Records', [])
+        if isinstance(record, dict) and 's3' in record
+    ]
+
+
+def _log_triggered_keys(triggered: List[str], raw_etags: Dict[str, str], sources: SourceChanges) -> None:
+    """
+    알림으로 들어온 키가 이번 실행에서 어떻게 처리되는지 기록
+    다시 읽을 소스는 알림과 관계없이 ETag 비교로 정하므로 (알림 중복, 순서 뒤바뀜에도 같은 결과) 기록용이다.
+    """
+    changed = set(sources.changed)
+    for key in triggered:
+        if key in changed:
+            logger.info(f"S3 이벤트 {key}: ETag 변경, 다시 처리")
+        elif key in raw_etags:
+            logger.info(f"S3 이벤트 {key}: manifest와 ETag가 같아 건너뜀 (이미 반영된 알림)")
+        else:
+            logger.info(f"S3 이벤트 {key}: raw 목록에 없음 (삭제되었거나 대상 파일이 아님)")
+
+
+def _save_manifest(
+    bucket: str,
+    manifest_key: str,
+    manifest: SourceManifest,
+    raw_etags: Dict[str, str],
+    events_by_source: Dict[str, List[RawEvent]],
+    removed: List[str],
+    index: IdentityIndex,
+    expires: Optional[date]
+) -> None:
+    """이번에 반영한 소스의 ETag와 UID, 병합 결과의 가장 이른 종료일을 manifest에 기록하여 저장"""
+    manifest.expires = expires.isoformat() if expires else None
+    uids_by_source = index.uids_by_source()
+    for source in events_by_source:
+        manifest.record(source, raw_etags[source], uids_by_source.get(source, []))
+    # raw 파일이 사라져도 이벤트는 merged_all.ics에 남으므로 (이벤트 유실 방지) manifest에서만 뺀다
+    for source in removed:
+        manifest.forget(source)
+    result = upload_json(manifest.to_dict(), bucket, manifest_key)
+    if not result.get('success'):
+        logger.error(f"manifest 저장 실패: {result.get('error')}")
+
+
+def _no_changed_sources(
+    bucket: str,
+    manifest: SourceManifest,
+    manifest_key: str,
+    sources: SourceChanges,
+    start_time: float,
+    timer: StageTimer
+) -> dict:
+    """ETag가 바뀐 raw 파일이 없으면 다운로드, 파싱, 업로드 없이 종료"""
+    if sources.removed:
+        for source in sources.removed:
+            manifest.forget(source)
+        upload_json(manifest.to_dict(), bucket, manifest_key)
+    duration = time.time() - start_time
+    logger.info(f"변경된 raw 파일이 없어 병합을 건너뜁니다. ({len(sources.unchanged)}개 소스 유지, {duration:.2f}초)")
+    timer.emit(status='skipped')
+    return {
+        'statusCode': 200,
+        'body': {
+            'message': '변경된 raw 파일이 없습니다.',
+            'sources': {**sources.summary(), 'reprocessed': 0},
+            'files_uploaded': 0,
+            'duration_seconds': round(duration, 2),
+            's3_bucket': bucket,
+            's3_timings': get_s3_timings(reset=True),
+            'download_cache': get_download_cache_stats(reset=True),
+            'stages': timer.summary(),
+        }
+    }
+
+
 def lambda_handler(event, context):
     """
     AWS Lambda 핸들러 함수
 
+    스케줄 또는 raw/ 객체의 S3 이벤트로 실행되며, 어느 경우든 manifest와 ETag를 비교해
+    바뀐 소스만 다시 읽는다. {"full_merge": true} 이벤트는 모든 소스를 다시 처리한다.
+
     Args:
         event: Lambda 이벤트 객체
         context: Lambda 컨텍스트 객체
@@ -204,6 +648,11 @@ def lambda_handler(event, context):
         실행 결과 딕셔너리
     """
     start_time = time.time()
+    timer = StageTimer('merge')
+    # warm 컨테이너에서 이전 호출의 S3/캐시 카운터가 이번 결과에 섞이지 않도록 초기화
+    get_s3_timings(reset=True)
+    get_download_cache_stats(reset=True)
+    store = None
 
     logger.info("=" * 70)
     logger.info("ICS 파일 병합 Lambda 시작")
@@ -213,41 +662,121 @@ def lambda_handler(event, context):
         bucket = os.environ.get('S3_BUCKET', S3_BUCKET)
         raw_prefix = os.environ.get('S3_RAW_PREFIX', S3_RAW_PREFIX)
         merged_prefix = os.environ.get('S3_MERGED_PREFIX', S3_MERGED_PREFIX)
-
-        # 1. S3 raw/ 폴더의 모든 ICS 파일 병합
-        merged_calendar = merge_all_ics_files(bucket, raw_prefix)
-
-        # 2. 기존 merged_all.ics와 병합 (이벤트 유실 방지)
-        merged_calendar = merge_with_existing(bucket, merged_prefix, merged_calendar)
-
-        if len(merged_calendar.events) == 0:
+        index_key = os.environ.get('IDENTITY_INDEX_KEY', IDENTITY_INDEX_KEY)
+        manifest_key = os.environ.get('MERGE_MANIFEST_KEY', MERGE_MANIFEST_KEY)
+        store_key = os.environ.get('EVENT_STORE_KEY', EVENT_STORE_KEY)
+
+        # 1. raw 목록의 ETag를 manifest와 비교하여 다시 읽을 소스 결정
+        triggered = _triggered_keys(event)
+        # 목록 조회 실패(StorageError)는 500으로 끝낸다: 빈 목록을 "모든 소스 삭제"로 보고 manifest를 비우지 않도록
+        with timer.stage('list') as stage:
+            raw_etags = list_ics_etags(bucket, raw_prefix)
+            stage.count = len(raw_etags)
+        with timer.stage('load_state'):
+            manifest = SourceManifest.from_dict(download_json(bucket, manifest_key))
+        sources = manifest.diff(raw_etags)
+        if triggered:
+            _log_triggered_keys(triggered, raw_etags, sources)
+        full_merge = isinstance(event, dict) and bool(event.get('full_merge'))
+        cutoff = retention_cutoff()
+
+        # merged_all.ics나 카테고리 manifest가 없으면 (최초 실행, 수동 삭제) 변경이 없어도 다시 만든다
+        if not sources.changed and not full_merge:
+            if manifest.expired_before(cutoff):
+                logger.info(f"보존 기간({cutoff.isoformat()})이 지난 이벤트가 있어 변경된 소스 없이 병합합니다.")
+            elif (object_exists(bucket, f"{merged_prefix}{MERGED_ALL_FILENAME}")
+                  and object_exists(bucket, f"{merged_prefix}{MERGE_CATEGORY_DIR}{MERGE_CATEGORY_MANIFEST}")):
+                return _no_changed_sources(bucket, manifest, manifest_key, sources, start_time, timer)
+
+        # 2. 이전 병합 결과 로드 (없으면 변경되지 않은 소스도 모두 다시 읽음)
+        with timer.stage('load_state'):
+            store = open_event_store(bucket, store_key)
+            rebuild_store = len(store) == 0
+            existing_events = load_previous_events(bucket, merged_prefix, store)
+        if existing_events is None or full_merge:
+            keys = list(raw_etags)
+        else:
+            keys = sources.changed
+        logger.info(f"다시 처리할 소스: {len(keys)}/{len(raw_etags)}개 (변경 {len(sources.changed)}, 유지 {len(sources.unchanged)})")
+
+        # 3. 변경된 raw 파일만 로드하여 기존 이벤트와 병합 (이벤트 유실 방지, UID 고정)
+        events_by_source = merge_all_ics_files(bucket, raw_prefix, keys, timer)
+        with timer.stage('load_state'):
+            index = IdentityIndex.from_dict(download_json(bucket, index_key))
+        with timer.stage('dedupe') as stage:
+            merged_events, diff = merge_with_existing(
+                existing_events or [], events_by_source, index, None if rebuild_store else store, cutoff
+            )
+            stage.count = len(merged_events)
+        with timer.stage('store') as stage:
+            store_writes = update_event_store(store, merged_events, diff, rebuild_store)
+            stage.count = store_writes
+
+        if len(merged_events) == 0:
             logger.warning("병합할 이벤트가 없습니다.")
+            timer.emit(status='empty')
             return {
                 'statusCode': 200,
                 'body': {
                     'message': '병합할 이벤트가 없습니다.',
                     'total_events': 0,
-                    'files_generated': 0
+                    'files_generated': 0,
+                    'stages': timer.summary()
                 }
             }
 
-        # 3. 카테고리 조합별 파일 생성
-        merged_files = generate_category_combinations(merged_calendar, MERGE_COMBINATIONS)
-
-        # 4. S3 merged/ 폴더에 업로드
-        upload_results = upload_merged_files(bucket, merged_prefix, merged_files)
+        # 4. 카테고리 조합별 파일 생성
+        with timer.stage('filter') as stage:
+            combinations, categories = publish_plan(merged_events)
+            merged_files = generate_category_combinations(merged_events, combinations)
+            stage.count = len(merged_files)
+
+        # 5. S3 merged/ 폴더에 업로드
+        with timer.stage('upload') as stage:
+            upload_results = upload_merged_files(bucket, merged_prefix, merged_files)
+            category_manifest = publish_category_manifest(bucket, merged_prefix, categories, merged_files, upload_results)
+            uploaded = [result for result in upload_results.values() if result.get('uploaded')]
+            stage.count, stage.bytes = len(uploaded), sum(result.get('size') or 0 for result in uploaded)
+
+        # 6. identity index, 이벤트 저장소, manifest 저장 (merged_all.ics까지 올라간 경우에만, 상태를 함께 전진)
+        if upload_results.get(MERGED_ALL_FILENAME, {}).get('success'):
+            with timer.stage('save_state'):
+                state_saved = True
+                if not diff.changed:
+                    logger.info("이전 병합 대비 변경된 이벤트가 없어 identity index 저장을 건너뜁니다.")
+                else:
+                    index_result = upload_json(index.to_dict(), bucket, index_key)
+                    state_saved = index_result.get('success', False)
+                    if not state_saved:
+                        logger.error(f"identity index 저장 실패: {index_result.get('error')}")
+                if state_saved and store_writes:
+                    store_result = save_event_store(store, bucket, store_key)
+                    state_saved = store_result.get('success', False)
+                    if not state_saved:
+                        logger.error(f"이벤트 저장소 저장 실패: {store_result.get('error')}")
+                # 상태가 저장되지 않으면 manifest도 그대로 두어 다음 실행에서 같은 소스를 다시 처리
+                if state_saved:
+                    _save_manifest(
+                        bucket, manifest_key, manifest, raw_etags, events_by_source, sources.removed, index,
+                        store.earliest_end_date()
+                    )
+        else:
+            logger.warning("merged_all.ics가 갱신되지 않아 identity index, 이벤트 저장소, manifest 저장을 건너뜁니다.")
 
         # 결과 통계
         success_count = sum(1 for r in upload_results.values() if r.get('success'))
+        uploaded_count = sum(1 for r in upload_results.values() if r.get('uploaded'))
         total_count = len(upload_results)
 
         duration = time.time() - start_time
 
         logger.info("=" * 70)
         logger.info("ICS 파일 병합 완료!")
-        logger.info(f"  총 이벤트 수: {len(merged_calendar.events)}개")
+        logger.info(f"  총 이벤트 수: {len(merged_events)}개")
+        if diff.expired:
+            logger.info(f"  보존 기간 정리: {len(diff.expired)}개, {diff.expired_bytes:,} bytes 제거")
         logger.info(f"  생성된 파일: {total_count}개")
-        logger.info(f"  업로드 성공: {success_count}/{total_count}")
+        logger.info(f"  업로드 성공: {success_count}/{total_count} (실제 PUT {uploaded_count}개, 나머지는 내용 동일)")
         logger.info(f"  소요 시간: {duration:.2f}초")
         logger.info("=" * 70)
 
@@ -256,20 +785,34 @@ def lambda_handler(event, context):
             logger,
             "merge",
             duration,
-            len(merged_calendar.events),
-            f"{merged_prefix}*"
+            len(merged_events),
+            f"{merged_prefix}*",
+            timer
         )
 
         return {
             'statusCode': 200,
             'body': {
-                'total_events': len(merged_calendar.events),
+                'total_events': len(merged_events),
+                'changes': diff.summary(),
+                'sources': {**sources.summary(), 'reprocessed': len(events_by_source)},
+                'event_store': {'events': len(store), 'writes': store_writes, 'size': store.size_bytes()},
+                'retention': {
+                    'cutoff': cutoff.isoformat() if cutoff else None,
+                    'events_removed': len(diff.expired),
+                    'bytes_removed': diff.expired_bytes,
+                },
                 'files_generated': total_count,
+                'category_manifest': category_manifest,
                 'upload_success': success_count,
                 'upload_failed': total_count - success_count,
+                'files_uploaded': uploaded_count,
                 'duration_seconds': round(duration, 2),
                 's3_bucket': bucket,
                 's3_merged_prefix': merged_prefix,
+                's3_timings': get_s3_timings(reset=True),
+                'download_cache': get_download_cache_stats(reset=True),
+                'stages': timer.summary(),
                 'files': list(upload_results.keys())
             }
         }
@@ -277,15 +820,21 @@ def lambda_handler(event, context):
     except Exception as e:
         duration = time.time() - start_time
         logger.error(f"병합 실패: {e}", exc_info=True)
+        timer.emit(status='error')
 
         return {
             'statusCode': 500,
             'body': {
                 'error': str(e),
-                'duration_seconds': round(duration, 2)
+                'duration_seconds': round(duration, 2),
+                'stages': timer.summary()
             }
         }
 
+    finally:
+        if store is not None:
+            store.close()
+
 
 # 로컬 테스트용
 if __name__ == "__main__":
@@ -10,7 +10,7 @@ import time
 import re
 import asyncio
 from datetime import datetime
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
 # Lambda Layer에서 common 모듈 import
@@ -18,13 +18,13 @@ from urllib.parse import urljoin, urlparse
 sys.path.insert(0, '/opt/python')
 import httpx
 from bs4 import BeautifulSoup
-from ics import Calendar
 
-from common.logger import setup_logger, log_crawler_start, log_crawler_complete, log_execution_metrics
-from common.date_utils import get_datetime_from_text
-from common.s3_utils import upload_ics
+from common.logger import setup_logger, log_crawler_start, log_crawler_complete, log_execution_metrics, StageTimer
+from common.date_utils import find_datetimes, pick_datetime, ParseContext
+from common.s3_utils import load_first_seen, upload_ics, get_download_cache_stats
+from common.storage import get_s3_timings
 from common.config import SCHOLARSHIP_CONFIG, S3_BUCKET
-from common.ics_builder import split_long_duration_event, create_event
+from common.ics_builder import split_long_duration_event, create_event, stabilize_events, write_calendar
 
 logger = setup_logger(__name__)
 
@@ -79,9 +79,9 @@ def is_application_label(label: str) -> bool:
 
 
 
-def build_ics_from_events(events: List[dict]) -> str:
-    """이벤트 딕셔너리 리스트를 ICS 문자열로 변환"""
-    cal = Calendar()
+def build_ics_from_events(events: List[dict], first_seen: Optional[Dict[str, datetime]] = None) -> str:
+    """이벤트 딕셔너리 리스트를 ICS 문자열로 변환 (first_seen: UID -> 이전 DTSTAMP)"""
+    records = []
 
     for ev in events:
         date = ev.get("date", [])
@@ -89,19 +89,20 @@ def build_ics_from_events(events: List[dict]) -> str:
             continue
         if isinstance(date, tuple):
             logger.info(f"date = {date}")
-            event = split_long_duration_event(title= ev.get('title'), start_date=date[0], end_date=date[1], categories=ev.get('tags'), url=ev.get('url'))
-            cal.events = cal.events.union(event)
+            records.extend(split_long_duration_event(title= ev.get('title'), start_date=date[0], end_date=date[1], categories=ev.get('tags'), url=ev.get('url')))
             continue
-        event = create_event(title= ev.get('title'), start_date=date, categories=ev.get('tags'), url=ev.get('url'))
-        cal.events.add(event)
+        records.append(create_event(title= ev.get('title'), start_date=date, categories=ev.get('tags'), url=ev.get('url')))
 
-    return str(cal)
+    return write_calendar(stabilize_events(records, first_seen))
 
 
-async def fetch_text(client: httpx.AsyncClient, url: str) -> str:
-    """URL에서 HTML 텍스트 가져오기"""
-    resp = await client.get(url)
-    resp.raise_for_status()
+async def fetch_text(client: httpx.AsyncClient, url: str, timer: StageTimer | None = None) -> str:
+    """URL에서 HTML 텍스트 가져오기 (fetch 단계)"""
+    timer = timer or StageTimer(SCHOLARSHIP_CONFIG.name)
+    with timer.stage('fetch') as stage:
+        resp = await client.get(url)
+        resp.raise_for_status()
+        stage.count, stage.bytes = 1, len(resp.content)
     return resp.text
 
 
@@ -115,31 +116,35 @@ async def collect_detail_links(
     client: httpx.AsyncClient,
     list_url: str,
     link_selectors: List[str],
+    timer: StageTimer | None = None,
 ) -> List[str]:
     """목록 페이지에서 세부 페이지 링크 수집"""
     logger.info("세부 페이지 링크 수집 중...")
+    timer = timer or StageTimer(SCHOLARSHIP_CONFIG.name)
 
     base = resolve_base_url(list_url)
-    html = await fetch_text(client, list_url)
-    soup = BeautifulSoup(html, 'html.parser')
+    html = await fetch_text(client, list_url, timer)
 
     collected: List[str] = []
-    for sel in link_selectors:
-        links = soup.select(sel)
-        logger.info(f"  선택자 '{sel}': {len(links)}개 링크 발견")
-        for a in links:
-            tag = a.parent.parent.select(".tag")
-            if tag and "완료" in tag[0].text:
-                continue
-            href = a.get('href')
-            if not href:
-                continue
-            url = urljoin(base + '/', href)
-            if url not in collected:
-                collected.append(url)
-                logger.debug(f"    → {url}")
-        if collected:
-            break
+    with timer.stage('parse_html') as stage:
+        soup = BeautifulSoup(html, 'html.parser')
+        for sel in link_selectors:
+            links = soup.select(sel)
+            logger.info(f"  선택자 '{sel}': {len(links)}개 링크 발견")
+            for a in links:
+                tag = a.parent.parent.select(".tag")
+                if tag and "완료" in tag[0].text:
+                    continue
+                href = a.get('href')
+                if not href:
+                    continue
+                url = urljoin(base + '/', href)
+                if url not in collected:
+                    collected.append(url)
+                    logger.debug(f"    → {url}")
+            if collected:
+                break
+        stage.count = len(collected)
 
     logger.info(f"총 {len(collected)}개 링크 수집 완료")
     return collected
@@ -148,6 +153,7 @@ async def collect_detail_links(
 def extract_schedule_items_from_soup(
     soup: BeautifulSoup,
     content_selectors: List[str],
+    context: ParseContext | None = None,
 ) -> Tuple[datetime, datetime] | datetime:
     """BeautifulSoup 객체에서 일정 항목 추출"""
     # content 루트 선택
@@ -188,32 +194,36 @@ def extract_schedule_items_from_soup(
         parents.append(chosen)
 
 
-    for el in parents:
-        text = el.get_text(' ', strip=True)
-        if not text:
-            continue
-
-        result = get_datetime_from_text(text)
-        if result:
-            return result
+    # 문단 텍스트를 모아 페이지당 한 번에 날짜 추출
+    texts = [el.get_text(' ', strip=True) for el in parents]
+    return pick_datetime(find_datetimes(texts, context=context))
 
 
 async def extract_detail(
     client: httpx.AsyncClient,
     url: str,
     content_selectors: List[str],
+    context: ParseContext | None = None,
+    timer: StageTimer | None = None,
 ):
     """세부 페이지에서 제목과 일정 항목 추출"""
-    html = await fetch_text(client, url)
-    soup = BeautifulSoup(html, 'html.parser')
-    title_el = soup.select_one("h1, h2, .title, .post-title")
-    title = title_el.get_text(strip=True) if title_el else "제목 없음"
-    item = extract_schedule_items_from_soup(soup, content_selectors)
+    timer = timer or StageTimer(SCHOLARSHIP_CONFIG.name)
+    html = await fetch_text(client, url, timer)
+    with timer.stage('parse_html') as stage:
+        soup = BeautifulSoup(html, 'html.parser')
+        title_el = soup.select_one("h1, h2, .title, .post-title")
+        title = title_el.get_text(strip=True) if title_el else "제목 없음"
+        stage.count = 1
+    with timer.stage('extract_dates') as stage:
+        item = extract_schedule_items_from_soup(soup, content_selectors, context)
+        stage.count = 1 if item else 0
     return title, item
 
 
-async def run_crawler(config: dict) -> dict:
-    """크롤러 실행"""
+async def run_crawler(config: dict, context: ParseContext | None = None, timer: StageTimer | None = None) -> dict:
+    """크롤러 실행 (timer: fetch, parse_html, extract_dates 단계 측정)"""
+    context = context or ParseContext.now()
+    timer = timer or StageTimer(SCHOLARSHIP_CONFIG.name)
     timeout = int(config.get('timeout', 30))
     max_concurrency = int(config.get('max_concurrency', 10))
     list_url = config['list_url']
@@ -225,7 +235,7 @@ async def run_crawler(config: dict) -> dict:
         follow_redirects=True,
         headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
     ) as client:
-        detail_urls = await collect_detail_links(client, list_url, link_selectors)
+        detail_urls = await collect_detail_links(client, list_url, link_selectors, timer)
         if not detail_urls:
             return {'events': [], 'misses': []}
 
@@ -233,7 +243,7 @@ async def run_crawler(config: dict) -> dict:
 
         async def task(u: str):
             async with sem:
-                return await extract_detail(client, u, content_selectors)
+                return await extract_detail(client, u, content_selectors, context, timer)
 
         results = await asyncio.gather(*[task(u) for u in detail_urls])
 
@@ -270,26 +280,38 @@ def lambda_handler(event, context):
         실행 결과 딕셔너리
     """
     start_time = time.time()
+    timer = StageTimer(SCHOLARSHIP_CONFIG.name)
+    # warm 컨테이너에서 이전 호출의 S3/캐시 카운터가 이번 결과에 섞이지 않도록 초기화
+    get_s3_timings(reset=True)
+    get_download_cache_stats(reset=True)
 
     log_crawler_start(logger, SCHOLARSHIP_CONFIG.name, SCHOLARSHIP_CONFIG.url)
 
     try:
-        # 비동기 크롤링 실행
-        result = asyncio.run(run_crawler(CRAWLER_CONFIG))
+        # 비동기 크롤링 실행 (실행 1회 동안 같은 날짜 파싱 기준 사용)
+        parse_context = ParseContext.now()
+        result = asyncio.run(run_crawler(CRAWLER_CONFIG, parse_context, timer))
 
         events = result.get('events', [])
         misses = result.get('misses', [])
 
         logger.info(f"수집된 이벤트: {len(events)}개, 날짜 미탐지: {len(misses)}개")
 
-        # ICS 파일 생성
-        ics_content = build_ics_from_events(events)
-
-        # S3 업로드
         bucket = os.environ.get('S3_BUCKET', S3_BUCKET)
         s3_key = SCHOLARSHIP_CONFIG.output_key
 
-        upload_result = upload_ics(ics_content, bucket, s3_key)
+        # ICS 파일 생성 (이전 출력의 DTSTAMP 유지 + 정렬로 같은 입력이면 같은 바이트)
+        with timer.stage('load_state'):
+            first_seen = load_first_seen(bucket, s3_key)
+        with timer.stage('serialize') as stage:
+            ics_content = build_ics_from_events(events, first_seen)
+            stage.count, stage.bytes = len(events), len(ics_content.encode('utf-8'))
+
+        # S3 업로드
+        with timer.stage('upload') as stage:
+            upload_result = upload_ics(ics_content, bucket, s3_key, skip_unchanged=True)
+            if upload_result.get('uploaded'):
+                stage.count, stage.bytes = 1, upload_result.get('size') or 0
 
         if not upload_result.get('success'):
             raise Exception(f"S3 업로드 실패: {upload_result.get('error')}")
@@ -297,7 +319,7 @@ def lambda_handler(event, context):
         duration = time.time() - start_time
 
         log_crawler_complete(logger, SCHOLARSHIP_CONFIG.name, len(events), duration)
-        log_execution_metrics(logger, SCHOLARSHIP_CONFIG.name, duration, len(events), s3_key)
+        log_execution_metrics(logger, SCHOLARSHIP_CONFIG.name, duration, len(events), s3_key, timer)
 
         return {
             'statusCode': 200,
@@ -308,20 +330,26 @@ def lambda_handler(event, context):
                 'duration_seconds': round(duration, 2),
                 's3_bucket': bucket,
                 's3_key': s3_key,
-                'file_size': upload_result.get('size')
+                'uploaded': upload_result.get('uploaded', False),
+                's3_timings': get_s3_timings(reset=True),
+                'download_cache': get_download_cache_stats(reset=True),
+                'file_size': upload_result.get('size'),
+                'stages': timer.summary()
             }
         }
 
     except Exception as e:
         duration = time.time() - start_time
         logger.error(f"크롤링 실패: {e}", exc_info=True)
+        timer.emit(status='error')
 
         return {
             'statusCode': 500,
             'body': {
                 'crawler': SCHOLARSHIP_CONFIG.name,
                 'error': str(e),
-                'duration_seconds': round(duration, 2)
+                'duration_seconds': round(duration, 2),
+                'stages': timer.summary()
             }
         }
 
@@ -0,0 +1,64 @@
+"""
+테스트 공통 설정
+Lambda Layer(/opt/python/common)와 같은 `common` 패키지를 저장소의 common/python에서 불러오고,
+메모리 저장소와 Lambda 핸들러 fixture를 제공합니다.
+"""
+
+import functools
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+CRAWLER_ROOT = Path(__file__).resolve().parent.parent
+COMMON_DIR = CRAWLER_ROOT / 'common' / 'python'
+
+
+def _load_common():
+    if 'common' in sys.modules:
+        return sys.modules['common']
+    spec = importlib.util.spec_from_file_location(
+        'common',
+        COMMON_DIR / '__init__.py',
+        submodule_search_locations=[str(COMMON_DIR)],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['common'] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+_load_common()
+
+
+def load_handler(name: str):
+    """functions/<name>/handler.py를 독립 모듈로 불러오기 (Lambda 함수마다 handler 모듈 이름이 같음)"""
+    spec = importlib.util.spec_from_file_location(
+        f'{name}_handler', CRAWLER_ROOT / 'functions' / name / 'handler.py'
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def memory_storage():
+    """빈 메모리 저장소 (테스트가 끝나면 기본 저장소로 되돌림)"""
+    from common import storage
+
+    backend = storage.MemoryStorage()
+    storage.set_storage(backend)
+    yield backend
+    storage.set_storage(None)
+
+
+@pytest.fixture
+def merge_handler(memory_storage, tmp_path, monkeypatch):
+    """빈 버킷과 아직 없는 로컬 경로의 이벤트 저장소로 실행하는 merge handler"""
+    from common.event_store import open_event_store
+
+    handler = load_handler('merge')
+    store_path = tmp_path / 'event-store' / 'events.sqlite3'
+    monkeypatch.setattr(handler, 'open_event_store', functools.partial(open_event_store, path=str(store_path)))
+    return handler
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from common.calendar_compose import (
+    _compose, clear_compose_cache, compose_calendar, fragment_filename, load_category_manifest,
+)
+from common.config import MERGE_CATEGORY_DIR, MERGE_COMBINATIONS, S3_BUCKET, S3_MERGED_PREFIX, S3_RAW_PREFIX
+from common.ics_builder import create_event, write_calendar
+from common.s3_utils import upload_ics
+
+TODAY = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+@pytest.fixture(autouse=True)
+def compose_cache():
+    clear_compose_cache()
+    yield
+    clear_compose_cache()
+
+
+def _merge_sample(handler):
+    """카테고리가 하나인 이벤트와 여러 개인 이벤트를 섞어 병합"""
+    day = TODAY + timedelta(days=30)
+    sources = {
+        'standard.ics': [
+            create_event('수강신청', day, categories=['STANDARD']),
+            create_event('개강', day + timedelta(days=1), categories=['STANDARD', 'EVENT']),
+        ],
+        'scholarships.ics': [
+            create_event('장학금 신청', day, categories=['SCHOLARSHIP']),
+            create_event('장학 설명회', day + timedelta(days=2), categories=['SCHOLARSHIP', 'EVENT']),
+        ],
+        'events.ics': [create_event('축제', day + timedelta(days=3), categories=['EVENT'])],
+    }
+    for name, events in sources.items():
+        upload_ics(write_calendar(events), S3_BUCKET, f"{S3_RAW_PREFIX}{name}")
+    result = handler.lambda_handler({}, None)
+    assert result['statusCode'] == 200, result['body']
+
+
+@pytest.mark.parametrize('filename', sorted(MERGE_COMBINATIONS))
+def test_compose_matches_legacy_combination_file(merge_handler, memory_storage, filename):
+    _merge_sample(merge_handler)
+    legacy = memory_storage.get(S3_BUCKET, f"{S3_MERGED_PREFIX}{filename}").body
+
+    assert compose_calendar(MERGE_COMBINATIONS[filename], S3_BUCKET, S3_MERGED_PREFIX) == legacy
+
+
+def test_compose_reuses_cache_until_fragment_changes(merge_handler, memory_storage):
+    _merge_sample(merge_handler)
+    manifest = load_category_manifest(S3_BUCKET, S3_MERGED_PREFIX)
+    assert set(manifest['categories']) == {'STANDARD', 'SCHOLARSHIP', 'EVENT'}
+
+    first = compose_calendar(['EVENT', 'STANDARD'], S3_BUCKET, S3_MERGED_PREFIX, manifest)
+    assert compose_calendar(['STANDARD', 'EVENT'], S3_BUCKET, S3_MERGED_PREFIX, manifest) == first
+    assert _compose.cache_info().hits == 1
+
+    # 조각이 바뀌면 manifest의 ETag가 달라져 다시 만든다
+    upload_ics(
+        write_calendar([create_event('축제', TODAY + timedelta(days=40), categories=['EVENT'])]),
+        S3_BUCKET, f"{S3_RAW_PREFIX}events.ics",
+    )
+    merge_handler.lambda_handler({}, None)
+    manifest = load_category_manifest(S3_BUCKET, S3_MERGED_PREFIX)
+    changed = compose_calendar(['EVENT', 'STANDARD'], S3_BUCKET, S3_MERGED_PREFIX, manifest)
+    assert changed != first
+    assert changed == memory_storage.get(S3_BUCKET, f"{S3_MERGED_PREFIX}merged_standard_event.ics").body
+
+
+def test_compose_without_manifest_raises(memory_storage):
+    with pytest.raises(ValueError):
+        compose_calendar(['EVENT'], S3_BUCKET, S3_MERGED_PREFIX)
+
+
+def test_compose_with_missing_fragment_raises(merge_handler, memory_storage):
+    _merge_sample(merge_handler)
+    memory_storage.delete(S3_BUCKET, f"{S3_MERGED_PREFIX}{MERGE_CATEGORY_DIR}{fragment_filename('EVENT')}")
+
+    with pytest.raises(ValueError):
+        compose_calendar(['EVENT'], S3_BUCKET, S3_MERGED_PREFIX)
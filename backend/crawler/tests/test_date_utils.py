@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import pytest
+
+from common.date_utils import ParseContext, find_datetimes, get_datetime_from_text, pick_datetime
+
+CONTEXT = ParseContext(reference=datetime(2026, 1, 10))
+
+
+def _at(*args):
+    return datetime(*args, tzinfo=CONTEXT.tzinfo)
+
+
+# 형식은 맞지만 없는 날짜/시각: 예외 없이 None (find_datetimes와 같은 결과)
+@pytest.mark.parametrize('text', [
+    "v 10.13.45 release",
+    "2월 30일 마감",
+    "13월 5일",
+])
+def test_invalid_dates_return_none(text):
+    assert get_datetime_from_text(text, CONTEXT) is None
+    assert pick_datetime(find_datetimes([text], context=CONTEXT)) is None
+
+
+def test_invalid_range_end_falls_back_to_single_date():
+    text = "9.30 10:00 ~ 24:00"
+    assert get_datetime_from_text(text, CONTEXT) == _at(2026, 9, 30, 10, 0)
+    assert pick_datetime(find_datetimes([text], context=CONTEXT)) == _at(2026, 9, 30, 10, 0)
+
+
+def test_invalid_match_skipped_for_next_match():
+    assert get_datetime_from_text("2월 30일 마감 (연장: 3월 2일)", CONTEXT) == _at(2026, 3, 2)
+
+
+def test_valid_dates_unchanged():
+    assert get_datetime_from_text("2월 28일 마감", CONTEXT) == _at(2026, 2, 28)
+    assert get_datetime_from_text("9.30 10:00 ~ 18:00", CONTEXT) == (_at(2026, 9, 30, 10, 0), _at(2026, 9, 30, 18, 0))
+
+
+# 형식의 공백이 텍스트에서 빠지거나 (요일을 지워) 늘어나도 같은 날짜
+@pytest.mark.parametrize('text, expected', [
+    ("7월27일 마감", _at(2026, 7, 27)),
+    ("2.20. 금요일 16:30 (방문 제출)", _at(2026, 2, 20, 16, 30)),
+    ("2026년8월21일(화) 09:00 까지", _at(2026, 8, 21, 9, 0)),
+])
+def test_spacing_variants(text, expected):
+    assert get_datetime_from_text(text, CONTEXT) == expected
+    assert pick_datetime(find_datetimes([text], context=CONTEXT)) == expected
+
+
+def test_spacing_variants_in_range():
+    assert get_datetime_from_text("5월21일 12:59 ~ 17:00", CONTEXT) == (_at(2026, 5, 21, 12, 59), _at(2026, 5, 21, 17, 0))
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("추천 마감 26.12.01 (학과 사무실 제출)", _at(2026, 12, 1)),
+    ("26.04.07(토) 마감", _at(2026, 4, 7)),
+])
+def test_two_digit_year(text, expected):
+    assert get_datetime_from_text(text, CONTEXT) == expected
+    assert pick_datetime(find_datetimes([text], context=CONTEXT)) == expected
+
+
+def test_four_digit_year_wins_over_two_digit_suffix():
+    [match] = find_datetimes("마감 2026.03.04", context=CONTEXT)
+    assert match.format == "%Y.%m.%d"
+    assert match.value == _at(2026, 3, 4)
+    # 69~99는 strptime과 같이 1900년대 (지난 날짜)
+    assert get_datetime_from_text("99.03.04", CONTEXT) is None
+
+
+def test_range_end_rolls_into_next_year_within_half_a_year():
+    expected = (_at(2026, 12, 20), _at(2027, 1, 10))
+    assert get_datetime_from_text("접수: 2026.12.20 ~ 1월 10일", CONTEXT) == expected
+    assert get_datetime_from_text("접수: 12월 20일 ~ 1월 10일", CONTEXT) == expected
+
+
+@pytest.mark.parametrize('text', [
+    "추천 마감 2026.03.04 09:30~ 2월 28일 10:00",
+    "접수기간 : 10.18 18:30~ 10월 8일 09:59 까지",
+])
+def test_range_end_far_before_start_is_not_a_range(text):
+    # 다음 해로 넘기면 1년 가까운 기간이 되므로 잘못 적힌 종료일로 보고 기간으로 쓰지 않는다
+    assert not isinstance(get_datetime_from_text(text, CONTEXT), tuple)
+    assert not any(match.is_range for match in find_datetimes([text], context=CONTEXT))
+    # 허용 기간을 늘리면 다음 해 종료일로 본다
+    lenient = ParseContext(reference=CONTEXT.reference, range_rollover_days=366)
+    assert isinstance(get_datetime_from_text(text, lenient), tuple)
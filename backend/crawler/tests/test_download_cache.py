@@ -0,0 +1,119 @@
+import os
+
+import pytest
+
+from common import s3_utils, storage
+from common.s3_utils import download_ics, get_download_cache_stats, upload_ics, upload_ics_stream
+
+BUCKET = 'test-bucket'
+KEY = 'raw/a.ics'
+
+
+class RemoteMemoryStorage(storage.MemoryStorage):
+    """S3처럼 remote로 표시한 메모리 저장소 (/tmp 캐시 경로 실행, 조건부 GET 결과 기록)"""
+    name = 'remote-memory'
+    remote = True
+
+    def __init__(self):
+        super().__init__()
+        self.responses = []
+        self.fail_put_stream = False
+
+    def get(self, bucket, key, if_none_match=None):
+        stored = super().get(bucket, key, if_none_match)
+        if stored is not None:
+            self.responses.append(304 if stored.not_modified else 200)
+        return stored
+
+    def put_stream(self, bucket, key, chunks, *args, **kwargs):
+        if self.fail_put_stream:
+            # 본문을 끝까지 읽은 뒤 실패 (멀티파트 완료 단계 실패와 같은 상황)
+            for _ in chunks:
+                pass
+            raise storage.StorageError('PutObject 실패')
+        return super().put_stream(bucket, key, chunks, *args, **kwargs)
+
+
+@pytest.fixture
+def remote_storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(s3_utils, 'S3_CACHE_DIR', str(tmp_path / 'cache'))
+    backend = RemoteMemoryStorage()
+    storage.set_storage(backend)
+    get_download_cache_stats(reset=True)
+    yield backend
+    storage.set_storage(None)
+
+
+def _cached(bucket, key):
+    body_path, etag_path = s3_utils._cache_paths(bucket, key)
+    with open(etag_path) as f:
+        etag = f.read()
+    with open(body_path, 'rb') as f:
+        return etag, f.read()
+
+
+def _temp_files():
+    return [name for name in os.listdir(s3_utils.S3_CACHE_DIR) if name.endswith('.tmp')]
+
+
+def test_unchanged_object_is_served_from_cache(remote_storage):
+    body = 'BEGIN:VCALENDAR 학사'.encode('utf-8')
+    info = remote_storage.put(BUCKET, KEY, body)
+
+    assert download_ics(BUCKET, KEY) == 'BEGIN:VCALENDAR 학사'
+    assert _cached(BUCKET, KEY) == (info.etag, body)
+    assert download_ics(BUCKET, KEY) == 'BEGIN:VCALENDAR 학사'
+
+    assert remote_storage.responses == [200, 304]
+    assert get_download_cache_stats(reset=True) == {
+        'hits': 1, 'misses': 1, 'bytes_saved': len(body), 'bytes_downloaded': len(body),
+    }
+
+
+def test_changed_object_replaces_cache(remote_storage):
+    remote_storage.put(BUCKET, KEY, b'old')
+    download_ics(BUCKET, KEY)
+    new = remote_storage.put(BUCKET, KEY, b'new body')
+
+    assert download_ics(BUCKET, KEY) == 'new body'
+    assert remote_storage.responses == [200, 200]
+    assert _cached(BUCKET, KEY) == (new.etag, b'new body')
+    assert _temp_files() == []
+    assert get_download_cache_stats()['misses'] == 2
+
+
+def test_local_backends_do_not_use_cache(memory_storage, tmp_path, monkeypatch):
+    monkeypatch.setattr(s3_utils, 'S3_CACHE_DIR', str(tmp_path / 'cache'))
+    memory_storage.put(BUCKET, KEY, b'body')
+
+    download_ics(BUCKET, KEY)
+    download_ics(BUCKET, KEY)
+
+    assert not (tmp_path / 'cache').exists()
+
+
+@pytest.mark.parametrize('upload', ['bytes', 'stream'])
+def test_upload_refreshes_cache(remote_storage, upload):
+    if upload == 'bytes':
+        result = upload_ics(b'uploaded', BUCKET, KEY)
+    else:
+        result = upload_ics_stream(lambda: iter([b'up', b'loaded']), BUCKET, KEY)
+
+    assert _cached(BUCKET, KEY) == (result['etag'], b'uploaded')
+    # 방금 올린 객체는 다음 다운로드에서 전송 없이 재사용
+    assert download_ics(BUCKET, KEY) == 'uploaded'
+    assert remote_storage.responses == [304]
+    assert _temp_files() == []
+
+
+def test_failed_stream_upload_keeps_previous_cache(remote_storage):
+    first = upload_ics(b'first', BUCKET, KEY)
+    remote_storage.fail_put_stream = True
+
+    result = upload_ics_stream(iter([b'second']), BUCKET, KEY)
+
+    assert not result['success']
+    assert _cached(BUCKET, KEY) == (first['etag'], b'first')
+    assert _temp_files() == []
+    assert download_ics(BUCKET, KEY) == 'first'
+    assert remote_storage.responses == [304]
@@ -0,0 +1,107 @@
+import io
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from ics import Calendar
+
+from common.ics_builder import (
+    MAX_LINE_OCTETS,
+    assemble_calendar,
+    create_calendar_from_events,
+    create_event,
+    fold_line,
+    iter_calendar_fragments,
+    split_long_duration_event,
+    write_calendar,
+)
+from common.ics_reader import read_raw_events
+
+# str(Calendar)가 매번 내는 FutureWarning은 비교와 무관
+pytestmark = pytest.mark.filterwarnings('ignore::FutureWarning')
+
+SEOUL_TZ = ZoneInfo("Asia/Seoul")
+STAMP = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _records():
+    """크롤러가 만드는 종류의 이벤트: 하루종일, 시간 지정, 장기 일정 분리, 이스케이프, 긴 줄"""
+    day = datetime(2026, 11, 2)
+    timed = day.replace(hour=14, tzinfo=SEOUL_TZ)
+    return [
+        create_event('수강신청', day, categories=['STANDARD']),
+        create_event('근로장학생 모집', timed, timed + timedelta(hours=2), ['SCHOLARSHIP', 'STANDARD'],
+                     url='https://scatch.ssu.ac.kr/notice?id=1,2;3'),
+        create_event('총학생회 간식 배부 행사 ' * 6, day, categories=['EVENT'], description='장소: 학생회관\n선착순; 100명'),
+        *split_long_duration_event('국가장학금 2차 신청', day, day + timedelta(days=14), ['SCHOLARSHIP'],
+                                   description='2026학년도 2학기'),
+    ]
+
+
+@pytest.fixture
+def records():
+    # DTSTAMP(생성 시각)를 고정하여 비교 대상끼리 같은 값을 쓰도록 함
+    return [replace(record, created=STAMP) for record in _records()]
+
+
+def test_unfolded_output_matches_ics_library(records):
+    calendar = create_calendar_from_events(records)
+    assert write_calendar(calendar, fold=False) == str(calendar)
+
+
+def test_record_output_matches_ics_event_output(records):
+    assert write_calendar(records, fold=False) == write_calendar([record.to_ics_event() for record in records], fold=False)
+    assert write_calendar(records) == write_calendar([record.to_ics_event() for record in records])
+
+
+def test_reparsed_calendar_matches_ics_library(records):
+    # merge 경로처럼 다시 파싱한 Calendar (extra 속성 포함)
+    parsed = Calendar(write_calendar(records))
+    assert write_calendar(parsed, fold=False) == str(parsed)
+
+
+def test_folded_output_round_trips(records):
+    content = write_calendar(records)
+
+    for line in content.split('\r\n')[:-1]:
+        assert len(line.encode('utf-8')) <= MAX_LINE_OCTETS
+    assert content.endswith('END:VCALENDAR\r\n')
+
+    parsed = {event.uid: event for event in Calendar(content).events}
+    assert sorted(parsed) == sorted(record.uid for record in records)
+    for record in records:
+        event = parsed[record.uid]
+        assert event.name == record.title
+        assert (event.description or None) == record.description
+        assert set(event.categories) == set(record.categories)
+
+
+def test_fold_line_keeps_utf8_characters_whole():
+    line = 'SUMMARY:' + '장학금' * 40
+    folded = fold_line(line)
+
+    parts = folded.split('\r\n ')
+    assert ''.join(parts) == line
+    assert all(len(part.encode('utf-8')) <= MAX_LINE_OCTETS - (index > 0) for index, part in enumerate(parts))
+    assert fold_line('SUMMARY:short') == 'SUMMARY:short'
+
+
+def test_stream_targets_match_string_output(records):
+    content = write_calendar(records)
+
+    binary = io.BytesIO()
+    assert write_calendar(records, binary) == len(content.encode('utf-8'))
+    assert binary.getvalue() == content.encode('utf-8')
+
+    text = io.StringIO()
+    write_calendar(records, text)
+    assert text.getvalue() == content
+
+
+def test_assembled_fragments_match_write_calendar(records):
+    content = write_calendar(records).encode('utf-8')
+    fragments = [event.to_bytes() for event in read_raw_events(content.decode('utf-8'))]
+
+    assert assemble_calendar(fragments) == content
+    assert b''.join(iter_calendar_fragments(fragments)) == content
@@ -0,0 +1,145 @@
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from ics import Calendar
+
+from common.event_record import to_utc
+from common.ics_builder import create_calendar_from_events, create_event, write_calendar
+from common.ics_reader import parse_ics_datetime, read_raw_events
+
+pytestmark = pytest.mark.filterwarnings('ignore::FutureWarning')
+
+SEOUL_TZ = ZoneInfo("Asia/Seoul")
+
+# 접힌 줄, TZID/UTC/DATE 값, 이스케이프된 쉼표, UID와 DTSTART를 가진 VALARM
+DOCUMENT = "\r\n".join([
+    "BEGIN:VCALENDAR",
+    "VERSION:2.0",
+    "PRODID:-//yourssu//test//KO",
+    "BEGIN:VEVENT",
+    "UID:timed@yourssu.com",
+    "DTSTART;TZID=Asia/Seoul:20261102T140000",
+    "DTEND:20261102T070000Z",
+    "DTSTAMP:20260101T000000Z",
+    "SUMMARY:근로장학생 모집 안내 (학생서비스팀\\, 선착순) 근로장학생 모집 안내 근로장학생",
+    "  모집 안내",
+    "CATEGORIES:SCHOLARSHIP,STANDARD",
+    "BEGIN:VALARM",
+    "UID:alarm@yourssu.com",
+    "ACTION:DISPLAY",
+    "DESCRIPTION:마감 알림",
+    "TRIGGER:-PT15M",
+    "DTSTART:20200101T000000Z",
+    "END:VALARM",
+    "END:VEVENT",
+    "BEGIN:VEVENT",
+    "UID:allday@yourssu.com",
+    "DTSTART;VALUE=DATE:20261102",
+    "DTEND;VALUE=DATE:20261105",
+    "SUMMARY:수강신청",
+    "CATEGORIES:EVENT,학사\\,일정",
+    "END:VEVENT",
+    "END:VCALENDAR",
+    "",
+])
+
+
+def test_parse_ics_datetime_value_types():
+    assert parse_ics_datetime("20261102") == date(2026, 11, 2)
+    assert parse_ics_datetime("20261102T140000Z") == datetime(2026, 11, 2, 14, tzinfo=timezone.utc)
+    assert parse_ics_datetime("20261102T140000", {"TZID": "Asia/Seoul"}) == datetime(2026, 11, 2, 14, tzinfo=SEOUL_TZ)
+    assert parse_ics_datetime("20261102T140000") == datetime(2026, 11, 2, 14)
+
+
+@pytest.mark.parametrize('value', ["2026110", "20261102X140000", "20261302"])
+def test_parse_ics_datetime_rejects_bad_values(value):
+    with pytest.raises(ValueError):
+        parse_ics_datetime(value)
+
+
+@pytest.mark.parametrize('tzid', ["Korea Standard Time", "../etc/passwd"])
+def test_parse_ics_datetime_rejects_unknown_tzid(tzid):
+    with pytest.raises(ValueError, match="TZID"):
+        parse_ics_datetime("20261102T140000", {"TZID": tzid})
+    with pytest.raises(ValueError):
+        read_raw_events(DOCUMENT.replace("TZID=Asia/Seoul", f'TZID="{tzid}"'))
+
+
+def test_raw_event_extraction():
+    timed, all_day = read_raw_events(DOCUMENT)
+
+    assert timed.uid == "timed@yourssu.com"
+    assert timed.title.endswith("근로장학생 모집 안내")
+    assert "(학생서비스팀, 선착순)" in timed.title
+    assert timed.categories == ("SCHOLARSHIP", "STANDARD")
+    assert timed.start == datetime(2026, 11, 2, 14, tzinfo=SEOUL_TZ)
+    assert timed.end == datetime(2026, 11, 2, 7, tzinfo=timezone.utc)
+    assert timed.created == datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert not timed.all_day
+
+    assert all_day.categories == ("EVENT", "학사,일정")
+    assert all_day.start == date(2026, 11, 2)
+    assert all_day.all_day
+    # DATE 값의 DTEND는 exclusive
+    assert all_day.end_date == date(2026, 11, 4)
+    assert all_day.created is None
+
+
+def test_raw_block_is_kept_verbatim():
+    events = read_raw_events(DOCUMENT)
+    body = DOCUMENT[DOCUMENT.index("BEGIN:VEVENT"):DOCUMENT.index("END:VCALENDAR")]
+
+    assert "".join(event.raw for event in events) == body
+    assert "  모집 안내\r\n" in events[0].raw
+    assert events[0].to_bytes() == events[0].raw.encode("utf-8")
+
+
+def test_with_uid_replaces_only_event_uid():
+    timed = read_raw_events(DOCUMENT)[0].with_uid("new@yourssu.com")
+
+    assert timed.uid == "new@yourssu.com"
+    assert "UID:new@yourssu.com\r\n" in timed.raw
+    assert "UID:alarm@yourssu.com\r\n" in timed.raw
+    assert read_raw_events(timed.raw)[0].uid == "new@yourssu.com"
+
+
+def test_lf_line_endings_are_accepted():
+    assert [event.uid for event in read_raw_events(DOCUMENT.replace("\r\n", "\n"))] == [
+        "timed@yourssu.com", "allday@yourssu.com",
+    ]
+
+
+def _library_view(content):
+    view = {}
+    for event in Calendar(content).events:
+        if event.all_day:
+            start, end = event.begin.date(), event._end_time.date() if event._end_time else None
+        else:
+            start, end = to_utc(event.begin.datetime), to_utc(event._end_time.datetime) if event._end_time else None
+        view[event.uid] = (tuple(sorted(event.categories)), start, end)
+    return view
+
+
+def _reader_view(content):
+    def _normalize(value):
+        return to_utc(value) if isinstance(value, datetime) else value
+    return {
+        event.uid: (event.categories, _normalize(event.start), _normalize(event.end))
+        for event in read_raw_events(content)
+    }
+
+
+@pytest.mark.parametrize('fold', [True, False])
+def test_reader_agrees_with_ics_library(fold):
+    day = datetime(2026, 11, 2)
+    timed = day.replace(hour=14, tzinfo=SEOUL_TZ)
+    records = [
+        create_event('수강신청', day, categories=['STANDARD']),
+        create_event('근로장학생 모집 ' * 8, timed, timed + timedelta(hours=2), ['SCHOLARSHIP', 'STANDARD']),
+        create_event('축제', day, day + timedelta(days=3), categories=['EVENT']),
+    ]
+    content = write_calendar(records) if fold else str(create_calendar_from_events(records))
+
+    assert _reader_view(content) == _library_view(content)
+    assert _reader_view(DOCUMENT) == _library_view(DOCUMENT)
@@ -0,0 +1,107 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from common.logger import StageStats, StageTimer
+
+
+def test_stage_accumulates_runs_with_same_name():
+    timer = StageTimer('test')
+    for size in (10, 20):
+        with timer.stage('fetch') as stage:
+            stage.count = 1
+            stage.bytes = size
+    with timer.stage('parse'):
+        pass
+
+    summary = timer.summary()
+    assert list(summary) == ['fetch', 'parse']
+    assert summary['fetch']['calls'] == 2
+    assert summary['fetch']['count'] == 2
+    assert summary['fetch']['bytes'] == 30
+    # count, bytes가 0이면 생략
+    assert set(summary['parse']) == {'seconds', 'calls'}
+
+
+def test_stage_records_when_block_raises():
+    timer = StageTimer('test')
+    with pytest.raises(RuntimeError):
+        with timer.stage('fetch') as stage:
+            stage.count = 3
+            raise RuntimeError('boom')
+
+    assert timer.stages['fetch'].calls == 1
+    assert timer.stages['fetch'].count == 3
+
+
+def test_timed_wraps_sync_and_async_functions():
+    timer = StageTimer('test')
+
+    @timer.timed('sync')
+    def double(value):
+        return value * 2
+
+    @timer.timed('async')
+    async def triple(value):
+        return value * 3
+
+    assert double(2) == 4
+    assert asyncio.run(triple(2)) == 6
+    assert asyncio.iscoroutinefunction(triple)
+    assert double.__name__ == 'double'
+    assert timer.stages['sync'].calls == 1
+    assert timer.stages['async'].calls == 1
+
+
+def test_add_is_thread_safe():
+    timer = StageTimer('test')
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for _ in range(1000):
+            executor.submit(timer.add, 'fetch', StageStats(seconds=0.001, calls=1, count=2, bytes=3))
+
+    stats = timer.stages['fetch']
+    assert (stats.calls, stats.count, stats.bytes) == (1000, 2000, 3000)
+
+
+def test_emit_prints_emf_document(capsys):
+    timer = StageTimer('scholarship')
+    with timer.stage('fetch') as stage:
+        stage.bytes = 512
+    with timer.stage('parse') as stage:
+        stage.count = 4
+
+    document = timer.emit('TestNamespace', status='ok')
+
+    assert json.loads(capsys.readouterr().out) == document
+    metrics = document['_aws']['CloudWatchMetrics'][0]
+    assert metrics['Namespace'] == 'TestNamespace'
+    assert metrics['Dimensions'] == [['Function']]
+    assert [metric['Name'] for metric in metrics['Metrics']] == [
+        'Duration', 'fetch.Duration', 'fetch.Bytes', 'parse.Duration', 'parse.Count',
+    ]
+    assert document['Function'] == 'scholarship'
+    assert document['status'] == 'ok'
+    assert document['fetch.Bytes'] == 512
+    assert document['parse.Count'] == 4
+
+
+def test_emit_without_namespace_prints_nothing(capsys):
+    timer = StageTimer('test')
+    with timer.stage('fetch'):
+        pass
+
+    assert timer.emit('') is None
+    assert capsys.readouterr().out == ''
+
+
+@pytest.mark.parametrize('name', ['Duration', 'fetch.Duration', 'Function', '_aws'])
+def test_emit_rejects_properties_that_shadow_metrics(capsys, name):
+    timer = StageTimer('test')
+    with timer.stage('fetch'):
+        pass
+
+    with pytest.raises(ValueError, match=name):
+        timer.emit('TestNamespace', **{name: 'x'})
+    assert capsys.readouterr().out == ''
@@ -0,0 +1,303 @@
+import functools
+import json
+from dataclasses import replace
+from datetime import date, datetime, timedelta, timezone
+
+from common.calendar_compose import fragment_filename
+from common.config import (
+    EVENT_STORE_KEY,
+    IDENTITY_INDEX_KEY,
+    MERGE_CATEGORY_DIR,
+    MERGE_MANIFEST_KEY,
+    MERGED_ALL_FILENAME,
+    S3_BUCKET,
+    S3_MERGED_PREFIX,
+    S3_RAW_PREFIX,
+)
+from common.ics_builder import create_event, write_calendar
+from common.ics_reader import read_raw_events
+from common.s3_utils import upload_ics
+from common.storage import StorageError
+
+TODAY = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+# create_event의 DTSTAMP(현재 시각)를 고정: 초가 바뀌면 같은 이벤트도 내용이 달라져 수정으로 집계됨
+STAMP = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _event(title, start, end=None):
+    return replace(create_event(title, start, end, categories=['EVENT']), created=STAMP)
+
+
+def _upload_source(name, titles, offset_days=30):
+    """titles를 offset_days일 뒤부터 하루씩 이어지는 EVENT 이벤트로 raw/<name>에 업로드"""
+    events = [_event(title, TODAY + timedelta(days=offset_days + position)) for position, title in enumerate(titles)]
+    upload_ics(write_calendar(events), S3_BUCKET, f"{S3_RAW_PREFIX}{name}")
+
+
+def _merge(handler):
+    result = handler.lambda_handler({}, None)
+    assert result['statusCode'] == 200, result['body']
+    return result['body']
+
+
+def _manifest_sources(backend):
+    return sorted(json.loads(backend.get(S3_BUCKET, MERGE_MANIFEST_KEY).body)['sources'])
+
+
+def _merged_titles(backend):
+    stored = backend.get(S3_BUCKET, f"{S3_MERGED_PREFIX}{MERGED_ALL_FILENAME}")
+    return sorted(event.title for event in read_raw_events(stored.body.decode('utf-8')))
+
+
+def test_first_run_on_empty_bucket_creates_store(merge_handler, memory_storage, tmp_path):
+    _upload_source('a.ics', ['개강', '수강신청'])
+    assert not (tmp_path / 'event-store').exists()
+
+    result = merge_handler.lambda_handler({}, None)
+
+    assert result['statusCode'] == 200, result['body']
+    assert result['body']['total_events'] == 2
+    assert result['body']['event_store']['events'] == 2
+    assert memory_storage.head(S3_BUCKET, EVENT_STORE_KEY) is not None
+    assert _merged_titles(memory_storage) == ['개강', '수강신청']
+
+
+def test_unchanged_rerun_skips_download_and_upload(merge_handler, memory_storage):
+    _upload_source('a.ics', ['개강', '수강신청'])
+    _upload_source('b.ics', ['장학금'])
+    _merge(merge_handler)
+    merged = memory_storage.head(S3_BUCKET, f"{S3_MERGED_PREFIX}{MERGED_ALL_FILENAME}")
+
+    body = _merge(merge_handler)
+
+    assert body['sources'] == {'changed': 0, 'unchanged': 2, 'removed': 0, 'reprocessed': 0}
+    assert body['files_uploaded'] == 0
+    assert set(body['stages']) == {'list', 'load_state'}
+    assert memory_storage.head(S3_BUCKET, f"{S3_MERGED_PREFIX}{MERGED_ALL_FILENAME}") == merged
+
+
+def test_only_changed_source_is_reprocessed(merge_handler, memory_storage):
+    _upload_source('a.ics', ['개강'])
+    _upload_source('b.ics', ['장학금'])
+    _merge(merge_handler)
+
+    _upload_source('b.ics', ['장학금', '근로장학생 모집'])
+    body = _merge(merge_handler)
+
+    assert body['sources'] == {'changed': 1, 'unchanged': 1, 'removed': 0, 'reprocessed': 1}
+    assert body['changes']['added'] == 1
+    assert _merged_titles(memory_storage) == ['개강', '근로장학생 모집', '장학금']
+
+
+def test_removed_source_keeps_events_and_leaves_manifest(merge_handler, memory_storage):
+    _upload_source('a.ics', ['개강'])
+    _upload_source('b.ics', ['장학금'])
+    _merge(merge_handler)
+
+    memory_storage.delete(S3_BUCKET, f"{S3_RAW_PREFIX}b.ics")
+    body = _merge(merge_handler)
+
+    # raw 파일이 사라져도 이미 병합된 이벤트는 보존 기간까지 유지 (이벤트 유실 방지)
+    assert body['sources']['removed'] == 1
+    assert _manifest_sources(memory_storage) == [f"{S3_RAW_PREFIX}a.ics"]
+    assert _merged_titles(memory_storage) == ['개강', '장학금']
+
+
+def test_list_failure_keeps_manifest(merge_handler, memory_storage, monkeypatch):
+    _upload_source('a.ics', ['개강'])
+    _upload_source('b.ics', ['장학금'])
+    _merge(merge_handler)
+    manifest = memory_storage.head(S3_BUCKET, MERGE_MANIFEST_KEY)
+
+    def failing_list(bucket, prefix=''):
+        raise StorageError('ListObjectsV2 실패')
+
+    monkeypatch.setattr(memory_storage, 'list', failing_list)
+    result = merge_handler.lambda_handler({}, None)
+
+    # 목록을 못 읽은 실행은 소스 삭제로 보지 않고 manifest를 건드리지 않는다
+    assert result['statusCode'] == 500
+    assert memory_storage.head(S3_BUCKET, MERGE_MANIFEST_KEY) == manifest
+
+    monkeypatch.undo()
+    body = _merge(merge_handler)
+    assert body['sources'] == {'changed': 0, 'unchanged': 2, 'removed': 0, 'reprocessed': 0}
+
+
+def test_failed_fragment_upload_keeps_merged_all_and_state(merge_handler, memory_storage, monkeypatch):
+    _upload_source('a.ics', ['개강'])
+    _merge(merge_handler)
+    state_keys = [f"{S3_MERGED_PREFIX}{MERGED_ALL_FILENAME}", IDENTITY_INDEX_KEY, EVENT_STORE_KEY, MERGE_MANIFEST_KEY]
+    before = {key: memory_storage.head(S3_BUCKET, key) for key in state_keys}
+
+    failing_key = f"{S3_MERGED_PREFIX}{MERGE_CATEGORY_DIR}{fragment_filename('EVENT')}"
+    put_stream = memory_storage.put_stream
+
+    def flaky_put_stream(bucket, key, chunks, *args, **kwargs):
+        if key == failing_key:
+            raise StorageError('PutObject 실패')
+        return put_stream(bucket, key, chunks, *args, **kwargs)
+
+    results = {}
+    upload_merged_files = merge_handler.upload_merged_files
+
+    def recording_upload(*args, **kwargs):
+        results.update(upload_merged_files(*args, **kwargs))
+        return results
+
+    monkeypatch.setattr(memory_storage, 'put_stream', flaky_put_stream)
+    monkeypatch.setattr(merge_handler, 'upload_merged_files', recording_upload)
+    _upload_source('a.ics', ['개강', '수강신청'])
+    body = _merge(merge_handler)
+
+    # 조합 파일 하나라도 실패하면 merged_all.ics와 상태(index, 저장소, manifest)는 이전 실행 그대로
+    assert not results[f"{MERGE_CATEGORY_DIR}{fragment_filename('EVENT')}"]['success']
+    assert results[MERGED_ALL_FILENAME]['skipped']
+    assert body['upload_failed'] >= 2
+    assert {key: memory_storage.head(S3_BUCKET, key) for key in state_keys} == before
+
+    # 다음 실행은 manifest가 그대로이므로 같은 소스를 다시 처리하여 따라잡는다
+    monkeypatch.undo()
+    body = _merge(merge_handler)
+    assert body['sources']['changed'] == 1
+    assert _merged_titles(memory_storage) == ['개강', '수강신청']
+
+
+def test_categories_differing_only_in_case_are_rejected(merge_handler, memory_storage):
+    day = TODAY + timedelta(days=30)
+    events = [
+        replace(create_event('개강', day, categories=['EVENT']), created=STAMP),
+        replace(create_event('축제', day, categories=['event']), created=STAMP),
+    ]
+    upload_ics(write_calendar(events), S3_BUCKET, f"{S3_RAW_PREFIX}a.ics")
+
+    result = merge_handler.lambda_handler({}, None)
+
+    # 두 카테고리가 같은 조각(categories/event.ics)을 덮어쓰기 전에 병합을 멈춘다
+    assert result['statusCode'] == 500
+    assert 'event.ics' in result['body']['error']
+    assert memory_storage.head(S3_BUCKET, f"{S3_MERGED_PREFIX}{MERGED_ALL_FILENAME}") is None
+    assert memory_storage.head(S3_BUCKET, MERGE_MANIFEST_KEY) is None
+
+
+def _merged_uids(backend):
+    stored = backend.get(S3_BUCKET, f"{S3_MERGED_PREFIX}{MERGED_ALL_FILENAME}")
+    return {event.title: event.uid for event in read_raw_events(stored.body.decode('utf-8'))}
+
+
+def test_retitle_replaces_event_and_keeps_other_uids(merge_handler, memory_storage):
+    _upload_source('a.ics', ['개강', '수강신청'])
+    _merge(merge_handler)
+    before = _merged_uids(memory_storage)
+
+    _upload_source('a.ics', ['개강 안내', '수강신청'])
+    body = _merge(merge_handler)
+
+    assert body['changes']['added'] == 1
+    assert body['changes']['removed'] == 1
+    assert body['changes']['unchanged'] == 1
+    after = _merged_uids(memory_storage)
+    assert sorted(after) == ['개강 안내', '수강신청']
+    assert after['수강신청'] == before['수강신청']
+    assert body['event_store']['events'] == 2
+
+
+def test_rebuilt_store_gives_same_output(merge_handler, memory_storage):
+    _upload_source('a.ics', ['개강', '수강신청'])
+    _upload_source('b.ics', ['장학금'])
+    _merge(merge_handler)
+    _upload_source('a.ics', ['개강 안내', '수강신청'])
+    _merge(merge_handler)
+    merged_key = f"{S3_MERGED_PREFIX}{MERGED_ALL_FILENAME}"
+    via_store = memory_storage.get(S3_BUCKET, merged_key).body
+
+    # 저장소 객체가 없으면 로컬 사본도 지우고 merged_all.ics에서 다시 만든다
+    memory_storage.delete(S3_BUCKET, EVENT_STORE_KEY)
+    result = merge_handler.lambda_handler({'full_merge': True}, None)
+
+    assert result['statusCode'] == 200, result['body']
+    assert result['body']['event_store']['events'] == 3
+    assert memory_storage.get(S3_BUCKET, merged_key).body == via_store
+    assert memory_storage.head(S3_BUCKET, EVENT_STORE_KEY) is not None
+
+
+def test_retention_cutoff(merge_handler):
+    assert merge_handler.retention_cutoff(12, date(2026, 3, 31)) == date(2025, 3, 31)
+    assert merge_handler.retention_cutoff(1, date(2026, 3, 31)) == date(2026, 2, 28)
+    assert merge_handler.retention_cutoff(0, date(2026, 3, 31)) is None
+
+
+def test_retention_prunes_expired_events_without_source_changes(merge_handler, memory_storage, monkeypatch):
+    _upload_source('a.ics', ['오리엔테이션'], offset_days=5)
+    _upload_source('b.ics', ['장학금'], offset_days=100)
+    _merge(merge_handler)
+
+    # 1년 50일 뒤: 보존 기간(12개월) 기준일이 오늘 + 50일이 되어 5일 뒤 이벤트만 만료
+    later = (TODAY + timedelta(days=50)).date()
+    monkeypatch.setattr(
+        merge_handler, 'retention_cutoff',
+        functools.partial(merge_handler.retention_cutoff, 12, later.replace(year=later.year + 1)),
+    )
+    body = _merge(merge_handler)
+
+    assert body['sources']['changed'] == 0
+    assert body['changes']['expired'] == 1
+    assert body['retention']['events_removed'] == 1
+    assert body['retention']['bytes_removed'] > 0
+    assert body['event_store']['events'] == 1
+    assert _merged_titles(memory_storage) == ['장학금']
+
+    # 만료된 이벤트가 없으면 다시 건너뛴다
+    assert _merge(merge_handler)['sources']['reprocessed'] == 0
+
+
+def test_retention_drops_newly_crawled_expired_events(merge_handler, memory_storage):
+    _upload_source('a.ics', ['개강'])
+    _merge(merge_handler)
+
+    _upload_source('a.ics', ['개강'])
+    _upload_source('old.ics', ['지난 행사'], offset_days=-400)
+    body = _merge(merge_handler)
+
+    assert _merged_titles(memory_storage) == ['개강']
+    assert body['changes']['added'] == 0
+
+
+def _s3_event(*keys):
+    return {'Records': [{'s3': {'bucket': {'name': S3_BUCKET}, 'object': {'key': key}}} for key in keys]}
+
+
+def test_triggered_keys_are_url_decoded(merge_handler):
+    assert merge_handler._triggered_keys(_s3_event('raw/%ED%95%99%EC%82%AC+%EC%9D%BC%EC%A0%95.ics')) == ['raw/학사 일정.ics']
+    assert merge_handler._triggered_keys({'full_merge': True}) == []
+
+
+def test_s3_event_for_applied_key_skips(merge_handler, memory_storage):
+    _upload_source('a.ics', ['개강'])
+    _merge(merge_handler)
+
+    # 이미 반영된 객체의 알림(중복 전달)은 ETag가 같으므로 다시 처리하지 않는다
+    result = merge_handler.lambda_handler(_s3_event(f"{S3_RAW_PREFIX}a.ics"), None)
+
+    assert result['statusCode'] == 200
+    assert result['body']['sources']['reprocessed'] == 0
+
+
+def test_retention_judges_updated_event_by_new_end_date(merge_handler, memory_storage, monkeypatch):
+    start = TODAY + timedelta(days=5)
+    upload_ics(write_calendar([_event('현장실습', start)]), S3_BUCKET, f"{S3_RAW_PREFIX}a.ics")
+    _merge(merge_handler)
+
+    # 같은 이벤트의 종료일이 보존 기준일 뒤로 늘어나면 저장소의 이전 종료일로 지우지 않는다
+    extended = _event('현장실습', start, start + timedelta(days=200))
+    upload_ics(write_calendar([extended]), S3_BUCKET, f"{S3_RAW_PREFIX}a.ics")
+    later = (TODAY + timedelta(days=50)).date()
+    monkeypatch.setattr(
+        merge_handler, 'retention_cutoff',
+        functools.partial(merge_handler.retention_cutoff, 12, later.replace(year=later.year + 1)),
+    )
+    body = _merge(merge_handler)
+
+    assert body['changes']['updated'] == 1
+    assert body['retention']['events_removed'] == 0
+    assert _merged_titles(memory_storage) == ['현장실습']
@@ -0,0 +1,153 @@
+import pytest
+from botocore.exceptions import ClientError
+
+from common import storage
+from common.s3_utils import list_ics_etags, list_ics_files
+
+BUCKET = 'test-bucket'
+
+
+class StubS3Client:
+    """S3Storage가 호출하는 boto3 클라이언트 메서드만 흉내 내고 호출을 기록"""
+
+    def __init__(self, fail_part=None):
+        self.calls = []
+        self.fail_part = fail_part
+        self.pages = []
+
+    def put_object(self, **request):
+        self.calls.append(('put_object', request))
+        return {'ETag': storage.compute_etag(request['Body'])}
+
+    def create_multipart_upload(self, **request):
+        self.calls.append(('create_multipart_upload', request))
+        return {'UploadId': 'upload-1'}
+
+    def upload_part(self, **request):
+        self.calls.append(('upload_part', request))
+        if request['PartNumber'] == self.fail_part:
+            raise ClientError({'Error': {'Code': 'InternalError', 'Message': 'part failed'}}, 'UploadPart')
+        return {'ETag': f'"part-{request["PartNumber"]}"'}
+
+    def complete_multipart_upload(self, **request):
+        self.calls.append(('complete_multipart_upload', request))
+        return {'ETag': f'"multipart-{len(request["MultipartUpload"]["Parts"])}"'}
+
+    def abort_multipart_upload(self, **request):
+        self.calls.append(('abort_multipart_upload', request))
+        return {}
+
+    def get_paginator(self, operation):
+        return StubPaginator(self, operation)
+
+    def operations(self):
+        return [name for name, _ in self.calls]
+
+    def requests(self, operation):
+        return [request for name, request in self.calls if name == operation]
+
+
+class StubPaginator:
+    """client.pages를 순서대로 돌려주는 paginator (예외 항목은 그 페이지 요청에서 발생)"""
+
+    def __init__(self, client, operation):
+        self.client = client
+        self.operation = operation
+
+    def paginate(self, **request):
+        self.client.calls.append((self.operation, request))
+        for page in self.client.pages:
+            if isinstance(page, Exception):
+                raise page
+            yield page
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    # 임계값 16바이트, 파트 8바이트로 줄여 작은 본문으로 멀티파트 경로를 실행
+    client = StubS3Client()
+    monkeypatch.setattr(storage, 'get_s3_client', lambda: client)
+    monkeypatch.setattr(storage, 'S3_MULTIPART_THRESHOLD', 16)
+    monkeypatch.setattr(storage, 'S3_MULTIPART_PART_SIZE', 8)
+    return client
+
+
+def _chunks(body, size=5):
+    return (body[start:start + size] for start in range(0, len(body), size))
+
+
+def test_put_stream_below_threshold_uses_single_put(s3_client):
+    info = storage.S3Storage().put_stream(BUCKET, 'small.ics', _chunks(b'BEGIN:VCALENDAR'), content_type='text/calendar')
+
+    assert s3_client.operations() == ['put_object']
+    assert s3_client.requests('put_object')[0]['Body'] == b'BEGIN:VCALENDAR'
+    assert s3_client.requests('put_object')[0]['ContentType'] == 'text/calendar'
+    assert info.size == 15
+
+
+def test_put_stream_splits_parts_at_part_size(s3_client):
+    body = bytes(range(35))
+    info = storage.S3Storage().put_stream(BUCKET, 'large.ics', _chunks(body), content_encoding='gzip')
+
+    parts = s3_client.requests('upload_part')
+    assert [len(part['Body']) for part in parts] == [8, 8, 8, 8, 3]
+    assert b''.join(part['Body'] for part in parts) == body
+    assert all(part['UploadId'] == 'upload-1' for part in parts)
+    assert s3_client.requests('create_multipart_upload')[0]['ContentEncoding'] == 'gzip'
+    assert s3_client.requests('complete_multipart_upload')[0]['MultipartUpload']['Parts'] == [
+        {'PartNumber': number, 'ETag': f'"part-{number}"'} for number in range(1, 6)
+    ]
+    assert 'abort_multipart_upload' not in s3_client.operations()
+    assert (info.size, info.etag) == (35, '"multipart-5"')
+
+
+def test_put_stream_aborts_when_part_fails(s3_client):
+    s3_client.fail_part = 2
+
+    with pytest.raises(storage.StorageError):
+        storage.S3Storage().put_stream(BUCKET, 'large.ics', _chunks(bytes(35)))
+
+    assert s3_client.operations()[-1] == 'abort_multipart_upload'
+    assert s3_client.requests('abort_multipart_upload') == [{'Bucket': BUCKET, 'Key': 'large.ics', 'UploadId': 'upload-1'}]
+    assert 'complete_multipart_upload' not in s3_client.operations()
+
+
+def test_put_stream_aborts_when_source_fails(s3_client):
+    def failing_source():
+        yield from _chunks(bytes(20))
+        raise RuntimeError('조각 생성 실패')
+
+    with pytest.raises(RuntimeError):
+        storage.S3Storage().put_stream(BUCKET, 'large.ics', failing_source())
+
+    assert s3_client.operations()[-1] == 'abort_multipart_upload'
+    assert 'complete_multipart_upload' not in s3_client.operations()
+
+
+@pytest.fixture
+def s3_storage(s3_client):
+    backend = storage.S3Storage()
+    storage.set_storage(backend)
+    yield backend
+    storage.set_storage(None)
+
+
+def _page(*keys):
+    return {'Contents': [{'Key': key, 'ETag': f'"{key}"', 'Size': 1} for key in keys]}
+
+
+def test_list_follows_all_pages(s3_client, s3_storage):
+    s3_client.pages = [_page('raw/a.ics', 'raw/b.txt'), _page('raw/c.ics'), {}]
+
+    assert list_ics_files(BUCKET, 'raw/') == ['raw/a.ics', 'raw/c.ics']
+    assert list_ics_etags(BUCKET, 'raw/') == {'raw/a.ics': '"raw/a.ics"', 'raw/c.ics': '"raw/c.ics"'}
+    assert s3_client.requests('list_objects_v2')[0] == {'Bucket': BUCKET, 'Prefix': 'raw/'}
+
+
+def test_list_failure_on_later_page_is_not_a_partial_list(s3_client, s3_storage):
+    error = ClientError({'Error': {'Code': 'SlowDown', 'Message': 'reduce request rate'}}, 'ListObjectsV2')
+    s3_client.pages = [_page('raw/a.ics'), error]
+
+    with pytest.raises(storage.StorageError):
+        list_ics_etags(BUCKET, 'raw/')
+    assert list_ics_files(BUCKET, 'raw/') == []
@@ -0,0 +1,203 @@
+import gzip
+import hashlib
+import os
+
+import pytest
+
+from common import storage
+from common.s3_utils import (
+    compress_body,
+    download_file,
+    get_download_cache_stats,
+    iter_compressed,
+    upload_compressed_variants,
+    upload_ics,
+    upload_ics_stream,
+)
+
+BUCKET = 'test-bucket'
+
+
+@pytest.fixture(params=['memory', 'local'])
+def backend(request, tmp_path):
+    if request.param == 'memory':
+        return storage.MemoryStorage()
+    return storage.LocalStorage(str(tmp_path / 'storage'))
+
+
+def test_put_get_head_share_md5_etag(backend):
+    info = backend.put(BUCKET, 'raw/a.ics', b'BEGIN:VCALENDAR', content_type='text/calendar')
+
+    assert info.etag == storage.compute_etag(b'BEGIN:VCALENDAR')
+    assert backend.head(BUCKET, 'raw/a.ics') == info
+    stored = backend.get(BUCKET, 'raw/a.ics')
+    assert stored.body == b'BEGIN:VCALENDAR'
+    assert not stored.not_modified
+
+
+def test_conditional_get_returns_not_modified_for_current_etag(backend):
+    first = backend.put(BUCKET, 'k', b'one')
+
+    assert backend.get(BUCKET, 'k', if_none_match=first.etag).not_modified
+    backend.put(BUCKET, 'k', b'two')
+    stored = backend.get(BUCKET, 'k', if_none_match=first.etag)
+    assert not stored.not_modified
+    assert stored.body == b'two'
+
+
+def test_put_stream_matches_put(backend):
+    streamed = backend.put_stream(BUCKET, 'streamed', iter([b'ab', b'cd']))
+    assert streamed.etag == backend.put(BUCKET, 'whole', b'abcd').etag
+    assert backend.get(BUCKET, 'streamed').body == b'abcd'
+
+
+def test_list_delete_and_missing(backend):
+    for key in ('raw/b.ics', 'raw/a.ics', 'merged/all.ics'):
+        backend.put(BUCKET, key, key.encode())
+
+    assert [info.key for info in backend.list(BUCKET, 'raw/')] == ['raw/a.ics', 'raw/b.ics']
+    backend.delete(BUCKET, 'raw/a.ics')
+    backend.delete(BUCKET, 'raw/a.ics')
+    assert backend.get(BUCKET, 'raw/a.ics') is None
+    assert backend.head(BUCKET, 'raw/a.ics') is None
+    assert [info.key for info in backend.list(BUCKET, 'raw/')] == ['raw/b.ics']
+
+
+def test_backend_must_implement_every_operation():
+    class ReadOnlyStorage(storage.StorageBackend):
+        def head(self, bucket, key):
+            return None
+
+        def get(self, bucket, key, if_none_match=None):
+            return None
+
+    with pytest.raises(TypeError):
+        ReadOnlyStorage()
+
+
+def test_local_storage_recomputes_etag_for_files_changed_outside(tmp_path):
+    backend = storage.LocalStorage(str(tmp_path))
+    old = backend.put(BUCKET, 'raw/a.ics', b'old')
+    with open(tmp_path / BUCKET / 'raw' / 'a.ics', 'wb') as f:
+        f.write(b'new content')
+
+    assert backend.head(BUCKET, 'raw/a.ics').etag == storage.compute_etag(b'new content')
+    assert backend.get(BUCKET, 'raw/a.ics', if_none_match=old.etag).body == b'new content'
+
+
+def test_local_storage_rejects_keys_outside_bucket(tmp_path):
+    with pytest.raises(storage.StorageError):
+        storage.LocalStorage(str(tmp_path)).put(BUCKET, '../escape', b'x')
+
+
+def test_download_file_reuses_unchanged_local_copy(memory_storage, tmp_path):
+    path = str(tmp_path / 'state' / 'events.sqlite3')
+    memory_storage.put(BUCKET, 'state/events.sqlite3', b'v1')
+    get_download_cache_stats(reset=True)
+
+    etag = download_file(BUCKET, 'state/events.sqlite3', path)
+    assert download_file(BUCKET, 'state/events.sqlite3', path) == etag
+    assert get_download_cache_stats(reset=True)['hits'] == 1
+
+    memory_storage.put(BUCKET, 'state/events.sqlite3', b'v2')
+    download_file(BUCKET, 'state/events.sqlite3', path)
+    with open(path, 'rb') as f:
+        assert f.read() == b'v2'
+
+    memory_storage.delete(BUCKET, 'state/events.sqlite3')
+    assert download_file(BUCKET, 'state/events.sqlite3', path) is None
+    assert not os.path.exists(path)
+
+
+def test_upload_skips_unchanged_content(memory_storage):
+    first = upload_ics('BEGIN:VCALENDAR', BUCKET, 'raw/a.ics', skip_unchanged=True)
+    second = upload_ics('BEGIN:VCALENDAR', BUCKET, 'raw/a.ics', skip_unchanged=True)
+
+    assert first['uploaded'] and not second['uploaded']
+    assert second['etag'] == first['etag']
+
+
+def test_stream_upload_digests_reopenable_source_before_upload(memory_storage):
+    opened = []
+
+    def source():
+        opened.append(True)
+        return iter([b'BEGIN:', 'VCALENDAR 학사'])
+
+    body = 'BEGIN:VCALENDAR 학사'.encode('utf-8')
+    first = upload_ics_stream(source, BUCKET, 'merged/a.ics', skip_unchanged=True)
+
+    # 첫 번째 순회로 sha256 메타데이터를 만들고 두 번째 순회로 업로드
+    assert len(opened) == 2
+    assert first['uploaded'] and first['etag'] == storage.compute_etag(body)
+    assert memory_storage.head(BUCKET, 'merged/a.ics').metadata == {'sha256': hashlib.sha256(body).hexdigest()}
+
+    # 내용이 같으면 해시 순회만 하고 PUT은 생략
+    opened.clear()
+    second = upload_ics_stream(source, BUCKET, 'merged/a.ics', skip_unchanged=True)
+    assert len(opened) == 1
+    assert not second['uploaded'] and second['etag'] == first['etag']
+
+
+def test_stream_upload_rejects_skip_unchanged_for_one_shot_source(memory_storage):
+    with pytest.raises(ValueError):
+        upload_ics_stream(iter([b'BEGIN:VCALENDAR']), BUCKET, 'merged/a.ics', skip_unchanged=True)
+    assert memory_storage.head(BUCKET, 'merged/a.ics') is None
+
+
+CALENDAR = ('BEGIN:VCALENDAR\r\n' + 'BEGIN:VEVENT\r\nSUMMARY:수강신청\r\nEND:VEVENT\r\n' * 50 + 'END:VCALENDAR\r\n').encode('utf-8')
+
+
+def test_gzip_output_is_deterministic():
+    compressed = compress_body(CALENDAR, 'gzip')
+
+    # mtime 필드(4~7바이트)가 0이라 같은 입력이면 언제 압축해도 같은 바이트 (같은 ETag로 PUT 생략 가능)
+    assert compressed[4:8] == b'\0\0\0\0'
+    assert compressed == compress_body(CALENDAR, 'gzip')
+    assert b''.join(iter_compressed([CALENDAR[:100], CALENDAR[100:]], 'gzip')) == compressed
+    assert gzip.decompress(compressed) == CALENDAR
+
+    with pytest.raises(ValueError):
+        compress_body(CALENDAR, 'zstd')
+
+
+def test_compressed_variants_carry_content_encoding(memory_storage):
+    results = upload_compressed_variants(CALENDAR, BUCKET, 'merged/all.ics', encodings=('gzip', 'zstd'))
+
+    stored = memory_storage.get(BUCKET, 'merged/all.ics.gz')
+    assert stored.info.content_encoding == 'gzip'
+    assert stored.info.content_type == 'text/calendar'
+    assert gzip.decompress(stored.body) == CALENDAR
+    assert results['gzip']['original_size'] == len(CALENDAR)
+    assert 0 < results['gzip']['reduction'] < 1
+    assert not results['zstd']['success']
+
+    # 원본 조각을 다시 만들어도 압축 결과가 같으므로 PUT 생략
+    again = upload_compressed_variants(lambda: iter([CALENDAR]), BUCKET, 'merged/all.ics', ('gzip',), skip_unchanged=True)
+    assert not again['gzip']['uploaded']
+    assert again['gzip']['etag'] == results['gzip']['etag']
+
+
+def test_compressed_variants_are_opt_in(memory_storage):
+    assert upload_compressed_variants(CALENDAR, BUCKET, 'merged/all.ics') == {}
+    assert memory_storage.list(BUCKET) == []
+
+
+def _record_call():
+    # botocore before-call/after-call 이벤트와 같은 순서로 호출
+    context = {}
+    storage._before_call(context=context)
+    storage._after_call(context=context)
+
+
+def test_s3_timings_reset_per_invocation():
+    storage.get_s3_timings(reset=True)
+    _record_call()
+    _record_call()
+    first = storage.get_s3_timings(reset=True)
+    assert first['calls'] == 2
+    assert 'first_call_ms' in first
+
+    assert storage.get_s3_timings() == {}
+    _record_call()
+    assert storage.get_s3_timings()['calls'] == 1